@@ -0,0 +1,131 @@
+from array import array
+from heapq import heappush, heappop
+from Coordinate.coord import Coord
+from heuristics import diagonal_tie_breaker, xy_heuristic, TIE_BREAKING, EXACT_HEURISTICS
+
+"""
+File: astar.py
+Author: Nathan Robertson
+Purpose:
+    Plain A* over any UniformGrid subclass (the grid's NEIGHBOR_OFFSETS decide how entities move).
+    Used as the fallback on maps where jump point search has no advantage, such as OrthogonalGrids or very
+    cluttered maps.
+
+    Written for throughput:
+    1. Cells are integer ids (y * xsize + x), Coords are only made for the returned path.
+    2. Costs are integers scaled by SCALE so the tie breaking heuristics stay exact.
+    3. Open list entries are single ints (f * cells + id) in a heapq, no tuples or node objects.
+    4. g, parent and closed buffers are allocated once per grid and reused. Every query stamps the cells it
+       touches with a query number so nothing has to be reset between queries.
+    5. The search stops as soon as the goal is popped.
+"""
+
+
+__all__ = ["AStar", "SCALE"]
+
+SCALE = 1000
+
+
+def integer_heuristic(heuristic_fn, goal: Coord):
+    """
+    :param heuristic_fn: One of the functions in heuristics.py or any function of two Coords.
+    :param goal:
+    :return: A function of (x, y) giving the scaled integer heuristic from (x, y) to goal. Tie breakers are their
+             base heuristic times SCALE + 1, which keeps them exact integers.
+    """
+    base = TIE_BREAKING.get(heuristic_fn)
+    if base is not None:
+        return xy_heuristic(base, goal, SCALE + 1)
+    if heuristic_fn in EXACT_HEURISTICS:
+        return xy_heuristic(heuristic_fn, goal, SCALE)
+    heuristic = xy_heuristic(heuristic_fn, goal, SCALE)
+    return lambda x, y: int(heuristic(x, y))
+
+
+class AStar:
+    def __init__(self, grid, heuristic_fn=diagonal_tie_breaker):
+        self.grid = grid
+        self.heuristic_fn = heuristic_fn
+        self.query = 0
+        self.nodes_expanded = 0
+        self.g = None
+        self.parent = None
+        self.seen = None
+        self.closed = None
+
+    def execute(self, endpoints: (Coord, Coord)) -> list:
+        """
+        :param endpoints: A tuple containing (start, goal)
+        :return: Every cell on a shortest path from start to goal (inclusive) or empty list if there is none.
+        """
+        start, goal = endpoints
+        grid = self.grid
+        for coord in (start, goal):
+            if not grid.is_valid_coord(coord) or grid.is_obstacle(coord):
+                return []
+        if start == goal:
+            return [start]
+        xsize = grid.xsize
+        goal_id = goal.y * xsize + goal.x
+        if self._search(start.y * xsize + start.x, goal_id, integer_heuristic(self.heuristic_fn, goal)):
+            return self._backtrack(goal_id)
+        return []
+
+    def _reserve(self, cells: int) -> None:
+        if self.g is None or len(self.g) != cells:
+            self.g = array('q', bytes(8 * cells))
+            self.parent = array('q', bytes(8 * cells))
+            self.seen = array('q', bytes(8 * cells))
+            self.closed = array('q', bytes(8 * cells))
+            self.query = 0
+
+    def _search(self, start_id: int, goal_id: int, heuristic) -> bool:
+        grid = self.grid
+        xsize, ysize = grid.xsize, grid.ysize
+        cells = xsize * ysize
+        self._reserve(cells)
+        self.query += 1
+        query = self.query
+        g, parent, seen, closed = self.g, self.parent, self.seen, self.closed
+        rows = grid.bitboard.rows
+        offsets = grid.NEIGHBOR_OFFSETS
+        step_cost = grid.cost() * SCALE
+
+        seen[start_id] = query
+        g[start_id] = 0
+        parent[start_id] = -1
+        open_list = [heuristic(start_id % xsize, start_id // xsize) * cells + start_id]
+        expanded = 0
+        found = False
+        while open_list:
+            cell = heappop(open_list) % cells
+            if closed[cell] == query:
+                continue
+            closed[cell] = query
+            expanded += 1
+            if cell == goal_id:
+                found = True
+                break
+            y, x = divmod(cell, xsize)
+            next_g = g[cell] + step_cost
+            for dx, dy in offsets:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < xsize and 0 <= ny < ysize and not (rows[ny] >> nx) & 1:
+                    neighbor = ny * xsize + nx
+                    if seen[neighbor] != query or (next_g < g[neighbor] and closed[neighbor] != query):
+                        seen[neighbor] = query
+                        g[neighbor] = next_g
+                        parent[neighbor] = cell
+                        heappush(open_list, (next_g + heuristic(nx, ny)) * cells + neighbor)
+        self.nodes_expanded = expanded
+        return found
+
+    def _backtrack(self, cell: int) -> list:
+        xsize = self.grid.xsize
+        parent = self.parent
+        path = []
+        while cell != -1:
+            path.append(Coord(cell % xsize, cell // xsize))
+            cell = parent[cell]
+        path.reverse()
+        return path
@@ -0,0 +1,51 @@
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+from heuristics import diagonal_tie_breaker, tie_breaker_h
+from JumpPointSearch.jps_timing import make_diagonal_grid, print_result
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from AStar.astar import AStar
+from Coordinate.coord import Coord
+import random
+
+"""
+File: astar_timing.py
+Author: Nathan Robertson
+Purpose:
+    Compare A* against jump point search on diagonal grids of increasing obstacle density, and time A* on
+    orthogonal grids where jump point search cannot be used at all.
+
+    Run from the moving_bot directory with: python -m AStar.astar_timing
+"""
+
+
+def random_endpoints(grid, count: int) -> list:
+    endpoints = []
+    while len(endpoints) < count:
+        start = Coord(random.randrange(grid.xsize), random.randrange(grid.ysize))
+        goal = Coord(random.randrange(grid.xsize), random.randrange(grid.ysize))
+        if not grid.is_obstacle(start) and not grid.is_obstacle(goal):
+            endpoints.append((start, goal))
+    return endpoints
+
+
+size = 64
+obstacle_prob = [1, 10, 20, 35]
+queries = 100
+
+if __name__ == "__main__":
+    random.seed(0)
+    for prob in obstacle_prob:
+        grid = make_diagonal_grid((size, size), obstacle_prob=prob)
+        endpoints = random_endpoints(grid, queries)
+        jps = JumpPointSearch(grid, diagonal_tie_breaker)
+        astar = AStar(grid, diagonal_tie_breaker)
+        print("Diagonal " + str(size) + "x" + str(size) + " grid, obstacle probability " + str(prob) + ":")
+        print("JPS (s): ")
+        print_result(lambda: [jps.connect_path(jps.execute(pair)) for pair in endpoints], 1)
+        print("A* (s): ")
+        print_result(lambda: [astar.execute(pair) for pair in endpoints], 1)
+
+    diagonal_grid = make_diagonal_grid((size, size), obstacle_prob=20)
+    grid = OrthogonalGrid(size, size, diagonal_grid.obstacles())
+    astar = AStar(grid, tie_breaker_h)
+    print("Orthogonal " + str(size) + "x" + str(size) + " grid, A* (s): ")
+    print_result(lambda: [astar.execute(pair) for pair in random_endpoints(grid, queries)], 1)
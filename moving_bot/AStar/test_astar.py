@@ -0,0 +1,65 @@
+import unittest
+import random
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+from AStar.astar import AStar, integer_heuristic, SCALE
+from heuristics import manhattan, diagonal, diagonal_tie_breaker, xy_heuristic
+from search_testing import breadth_first_distance
+
+
+"""
+File: test_astar.py
+Author: Nathan Robertson
+Purpose: Test that A* finds shortest connected paths on orthogonal and diagonal grids.
+"""
+
+
+class AStarTest(unittest.TestCase):
+    def test_orthogonal_path(self):
+        grid = OrthogonalGrid(3, 3, [Coord(1, 0), Coord(1, 1)])
+        path = AStar(grid, manhattan).execute((Coord(0, 0), Coord(2, 0)))
+        self.assertEqual([Coord(0, 0), Coord(0, 1), Coord(0, 2), Coord(1, 2), Coord(2, 2), Coord(2, 1), Coord(2, 0)],
+                         path)
+
+    def test_diagonal_path(self):
+        grid = DiagonalGrid(4, 4, [])
+        path = AStar(grid, diagonal).execute((Coord(0, 0), Coord(3, 3)))
+        self.assertEqual([Coord(0, 0), Coord(1, 1), Coord(2, 2), Coord(3, 3)], path)
+
+    def test_trivial_and_blocked_queries(self):
+        grid = OrthogonalGrid(3, 3, [Coord(1, 0), Coord(1, 1), Coord(1, 2)])
+        astar = AStar(grid, manhattan)
+        self.assertEqual([Coord(0, 0)], astar.execute((Coord(0, 0), Coord(0, 0))))
+        self.assertEqual([], astar.execute((Coord(0, 0), Coord(2, 0))))
+        self.assertEqual([], astar.execute((Coord(0, 0), Coord(1, 1))))
+
+    def test_shortest_paths_with_reused_buffers(self):
+        rng = random.Random(9)
+        for grid_class, heuristic in ((OrthogonalGrid, manhattan), (DiagonalGrid, diagonal)):
+            obstacles = [Coord(x, y) for x in range(15) for y in range(15) if rng.random() < 0.25]
+            grid = grid_class(15, 15, obstacles)
+            astar = AStar(grid, heuristic)
+            for _ in range(50):
+                start, goal = Coord(rng.randrange(15), rng.randrange(15)), Coord(rng.randrange(15), rng.randrange(15))
+                if grid.is_obstacle(start) or grid.is_obstacle(goal):
+                    continue
+                path = astar.execute((start, goal))
+                expected = breadth_first_distance(grid, start, goal)
+                self.assertEqual(expected, len(path) - 1 if len(path) > 0 else None)
+                for first, second in zip(path, path[1:]):
+                    self.assertTrue(second in grid.neighbors(first))
+
+    def test_custom_heuristic(self):
+        grid = DiagonalGrid(5, 5, [Coord(2, 2)])
+        path = AStar(grid, lambda coord, goal: 0).execute((Coord(0, 0), Coord(4, 4)))
+        self.assertEqual(6, len(path))
+
+    def test_integer_heuristic_scales_every_heuristic(self):
+        goal = Coord(3, 4)
+        euclidean = lambda coord, target: ((coord.x - target.x) ** 2 + (coord.y - target.y) ** 2) ** 0.5
+        self.assertEqual(5, xy_heuristic(euclidean, goal)(0, 0))
+        self.assertEqual(10, xy_heuristic(euclidean, goal, 2)(0, 0))
+        self.assertEqual(5 * SCALE, integer_heuristic(euclidean, goal)(0, 0))
+        self.assertEqual(4 * SCALE, integer_heuristic(diagonal, goal)(0, 0))
+        self.assertEqual(4 * (SCALE + 1), integer_heuristic(diagonal_tie_breaker, goal)(0, 0))
@@ -0,0 +1,295 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+from Coordinate.coord import Coord
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from JumpPointSearch.jump_point_search_plus import JumpPointSearchPlus
+from AStar.astar import AStar
+from Landmarks.landmark_heuristic import LandmarkHeuristic
+from FlowField.flow_field import obstacle_array, distance_field, UNREACHABLE
+from Benchmark.map_generators import GENERATORS
+from Benchmark.moving_ai import read_map, read_scenarios
+
+"""
+File: benchmark.py
+Author: Nathan Robertson
+Purpose:
+    Reproducible benchmark runs for the path searches, so every performance change is measured the same way.
+    A run is a list of cases (map, size, search). Each case reports as JSON:
+        setup_ms: Time to build the searcher (JPS+ tables etc).
+        latency_ms: p50/p95/p99/mean/max time of one execute.
+        nodes_expanded: mean/p50/max of the searcher's nodes_expanded after each query.
+        peak_memory_bytes: tracemalloc peak while building a fresh searcher and answering every query.
+        optimal_fraction / max_length_ratio: path length compared with a breadth first distance field.
+        failures: queries with a reachable goal where no path came back.
+    Maps are generated from a seed (map_generators.py) or read from MovingAI .map/.scen files (moving_ai.py).
+    compare reads two result files and lists every case which got worse by more than a threshold.
+
+    Run from the moving_bot directory:
+        python -m Benchmark.benchmark run --sizes 32 64 128 256 512 --output before.json
+        python -m Benchmark.benchmark scen maps/arena.map.scen --map-dir maps --output arena.json
+        python -m Benchmark.benchmark compare before.json after.json --threshold 0.1
+"""
+
+
+__all__ = ["SEARCHES", "run_case", "run_generated", "run_scenarios", "compare", "percentile", "make_queries"]
+
+SEARCHES = {
+    'jps': lambda grid: JumpPointSearch(grid, diagonal_tie_breaker),
+    'jps_bidirectional': lambda grid: JumpPointSearch(grid, diagonal_tie_breaker, bidirectional=True),
+    'jps_plus': lambda grid: JumpPointSearchPlus(grid, diagonal_tie_breaker),
+    'jps_alt': lambda grid: JumpPointSearch(grid, LandmarkHeuristic(grid)),
+    'astar': lambda grid: AStar(grid, diagonal_tie_breaker),
+}
+
+DEFAULT_SIZES = [32, 64, 128, 256, 512]
+LATENCY_KEYS = ('p50', 'p95', 'p99')
+
+
+def percentile(values: list, fraction: float) -> float:
+    """
+    :return: Nearest rank percentile of values, 0 for no values.
+    """
+    if len(values) == 0:
+        return 0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def make_queries(grid, goals: int, starts: int, seed: int) -> list:
+    """
+    Picks free goal cells and for each of them free start cells which can reach it.
+    :return: (start, goal) pairs grouped by goal.
+    """
+    rng = random.Random(seed)
+    blocked = obstacle_array(grid)
+    free = [(x, y) for y in range(grid.ysize) for x in range(grid.xsize) if not blocked[y, x]]
+    queries = []
+    if len(free) < 2:
+        return queries
+    for _ in range(goals):
+        goal = Coord(*rng.choice(free))
+        distance = distance_field(blocked, [goal], grid.NEIGHBOR_OFFSETS)
+        reachable = [(x, y) for x, y in free if distance[y, x] > 0]
+        for _ in range(min(starts, len(reachable))):
+            queries.append((Coord(*rng.choice(reachable)), goal))
+    return queries
+
+
+def _distances(grid, queries: list) -> dict:
+    blocked = obstacle_array(grid)
+    goals = {}
+    for _, goal in queries:
+        if goal not in goals:
+            goals[goal] = distance_field(blocked, [goal], grid.NEIGHBOR_OFFSETS)
+    return goals
+
+
+def _path_cells(search, result: list) -> list:
+    return search.connect_path(result) if hasattr(search, 'connect_path') else result
+
+
+def run_case(map_name: str, grid, search_name: str, queries: list, check_optimal: bool = True) -> dict:
+    """
+    :return: JSON ready results of answering queries with a fresh SEARCHES[search_name] on grid.
+    """
+    began = perf_counter()
+    search = SEARCHES[search_name](grid)
+    setup = perf_counter() - began
+    distances = _distances(grid, queries) if check_optimal else {}
+    latencies, expanded, ratios = [], [], []
+    failures = 0
+    for start, goal in queries:
+        began = perf_counter()
+        result = search.execute((start, goal))
+        latencies.append(perf_counter() - began)
+        expanded.append(getattr(search, 'nodes_expanded', 0))
+        if goal in distances:
+            optimal = int(distances[goal][start.y, start.x])
+            cells = _path_cells(search, result)
+            if optimal == UNREACHABLE:
+                continue
+            if len(cells) == 0:
+                failures += 1
+            elif optimal > 0:
+                ratios.append((len(cells) - 1) / optimal)
+
+    tracemalloc.start()
+    memory_search = SEARCHES[search_name](grid)
+    for endpoints in queries:
+        memory_search.execute(endpoints)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'map': map_name,
+        'size': [grid.xsize, grid.ysize],
+        'search': search_name,
+        'queries': len(queries),
+        'setup_ms': setup * 1000,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.50) * 1000,
+            'p95': percentile(latencies, 0.95) * 1000,
+            'p99': percentile(latencies, 0.99) * 1000,
+            'mean': sum(latencies) / max(1, len(latencies)) * 1000,
+            'max': max(latencies, default=0) * 1000,
+        },
+        'nodes_expanded': {
+            'mean': sum(expanded) / max(1, len(expanded)),
+            'p50': percentile(expanded, 0.50),
+            'max': max(expanded, default=0),
+        },
+        'peak_memory_bytes': peak,
+        'optimal_fraction': None if not check_optimal else
+        sum(1 for ratio in ratios if ratio <= 1.0) / max(1, len(ratios) + failures),
+        'max_length_ratio': max(ratios, default=None),
+        'failures': failures,
+    }
+
+
+def _metadata(**settings) -> dict:
+    metadata = {'python': platform.python_version(), 'platform': platform.platform()}
+    metadata.update(settings)
+    return metadata
+
+
+def run_generated(maps: list, sizes: list, searches: list, seed: int = 0, goals: int = 5, starts: int = 10,
+                  log=None) -> dict:
+    """
+    :return: Results of every (map generator, size, search) combination, the same every time for the same seed.
+    """
+    cases = []
+    for map_name in maps:
+        for size in sizes:
+            grid = GENERATORS[map_name](size, seed)
+            queries = make_queries(grid, goals, starts, seed)
+            for search_name in searches:
+                case = run_case(map_name, grid, search_name, queries)
+                cases.append(case)
+                if log is not None:
+                    log(case)
+    return {'metadata': _metadata(seed=seed, goals=goals, starts=starts), 'cases': cases}
+
+
+def run_scenarios(scenario_path: str, map_dir: str, searches: list, check_optimal: bool = True, log=None) -> dict:
+    """
+    :return: Results of every search on the problems of a MovingAI .scen file, one case per map.
+    """
+    by_map = {}
+    for scenario in read_scenarios(scenario_path):
+        by_map.setdefault(scenario.map_name, []).append(scenario)
+    cases = []
+    for map_name, scenarios in by_map.items():
+        grid = read_map(os.path.join(map_dir, map_name))
+        queries = [(scenario.start, scenario.goal) for scenario in scenarios
+                   if not grid.is_obstacle(scenario.start) and not grid.is_obstacle(scenario.goal)]
+        for search_name in searches:
+            case = run_case(map_name, grid, search_name, queries, check_optimal)
+            cases.append(case)
+            if log is not None:
+                log(case)
+    return {'metadata': _metadata(scenarios=scenario_path), 'cases': cases}
+
+
+def compare(old: dict, new: dict, threshold: float = 0.10) -> list:
+    """
+    :param old: Results of run_generated or run_scenarios (baseline).
+    :param new: Results of the same run after a change.
+    :param threshold: Allowed relative increase of latency, nodes expanded and memory.
+    :return: One message per regression, empty list if nothing got worse.
+    """
+    def key(case):
+        return case['map'], tuple(case['size']), case['search']
+
+    baseline = {key(case): case for case in old['cases']}
+    regressions = []
+    for case in new['cases']:
+        before = baseline.get(key(case))
+        if before is None:
+            continue
+        name = "{} {}x{} {}".format(case['map'], case['size'][0], case['size'][1], case['search'])
+        checks = [('latency ' + stat, before['latency_ms'][stat], case['latency_ms'][stat]) for stat in LATENCY_KEYS]
+        checks.append(('nodes expanded', before['nodes_expanded']['mean'], case['nodes_expanded']['mean']))
+        checks.append(('peak memory', before['peak_memory_bytes'], case['peak_memory_bytes']))
+        for metric, old_value, new_value in checks:
+            if new_value > old_value * (1 + threshold) and new_value > old_value:
+                regressions.append("{}: {} {:.4g} -> {:.4g} (+{:.0f}%)".format(
+                    name, metric, old_value, new_value, 100 * (new_value / old_value - 1) if old_value else 100))
+        if before['optimal_fraction'] is not None and case['optimal_fraction'] is not None and \
+                case['optimal_fraction'] < before['optimal_fraction']:
+            regressions.append("{}: optimal paths {:.1%} -> {:.1%}".format(
+                name, before['optimal_fraction'], case['optimal_fraction']))
+        if case['failures'] > before['failures']:
+            regressions.append("{}: failures {} -> {}".format(name, before['failures'], case['failures']))
+    return regressions
+
+
+def _print_case(case: dict) -> None:
+    latency = case['latency_ms']
+    print("{:<10} {:>4}x{:<4} {:<9} p50 {:8.3f} ms  p95 {:8.3f} ms  p99 {:8.3f} ms  expanded {:8.1f}  "
+          "peak {:7.0f} KiB  optimal {}".format(
+              case['map'], case['size'][0], case['size'][1], case['search'], latency['p50'], latency['p95'],
+              latency['p99'], case['nodes_expanded']['mean'], case['peak_memory_bytes'] / 1024,
+              '-' if case['optimal_fraction'] is None else '{:.0%}'.format(case['optimal_fraction'])),
+          file=sys.stderr)
+
+
+def _write(results: dict, output: str) -> None:
+    if output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(output, 'w') as result_file:
+            json.dump(results, result_file, indent=2)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m Benchmark.benchmark', description='Path search benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='benchmark on generated maps')
+    run.add_argument('--maps', nargs='+', default=sorted(GENERATORS), choices=sorted(GENERATORS))
+    run.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    run.add_argument('--searches', nargs='+', default=['jps'], choices=sorted(SEARCHES))
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--goals', type=int, default=5)
+    run.add_argument('--starts', type=int, default=10, help='start cells per goal')
+    run.add_argument('--output')
+    scen = commands.add_parser('scen', help='benchmark on a MovingAI scenario file')
+    scen.add_argument('scenario')
+    scen.add_argument('--map-dir', default='.')
+    scen.add_argument('--searches', nargs='+', default=['jps'], choices=sorted(SEARCHES))
+    scen.add_argument('--no-optimality', action='store_true', help='skip the breadth first reference distances')
+    scen.add_argument('--output')
+    comparison = commands.add_parser('compare', help='list regressions between two result files')
+    comparison.add_argument('old')
+    comparison.add_argument('new')
+    comparison.add_argument('--threshold', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        _write(run_generated(args.maps, args.sizes, args.searches, args.seed, args.goals, args.starts, _print_case),
+               args.output)
+    elif args.command == 'scen':
+        _write(run_scenarios(args.scenario, args.map_dir, args.searches, not args.no_optimality, _print_case),
+               args.output)
+    else:
+        with open(args.old) as old_file, open(args.new) as new_file:
+            regressions = compare(json.load(old_file), json.load(new_file), args.threshold)
+        for regression in regressions:
+            print(regression)
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import random
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.uniform_grid import grid_from_rows
+from Symmetry.map_symmetry import HORIZONTAL
+
+"""
+File: map_generators.py
+Author: Nathan Robertson
+Purpose:
+    Seeded map generators for the benchmark suite. The same (size, seed) always gives the same map, unlike
+    make_diagonal_grid in jps_timing.py which draws from the global random module.
+    Every generator builds the bitboard rows directly (bit x of rows[y] set for an obstacle) and returns a grid.
+
+    noise: Every cell is an obstacle with probability density.
+    maze: Recursive backtracker maze with corridors one cell wide.
+    rooms: Rectangular rooms separated by walls with doors, like building interiors.
+    symmetric: Battlecode 2019 style terrain, clumps of impassable tiles mirrored across a random axis.
+    mirrored_map: Noise mirrored across a given axis on a grid of any shape, for the Symmetry tests and timings.
+"""
+
+
+__all__ = ["noise_map", "maze_map", "rooms_map", "symmetric_map", "mirrored_map", "GENERATORS"]
+
+
+def _grid(rows: list, size: int, grid_class):
+    return grid_from_rows(grid_class, size, size, rows)
+
+
+def noise_map(size: int, seed: int, density: float = 0.2, grid_class=DiagonalGrid):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(size):
+        row = 0
+        for x in range(size):
+            if rng.random() < density:
+                row |= 1 << x
+        rows.append(row)
+    return _grid(rows, size, grid_class)
+
+
+def maze_map(size: int, seed: int, grid_class=DiagonalGrid):
+    """
+    Passages are carved between the cells at odd coordinates, everything else stays wall.
+    """
+    rng = random.Random(seed)
+    full = (1 << size) - 1
+    rows = [full] * size
+
+    def carve(x, y):
+        rows[y] &= ~(1 << x)
+
+    cells = (size - 1) // 2
+    if cells == 0:
+        return _grid([0] * size, size, grid_class)
+    visited = [[False] * cells for _ in range(cells)]
+    stack = [(0, 0)]
+    visited[0][0] = True
+    carve(1, 1)
+    while stack:
+        cx, cy = stack[-1]
+        options = [(nx, ny) for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1))
+                   if 0 <= nx < cells and 0 <= ny < cells and not visited[ny][nx]]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny = rng.choice(options)
+        visited[ny][nx] = True
+        carve(cx + nx + 1, cy + ny + 1)
+        carve(2 * nx + 1, 2 * ny + 1)
+        stack.append((nx, ny))
+    return _grid(rows, size, grid_class)
+
+
+def rooms_map(size: int, seed: int, room_size: int = 8, grid_class=DiagonalGrid):
+    """
+    Walls every room_size cells in both directions with a door of width 2 at a random place in every wall segment.
+    """
+    rng = random.Random(seed)
+    rows = [0] * size
+    for wall in range(room_size, size, room_size):
+        for start in range(0, size, room_size):
+            end = min(start + room_size, size)
+            door = rng.randrange(start, max(start + 1, end - 2))
+            for offset in range(start, end):
+                if door <= offset < door + 2:
+                    continue
+                rows[wall] |= 1 << offset
+                rows[offset] |= 1 << wall
+    return _grid(rows, size, grid_class)
+
+
+def symmetric_map(size: int, seed: int, density: float = 0.15, grid_class=DiagonalGrid):
+    """
+    Grows random clumps in the top or left half until about density of the map is blocked and mirrors them.
+    """
+    rng = random.Random(seed)
+    horizontal = rng.random() < 0.5
+    blocked = set()
+    half = (size + 1) // 2
+    target = int(density * size * half)
+    while len(blocked) < target:
+        x, y = rng.randrange(size), rng.randrange(half)
+        for _ in range(rng.randrange(1, 12)):
+            if 0 <= x < size and 0 <= y < half:
+                blocked.add((x, y))
+            x, y = x + rng.choice((-1, 0, 1)), y + rng.choice((-1, 0, 1))
+    rows = [0] * size
+    for x, y in blocked:
+        if horizontal:
+            rows[y] |= 1 << x
+            rows[size - 1 - y] |= 1 << x
+        else:
+            rows[x] |= 1 << y
+            rows[x] |= 1 << (size - 1 - y)
+    return _grid(rows, size, grid_class)
+
+
+def mirrored_map(xsize: int, ysize: int, axis: str, density: float, seed: int, grid_class=DiagonalGrid):
+    """
+    :param axis: HORIZONTAL mirrors row y onto row ysize - 1 - y, VERTICAL column x onto column xsize - 1 - x.
+    """
+    rng = random.Random(seed)
+    rows = [0] * ysize
+    for x in range(xsize):
+        for y in range(ysize):
+            if rng.random() < density:
+                rows[y] |= 1 << x
+                if axis == HORIZONTAL:
+                    rows[ysize - 1 - y] |= 1 << x
+                else:
+                    rows[y] |= 1 << (xsize - 1 - x)
+    return grid_from_rows(grid_class, xsize, ysize, rows)
+
+
+GENERATORS = {
+    'noise': noise_map,
+    'maze': maze_map,
+    'rooms': rooms_map,
+    'symmetric': symmetric_map,
+}
@@ -0,0 +1,111 @@
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.uniform_grid import grid_from_rows
+
+"""
+File: moving_ai.py
+Author: Nathan Robertson
+Purpose:
+    Reader and writer for the MovingAI benchmark formats (https://movingai.com/benchmarks/formats.html), so the
+    searches can be run on the standard game maps as well as the generated ones.
+
+    .map: A header (type, height, width, map) followed by one line of characters per row.
+          '.', 'G' and 'S' are passable, '@', 'O', 'T' and 'W' are not (water counts as blocked for a ground unit).
+    .scen: "version 1" then one tab separated problem per line:
+           bucket, map file, map width, map height, start x, start y, goal x, goal y, optimal length.
+
+    The optimal lengths in .scen files are octile distances (diagonals cost sqrt 2, no corner cutting). Our grids
+    count every move as one and let diagonals pass between two obstacles, so the benchmark checks optimality
+    against its own breadth first search instead.
+"""
+
+
+__all__ = ["Scenario", "parse_map", "read_map", "write_map", "parse_scenarios", "read_scenarios"]
+
+PASSABLE = frozenset('.GS')
+
+
+class Scenario:
+    __slots__ = ('bucket', 'map_name', 'width', 'height', 'start', 'goal', 'optimal_length')
+
+    def __init__(self, bucket: int, map_name: str, width: int, height: int, start: Coord, goal: Coord,
+                 optimal_length: float):
+        self.bucket = bucket
+        self.map_name = map_name
+        self.width = width
+        self.height = height
+        self.start = start
+        self.goal = goal
+        self.optimal_length = optimal_length
+
+
+def parse_map(lines, grid_class=DiagonalGrid):
+    """
+    :param lines: Lines of a .map file.
+    :return: Grid with the map's obstacles.
+    """
+    lines = iter(lines)
+    header = {}
+    for line in lines:
+        line = line.strip()
+        if line == 'map':
+            break
+        if line:
+            key, value = line.split(None, 1)
+            header[key] = value
+    if 'width' not in header or 'height' not in header:
+        raise ValueError("Map header must give width and height")
+    width, height = int(header['width']), int(header['height'])
+    rows = []
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if len(rows) == height:
+            break
+        if len(line) < width:
+            raise ValueError("Map row " + str(len(rows)) + " is shorter than the width " + str(width))
+        row = 0
+        for x in range(width):
+            if line[x] not in PASSABLE:
+                row |= 1 << x
+        rows.append(row)
+    if len(rows) != height:
+        raise ValueError("Map has " + str(len(rows)) + " rows, expected " + str(height))
+    return grid_from_rows(grid_class, width, height, rows)
+
+
+def read_map(path: str, grid_class=DiagonalGrid):
+    with open(path) as map_file:
+        return parse_map(map_file, grid_class)
+
+
+def write_map(grid, path: str) -> None:
+    """
+    Saves a grid as an octile .map file, obstacles as '@'.
+    """
+    rows = grid.bitboard.rows
+    with open(path, 'w') as map_file:
+        map_file.write("type octile\nheight {}\nwidth {}\nmap\n".format(grid.ysize, grid.xsize))
+        for bits in rows:
+            map_file.write(''.join('@' if (bits >> x) & 1 else '.' for x in range(grid.xsize)) + '\n')
+
+
+def parse_scenarios(lines) -> list:
+    """
+    :param lines: Lines of a .scen file.
+    :return: One Scenario per problem.
+    """
+    scenarios = []
+    for line in lines:
+        fields = line.rstrip('\r\n').split('\t')
+        if len(fields) < 9:
+            continue
+        bucket, map_name, width, height, start_x, start_y, goal_x, goal_y, optimal = fields[:9]
+        scenarios.append(Scenario(int(bucket), map_name, int(width), int(height),
+                                  Coord(int(start_x), int(start_y)), Coord(int(goal_x), int(goal_y)),
+                                  float(optimal)))
+    return scenarios
+
+
+def read_scenarios(path: str) -> list:
+    with open(path) as scenario_file:
+        return parse_scenarios(scenario_file)
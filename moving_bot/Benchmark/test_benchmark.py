@@ -0,0 +1,113 @@
+import unittest
+import os
+import copy
+import json
+import tempfile
+from Coordinate.coord import Coord
+from Benchmark.map_generators import GENERATORS, maze_map, symmetric_map
+from Benchmark.moving_ai import parse_map, parse_scenarios, write_map, read_map
+from Benchmark.benchmark import run_generated, run_scenarios, compare, percentile, main
+from Symmetry.map_symmetry import symmetry_axes
+from FlowField.flow_field import obstacle_array, distance_field, UNREACHABLE
+
+
+"""
+File: test_benchmark.py
+Author: Nathan Robertson
+Purpose: Test the seeded map generators, the MovingAI readers and benchmark result comparison.
+"""
+
+MAP_TEXT = """type octile
+height 3
+width 4
+map
+.@..
+.T.G
+S...
+"""
+
+SCEN_TEXT = "version 1\n0\tsmall.map\t4\t3\t0\t0\t3\t0\t3.82842712\n1\tsmall.map\t4\t3\t0\t2\t3\t2\t3\n"
+
+
+class MapGeneratorTest(unittest.TestCase):
+    def test_seeded(self):
+        for name, generator in GENERATORS.items():
+            self.assertEqual(generator(32, 7).bitboard.rows, generator(32, 7).bitboard.rows, name)
+            self.assertNotEqual(generator(32, 7).bitboard.rows, generator(32, 8).bitboard.rows, name)
+
+    def test_maze_connected(self):
+        grid = maze_map(21, 3)
+        blocked = obstacle_array(grid)
+        distance = distance_field(blocked, [Coord(1, 1)], grid.NEIGHBOR_OFFSETS)
+        self.assertFalse(((distance == UNREACHABLE) & ~blocked).any())
+
+    def test_symmetric(self):
+        for seed in range(4):
+            self.assertTrue(len(symmetry_axes(symmetric_map(33, seed))) > 0)
+
+
+class MovingAITest(unittest.TestCase):
+    def test_parse_map(self):
+        grid = parse_map(MAP_TEXT.splitlines())
+        self.assertEqual((4, 3), (grid.xsize, grid.ysize))
+        self.assertEqual({Coord(1, 0), Coord(1, 1)}, grid.obstacles())
+
+    def test_bad_map(self):
+        self.assertRaises(ValueError, parse_map, ["height 2", "width 2", "map", ".."])
+
+    def test_parse_scenarios(self):
+        scenarios = parse_scenarios(SCEN_TEXT.splitlines())
+        self.assertEqual(2, len(scenarios))
+        self.assertEqual('small.map', scenarios[0].map_name)
+        self.assertEqual((Coord(0, 0), Coord(3, 0)), (scenarios[0].start, scenarios[0].goal))
+        self.assertAlmostEqual(3.82842712, scenarios[0].optimal_length)
+
+    def test_round_trip_and_scenario_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            grid = parse_map(MAP_TEXT.splitlines())
+            write_map(grid, os.path.join(directory, 'small.map'))
+            self.assertEqual(grid.obstacles(), read_map(os.path.join(directory, 'small.map')).obstacles())
+            with open(os.path.join(directory, 'small.map.scen'), 'w') as scen_file:
+                scen_file.write(SCEN_TEXT)
+            results = run_scenarios(os.path.join(directory, 'small.map.scen'), directory, ['jps', 'astar'])
+            self.assertEqual(2, len(results['cases']))
+            self.assertEqual([1.0, 1.0], [case['optimal_fraction'] for case in results['cases']])
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(50, percentile(values, 0.5))
+        self.assertEqual(99, percentile(values, 0.99))
+        self.assertEqual(0, percentile([], 0.5))
+
+    def test_run_and_compare(self):
+        results = run_generated(['noise', 'maze'], [16], ['jps', 'jps_plus'], seed=1, goals=2, starts=3)
+        self.assertEqual(4, len(results['cases']))
+        for case in results['cases']:
+            self.assertEqual(1.0, case['optimal_fraction'])
+            self.assertEqual(0, case['failures'])
+            self.assertTrue(case['nodes_expanded']['mean'] > 0)
+        self.assertEqual([], compare(results, results))
+        slower = copy.deepcopy(results)
+        slower['cases'][0]['latency_ms']['p99'] = results['cases'][0]['latency_ms']['p99'] * 2 + 1
+        slower['cases'][1]['optimal_fraction'] = 0.5
+        regressions = compare(results, slower)
+        self.assertEqual(2, len(regressions))
+        self.assertTrue('latency p99' in regressions[0])
+
+    def test_compare_command(self):
+        results = run_generated(['rooms'], [16], ['astar'], seed=2, goals=1, starts=2)
+        worse = copy.deepcopy(results)
+        worse['cases'][0]['failures'] = 1
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, name) for name in ('old.json', 'new.json')]
+            for path, data in zip(paths, (results, worse)):
+                with open(path, 'w') as result_file:
+                    json.dump(data, result_file)
+            self.assertEqual(0, main(['compare', paths[0], paths[0]]))
+            self.assertEqual(1, main(['compare', paths[0], paths[1]]))
+
+
+if __name__ == '__main__':
+    unittest.main()
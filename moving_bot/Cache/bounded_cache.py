@@ -0,0 +1,104 @@
+from collections import OrderedDict
+
+"""
+File: bounded_cache.py
+Author: Nathan Robertson
+Purpose:
+    A least recently used cache with a cap on the number of entries and/or an estimated memory size.
+    Unlike functools.lru_cache it belongs to one object (a grid or a searcher) so it is freed along with it,
+    entries can be validated on lookup, and it keeps hit, miss, eviction and invalidation counters.
+"""
+
+
+__all__ = ["LRUCache"]
+
+
+class LRUCache:
+    def __init__(self, max_entries: int = None, max_bytes: int = None, size_fn=None):
+        """
+        :param max_entries: Most entries kept at once, None for no limit.
+        :param max_bytes: Most estimated bytes kept at once, None for no limit.
+        :param size_fn: Function estimating the size of a value in bytes (only needed with max_bytes).
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_fn = size_fn
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self.entries
+
+    def get(self, key, default=None, validate=None):
+        """
+        :param key:
+        :param default: Returned on a miss.
+        :param validate: Optional function of the cached value. A value it rejects is dropped and counted as an
+                         invalidation and a miss.
+        :return: Cached value or default.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value = entry[0]
+        if validate is not None and not validate(value):
+            self.pop(key)
+            self.invalidations += 1
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        """
+        Stores value under key then evicts least recently used entries until the cache is within its limits.
+        The new entry itself is never evicted.
+        """
+        self.pop(key)
+        size = self.size_fn(value) if self.size_fn is not None else 0
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while len(self.entries) > 1 and self._over_limit():
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return default
+        self.bytes -= entry[1]
+        return entry[0]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        """
+        :return: Counters and current size of the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0,
+        }
+
+    def _over_limit(self) -> bool:
+        if self.max_entries is not None and len(self.entries) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.bytes > self.max_bytes
@@ -0,0 +1,37 @@
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jps_timing import make_diagonal_grid
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from AStar.astar_timing import random_endpoints
+import tracemalloc
+import random
+
+"""
+File: cache_memory_timing.py
+Author: Nathan Robertson
+Purpose:
+    Simulates a long benchmark run: many maps are played one after another, each with its own grid, search and
+    queries. Traced memory should stay flat because the caches belong to the grid and search of the current map
+    and are bounded. Cache statistics of the last map are printed at the end.
+
+    Run from the moving_bot directory with: python -m Cache.cache_memory_timing
+"""
+
+
+maps = 200
+report_every = 25
+size = 40
+queries = 20
+
+if __name__ == "__main__":
+    random.seed(0)
+    tracemalloc.start()
+    jps = None
+    for played in range(1, maps + 1):
+        grid = make_diagonal_grid((size, size), obstacle_prob=15)
+        jps = JumpPointSearch(grid, diagonal_tie_breaker)
+        for endpoints in random_endpoints(grid, queries):
+            jps.connect_path(jps.execute(endpoints))
+        if played % report_every == 0:
+            current, peak = tracemalloc.get_traced_memory()
+            print(str(played) + " maps played, traced memory " + str(current) + " bytes (peak " + str(peak) + ")")
+    print(jps.cache_stats())
@@ -0,0 +1,47 @@
+import sys
+from Coordinate.coord import Coord
+from Cache.bounded_cache import LRUCache
+
+"""
+File: grid_cache.py
+Author: Nathan Robertson
+Purpose:
+    Bounded per-instance cache for values derived from a grid's obstacles (neighbor lists, forced neighbors).
+    It replaces functools.lru_cache on instance methods, which kept every grid and searcher alive for the life of
+    the process, grew without limit across maps and went stale after insert_obstacle.
+    The cache remembers the grid version it was filled under and empties itself on the first lookup after the
+    grid changes.
+"""
+
+
+__all__ = ["GridCache", "container_bytes"]
+
+ITEM_BYTES = sys.getsizeof(Coord())
+
+
+def container_bytes(value) -> int:
+    """
+    :return: Estimated memory of a list or set of Coords.
+    """
+    return sys.getsizeof(value) + len(value) * ITEM_BYTES
+
+
+class GridCache(LRUCache):
+    def __init__(self, grid, max_entries: int = 4096):
+        super().__init__(max_entries, None, container_bytes)
+        self.grid = grid
+        self.version = grid.version
+
+    def get(self, key, default=None, validate=None):
+        self._check_version()
+        return super().get(key, default, validate)
+
+    def put(self, key, value) -> None:
+        self._check_version()
+        super().put(key, value)
+
+    def _check_version(self) -> None:
+        if self.version != self.grid.version:
+            self.invalidations += len(self.entries)
+            self.clear()
+            self.version = self.grid.version
@@ -0,0 +1,116 @@
+import sys
+from Coordinate.coord import Coord
+from Cache.bounded_cache import LRUCache
+
+"""
+File: path_cache.py
+Author: Nathan Robertson
+Purpose:
+    A bounded cache in front of a path search (JumpPointSearch, AStar or anything with execute(endpoints)).
+    The same (start, goal) queries come up turn after turn, e.g. castle to karbonite tile.
+    Every entry remembers the grid version it was checked against. When the grid has changed since then the
+    entry is not thrown away: only the cells on the cached path are checked and the entry is kept if none of them
+    became an obstacle. A path kept this way is still walkable but may no longer be the shortest if obstacles were
+    removed elsewhere, which is the trade off for not searching again.
+    Given a MapSymmetry, a query whose mirror image is cached is answered by reflecting that entry, so only one of
+    each mirrored pair of paths is searched and stored.
+"""
+
+
+__all__ = ["PathCache", "CachedPath"]
+
+ITEM_BYTES = sys.getsizeof(Coord())
+
+
+class CachedPath:
+    __slots__ = ('version', 'result', 'cells')
+
+    def __init__(self, version: int, result: list, cells: list):
+        self.version = version
+        self.result = result
+        self.cells = cells
+
+
+def cached_path_bytes(entry: CachedPath) -> int:
+    """
+    :return: Estimated memory held by a cache entry.
+    """
+    return sys.getsizeof(entry.result) + sys.getsizeof(entry.cells) + \
+        (len(entry.result) + len(entry.cells)) * ITEM_BYTES
+
+
+class PathCache:
+    def __init__(self, search, max_entries: int = 1024, max_bytes: int = None, symmetry=None):
+        """
+        :param search: Searcher to cache, its grid must be a UniformGrid.
+        :param max_entries: Most paths kept.
+        :param max_bytes: Most estimated memory used by the kept paths, None for no limit.
+        :param symmetry: MapSymmetry of the grid, used while the grid is still mirrored.
+        """
+        self.search = search
+        self.grid = search.grid
+        self.cache = LRUCache(max_entries, max_bytes, cached_path_bytes)
+        self.symmetry = symmetry
+        self.mirrored_hits = 0
+
+    def execute(self, endpoints: (Coord, Coord)) -> list:
+        """
+        :return: Same as search.execute(endpoints), from the cache when possible.
+        """
+        return self._lookup(endpoints).result
+
+    def path(self, endpoints: (Coord, Coord)) -> list:
+        """
+        :return: Every cell from start to goal (connect_path of the jump points for jump point search).
+        """
+        return self._lookup(endpoints).cells
+
+    def stats(self) -> dict:
+        """
+        :return: LRUCache stats plus mirrored_hits, queries answered by reflecting a cached path (each of those also
+                 counts as a miss of its own key and a hit of the mirrored key).
+        """
+        stats = self.cache.stats()
+        stats['mirrored_hits'] = self.mirrored_hits
+        return stats
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def _lookup(self, endpoints) -> CachedPath:
+        start, goal = endpoints
+        key = (start.x, start.y, goal.x, goal.y)
+        entry = self.cache.get(key, validate=self._is_valid)
+        if entry is None and self.symmetry is not None and self.symmetry.holds():
+            entry = self._mirrored_lookup(start, goal)
+        if entry is None:
+            result = self.search.execute(endpoints)
+            cells = self.search.connect_path(result) if hasattr(self.search, 'connect_path') else result
+            entry = CachedPath(self.grid.version, result, cells)
+            self.cache.put(key, entry)
+        return entry
+
+    def _mirrored_lookup(self, start: Coord, goal: Coord):
+        """
+        :return: The cached path between the reflections of start and goal, reflected, or None.
+        """
+        symmetry = self.symmetry
+        mirror_start, mirror_goal = symmetry.reflect(start), symmetry.reflect(goal)
+        entry = self.cache.get((mirror_start.x, mirror_start.y, mirror_goal.x, mirror_goal.y), validate=self._is_valid)
+        if entry is None:
+            return None
+        self.mirrored_hits += 1
+        return CachedPath(entry.version, symmetry.reflect_path(entry.result), symmetry.reflect_path(entry.cells))
+
+    def _is_valid(self, entry: CachedPath) -> bool:
+        version = self.grid.version
+        if entry.version == version:
+            return True
+        if len(entry.cells) == 0:
+            return False
+        test = self.grid.bitboard.test
+        for cell in entry.cells:
+            if test(cell.x, cell.y):
+                return False
+        entry.version = version
+        return True
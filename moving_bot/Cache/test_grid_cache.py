@@ -0,0 +1,57 @@
+import unittest
+import gc
+import weakref
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from JumpPointSearch.jump_point_search_plus import JumpPointSearchPlus
+from Cache.grid_cache import GridCache
+from heuristics import diagonal
+
+
+"""
+File: test_grid_cache.py
+Author: Nathan Robertson
+Purpose: Test that per grid caches are bounded, follow obstacle changes and do not keep grids alive.
+"""
+
+
+class GridCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = DiagonalGrid(4, 4, [])
+
+    def test_cleared_on_grid_change(self):
+        cache = GridCache(self.grid, 2)
+        cache.put('a', [])
+        self.grid.insert_obstacle(Coord(1, 1))
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(1, cache.stats()['invalidations'])
+
+    def test_neighbors_follow_obstacles(self):
+        self.assertTrue(Coord(1, 1) in self.grid.neighbors(Coord(0, 0)))
+        self.grid.insert_obstacle(Coord(1, 1))
+        self.assertFalse(Coord(1, 1) in self.grid.neighbors(Coord(0, 0)))
+        self.grid.neighbors(Coord(0, 0))
+        self.assertEqual(1, self.grid.neighbor_cache.stats()['hits'])
+
+    def test_forced_neighbors_follow_obstacles(self):
+        jps = JumpPointSearch(self.grid, diagonal)
+        self.assertFalse(jps.has_forced_neighbors(Coord(0, 2), Coord(0, 1)))
+        self.grid.insert_obstacle(Coord(1, 2))
+        self.assertTrue(jps.has_forced_neighbors(Coord(0, 2), Coord(0, 1)))
+        self.assertTrue('forced_neighbors' in jps.cache_stats())
+
+    def test_jump_tables_follow_obstacles(self):
+        jps = JumpPointSearchPlus(self.grid, diagonal)
+        self.assertIsNone(jps.jump(Coord(0, 0), Coord(0, 1), Coord(3, 3)))
+        self.grid.insert_obstacle(Coord(1, 2))
+        self.assertEqual(Coord(0, 2), jps.jump(Coord(0, 0), Coord(0, 1), Coord(3, 3)))
+
+    def test_grid_released(self):
+        grid = DiagonalGrid(4, 4, [])
+        jps = JumpPointSearch(grid, diagonal)
+        jps.execute((Coord(0, 0), Coord(3, 3)))
+        reference = weakref.ref(grid)
+        del grid, jps
+        gc.collect()
+        self.assertIsNone(reference())
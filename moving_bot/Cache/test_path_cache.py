@@ -0,0 +1,88 @@
+import unittest
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from AStar.astar import AStar
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from Cache.bounded_cache import LRUCache
+from Cache.path_cache import PathCache
+from heuristics import diagonal
+
+
+"""
+File: test_path_cache.py
+Author: Nathan Robertson
+Purpose: Test LRU eviction, validation and the grid version aware path cache.
+"""
+
+
+class LRUCacheTest(unittest.TestCase):
+    def test_entry_limit(self):
+        cache = LRUCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertTrue('a' in cache)
+        self.assertFalse('b' in cache)
+        self.assertEqual(1, cache.evictions)
+
+    def test_byte_limit(self):
+        cache = LRUCache(max_bytes=10, size_fn=len)
+        cache.put('a', 'xxxxxx')
+        cache.put('b', 'yyyyyy')
+        self.assertEqual(['b'], list(cache.entries))
+        self.assertEqual(6, cache.bytes)
+
+    def test_stats_and_validation(self):
+        cache = LRUCache()
+        cache.put('a', 1)
+        self.assertEqual(1, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNone(cache.get('a', validate=lambda value: False))
+        stats = cache.stats()
+        self.assertEqual((1, 2, 1, 0), (stats['hits'], stats['misses'], stats['invalidations'], stats['entries']))
+        self.assertAlmostEqual(1 / 3, stats['hit_rate'])
+
+
+class PathCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = DiagonalGrid(6, 6, [])
+        self.endpoints = (Coord(0, 0), Coord(5, 0))
+
+    def test_hits_and_misses(self):
+        cache = PathCache(JumpPointSearch(self.grid, diagonal))
+        first = cache.path(self.endpoints)
+        self.assertEqual(6, len(first))
+        self.assertIs(first, cache.path(self.endpoints))
+        self.assertEqual(first, JumpPointSearch(self.grid, diagonal).connect_path(cache.execute(self.endpoints)))
+        self.assertEqual((2, 1), (cache.stats()['hits'], cache.stats()['misses']))
+
+    def test_grid_version(self):
+        version = self.grid.version
+        self.grid.insert_obstacle(Coord(3, 3))
+        self.grid.insert_obstacle(Coord(3, 3))
+        self.grid.remove_obstacle(Coord(3, 3))
+        self.assertEqual(version + 2, self.grid.version)
+
+    def test_revalidation_off_path(self):
+        cache = PathCache(AStar(self.grid, diagonal))
+        cache.path(self.endpoints)
+        self.grid.insert_obstacle(Coord(3, 4))
+        cache.path(self.endpoints)
+        self.assertEqual(1, cache.stats()['hits'])
+        self.assertEqual(0, cache.stats()['invalidations'])
+
+    def test_invalidation_on_path(self):
+        cache = PathCache(AStar(self.grid, diagonal))
+        path = cache.path(self.endpoints)
+        self.grid.insert_obstacle(path[2])
+        new_path = cache.path(self.endpoints)
+        self.assertFalse(path[2] in new_path)
+        self.assertEqual(1, cache.stats()['invalidations'])
+
+    def test_eviction(self):
+        cache = PathCache(AStar(self.grid, diagonal), max_entries=1)
+        cache.path(self.endpoints)
+        cache.path((Coord(0, 0), Coord(0, 5)))
+        self.assertEqual(1, cache.stats()['evictions'])
+        self.assertEqual(1, cache.stats()['entries'])
@@ -0,0 +1,103 @@
+from Coordinate.coord import Coord
+from Cooperative.reservation_table import ReservationTable
+from Cooperative.space_time_astar import SpaceTimeAStar
+
+"""
+File: cooperative_planner.py
+Author: Nathan Robertson
+Purpose:
+    Plans paths for a group of units which do not run into each other (windowed hierarchical cooperative A*).
+    Units are planned one at a time in priority order with SpaceTimeAStar, each reserving its path in a shared
+    ReservationTable before the next one plans, so later units wait or go around instead of colliding.
+    Units plan again when they get to the end of their path without being on their goal (the window ran out or
+    they were boxed in), everyone else keeps following the path they have.
+
+Usage, once per turn:
+    planner.plan(units)                    # (unit, position, goal) for every unit, in priority order
+    planner.next_position(unit)            # where each unit moves this turn
+    planner.advance()                      # after everyone moved
+"""
+
+
+__all__ = ["CooperativePlanner", "DEFAULT_HORIZON"]
+
+DEFAULT_HORIZON = 32
+
+
+class CooperativePlanner:
+    def __init__(self, grid, horizon: int = DEFAULT_HORIZON):
+        """
+        :param grid: Any UniformGrid holding the static obstacles.
+        :param horizon: Turns ahead a unit plans and reserves.
+        """
+        self.grid = grid
+        self.table = ReservationTable(horizon)
+        self.search = SpaceTimeAStar(grid, self.table)
+        self.plans = {}
+        self.searches = 0
+        self.replans = 0
+
+    def plan(self, units: list) -> dict:
+        """
+        Plans every unit without a usable path, in the order given.
+        :param units: (unit id, current position, goal) tuples, highest priority first.
+        :return: Unit id to its planned Coords, one per turn from the current one.
+        """
+        for unit, position, goal in units:
+            if self.needs_plan(unit, position, goal):
+                self.plan_unit(unit, position, goal)
+        return {unit: self.path(unit) for unit, _, _ in units}
+
+    def plan_unit(self, unit, position: Coord, goal: Coord) -> list:
+        """
+        Plans one unit now, dropping the path it had.
+        :return: Planned Coords, one per turn from the current one.
+        """
+        if unit in self.plans:
+            self.replans += 1
+        self.searches += 1
+        self.table.release(unit)
+        cells, reached = self.search.search(unit, position, goal)
+        self.table.reserve(unit, cells)
+        self.plans[unit] = (self.table.turn, cells, goal, reached)
+        return self.path(unit)
+
+    def needs_plan(self, unit, position: Coord, goal: Coord) -> bool:
+        """
+        :return: If unit has no path, its goal changed, it is not where its path says or its path ends before the goal.
+        """
+        plan = self.plans.get(unit)
+        if plan is None:
+            return True
+        first, cells, planned_goal, reached = plan
+        offset = self.table.turn - first
+        if planned_goal != goal or cells[min(offset, len(cells) - 1)] != position.y * self.grid.xsize + position.x:
+            return True
+        return not reached and offset >= len(cells) - 1
+
+    def path(self, unit) -> list:
+        """
+        :return: Coords unit is still to walk, starting with where it is this turn.
+        """
+        first, cells, _, _ = self.plans[unit]
+        xsize = self.grid.xsize
+        offset = min(self.table.turn - first, len(cells) - 1)
+        return [Coord(cell % xsize, cell // xsize) for cell in cells[offset:]]
+
+    def next_position(self, unit) -> Coord:
+        """
+        :return: Where unit stands after this turn's move.
+        """
+        first, cells, _, _ = self.plans[unit]
+        cell = cells[min(self.table.turn + 1 - first, len(cells) - 1)]
+        return Coord(cell % self.grid.xsize, cell // self.grid.xsize)
+
+    def remove(self, unit) -> None:
+        """
+        Forgets a unit which died or left, freeing the cells it had reserved.
+        """
+        self.table.release(unit)
+        self.plans.pop(unit, None)
+
+    def advance(self, turns: int = 1) -> None:
+        self.table.advance(turns)
@@ -0,0 +1,148 @@
+from Benchmark.map_generators import noise_map, rooms_map
+from Coordinate.coord import Coord
+from Cooperative.cooperative_planner import CooperativePlanner
+from FlowField.flow_field import obstacle_array, distance_field
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from UniformGrid.uniform_grid import grid_from_rows
+from time import perf_counter
+import random
+import sys
+
+"""
+File: cooperative_timing.py
+Author: Nathan Robertson
+Purpose:
+    10 to 100 units walk to their own goals on the same map, one move per turn, planned two ways:
+    independent: Every unit plans alone with JumpPointSearch. A unit whose next cell is taken replans with the
+                 other units inserted as obstacles (what the bot does today).
+    cooperative: CooperativePlanner, units planned in order of their id with a shared reservation table.
+    Reported per run: total planning time, searches, replans, units which arrived, mean turns to arrive and
+    collisions (two units moving onto one cell, which has to be 0 for cooperative planning; independent units
+    look before they move and replan instead).
+
+    Run from the moving_bot directory with: python -m Cooperative.cooperative_timing [unit counts...]
+"""
+
+
+size = 64
+turns = 300
+horizon = 32
+unit_counts = [10, 25, 50, 100]
+maps = {
+    'noise': lambda seed: noise_map(size, seed, density=0.15),
+    'rooms': lambda seed: rooms_map(size, seed),
+}
+
+
+def copy_grid(grid):
+    return grid_from_rows(grid.__class__, grid.xsize, grid.ysize, list(grid.bitboard.rows))
+
+
+def pick_units(grid, count: int, seed: int) -> (list, list):
+    """
+    :return: Distinct starts and distinct goals, every goal reachable from its start.
+    """
+    rng = random.Random(seed)
+    blocked = obstacle_array(grid)
+    free = [Coord(x, y) for y in range(grid.ysize) for x in range(grid.xsize) if not blocked[y, x]]
+    anchor = rng.choice(free)
+    distance = distance_field(blocked, [anchor], grid.NEIGHBOR_OFFSETS)
+    connected = [coord for coord in free if distance[coord.y, coord.x] >= 0]
+    cells = rng.sample(connected, 2 * count)
+    return cells[:count], cells[count:]
+
+
+class Run:
+    def __init__(self):
+        self.planning = 0.0
+        self.searches = 0
+        self.replans = 0
+        self.collisions = 0
+        self.arrival_turns = []
+
+    def report(self, name: str, units: int) -> None:
+        print("  {:<12} planning {:9.1f} ms  searches {:5}  replans {:5}  arrived {:3}/{:<3}  mean turns {:6.1f}  "
+              "collisions {}".format(name, self.planning * 1000, self.searches, self.replans, len(self.arrival_turns),
+                                     units, sum(self.arrival_turns) / max(1, len(self.arrival_turns)),
+                                     self.collisions))
+
+
+def independent(grid, starts: list, goals: list) -> Run:
+    grid = copy_grid(grid)
+    jps = JumpPointSearch(grid, diagonal_tie_breaker)
+    run = Run()
+    positions = list(starts)
+    paths = []
+    began = perf_counter()
+    for start, goal in zip(starts, goals):
+        paths.append(jps.connect_path(jps.execute((start, goal)))[1:])
+    run.planning += perf_counter() - began
+    run.searches += len(starts)
+    arrived = [False] * len(starts)
+    for turn in range(1, turns + 1):
+        occupied = set(positions)
+        for unit, position in enumerate(positions):
+            if arrived[unit]:
+                continue
+            step = paths[unit][0] if paths[unit] else None
+            if step is None or step in occupied:
+                began = perf_counter()
+                others = [cell for cell in occupied if cell != position]
+                for cell in others:
+                    grid.insert_obstacle(cell)
+                paths[unit] = jps.connect_path(jps.execute((position, goals[unit])))[1:]
+                for cell in others:
+                    grid.remove_obstacle(cell)
+                run.planning += perf_counter() - began
+                run.searches += 1
+                run.replans += 1
+                step = paths[unit][0] if paths[unit] else None
+                if step is None or step in occupied:
+                    continue
+            paths[unit].pop(0)
+            occupied.discard(position)
+            occupied.add(step)
+            positions[unit] = step
+            if step == goals[unit]:
+                arrived[unit] = True
+                run.arrival_turns.append(turn)
+        if all(arrived):
+            break
+    return run
+
+
+def cooperative(grid, starts: list, goals: list) -> Run:
+    planner = CooperativePlanner(grid, horizon)
+    run = Run()
+    positions = list(starts)
+    arrived = [False] * len(starts)
+    for turn in range(1, turns + 1):
+        began = perf_counter()
+        planner.plan([(unit, positions[unit], goals[unit]) for unit in range(len(positions))])
+        run.planning += perf_counter() - began
+        moved = [planner.next_position(unit) for unit in range(len(positions))]
+        run.collisions += len(moved) - len(set(moved))
+        planner.advance()
+        positions = moved
+        for unit, position in enumerate(positions):
+            if not arrived[unit] and position == goals[unit]:
+                arrived[unit] = True
+                run.arrival_turns.append(turn)
+        if all(arrived):
+            break
+    run.searches = planner.searches
+    run.replans = planner.replans
+    return run
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        unit_counts = [int(count) for count in sys.argv[1:]]
+    for map_name, generator in maps.items():
+        grid = generator(0)
+        for count in unit_counts:
+            starts, goals = pick_units(grid, count, count)
+            print("{} {}x{}, {} units, horizon {}".format(map_name, size, size, count, horizon))
+            independent(grid, starts, goals).report("independent", count)
+            cooperative(grid, starts, goals).report("cooperative", count)
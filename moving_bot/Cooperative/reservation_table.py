@@ -0,0 +1,146 @@
+"""
+File: reservation_table.py
+Author: Nathan Robertson
+Purpose:
+    Space-time reservation table for cooperative pathfinding (Silver 2005, "Cooperative Pathfinding").
+    A unit which has planned a path reserves the cell it will stand on every turn, later units plan around those
+    reservations instead of colliding in corridors and replanning.
+
+    Only the next horizon turns are kept, in a ring of horizon + 1 slots. Slot turn % (horizon + 1) maps cell ids
+    (y * xsize + x) to unit ids, plain ints so a reservation costs one dict entry. Moving the clock on with advance
+    empties the slot of every turn which went by, the work is the number of reservations that expired rather than
+    the size of the table.
+    A unit stays where its path ends (its goal, or wherever it waits to plan again), parked cells are reserved from
+    a turn onwards without a limit.
+
+Conflicts
+    Vertex: Two units on the same cell in the same turn.
+    Swap: Two units trading places between turn t and t + 1 (they would pass through each other).
+"""
+
+
+__all__ = ["ReservationTable"]
+
+
+class ReservationTable:
+    def __init__(self, horizon: int = 32, turn: int = 0):
+        """
+        :param horizon: Number of turns after the current one which can be reserved.
+        :param turn: Current turn.
+        """
+        self.horizon = horizon
+        self.turn = turn
+        self.slots = [{} for _ in range(horizon + 1)]
+        self.parked = {}
+        self.units = {}
+
+    def __len__(self):
+        return sum(len(slot) for slot in self.slots) + len(self.parked)
+
+    def last_turn(self) -> int:
+        """
+        :return: Latest turn which can be reserved.
+        """
+        return self.turn + self.horizon
+
+    def owner(self, cell: int, turn: int):
+        """
+        :return: Id of the unit holding cell in turn, None if nobody does or turn is outside the table.
+        """
+        if not self.turn <= turn <= self.turn + self.horizon:
+            return None
+        unit = self.slots[turn % len(self.slots)].get(cell)
+        if unit is None:
+            parked = self.parked.get(cell)
+            if parked is not None and parked[1] <= turn:
+                return parked[0]
+        return unit
+
+    def can_move(self, cell: int, next_cell: int, turn: int, unit) -> bool:
+        """
+        :return: If unit may go from cell in turn to next_cell in turn + 1 (next_cell == cell for waiting) without a
+                 vertex or swap conflict.
+        """
+        owner = self.owner(next_cell, turn + 1)
+        if owner is not None and owner != unit:
+            return False
+        if next_cell != cell:
+            other = self.owner(next_cell, turn)
+            if other is not None and other != unit and self.owner(cell, turn + 1) == other:
+                return False
+        return True
+
+    def can_park(self, cell: int, turn: int, unit) -> bool:
+        """
+        :return: If unit may stay on cell from turn to the end of the table.
+        """
+        parked = self.parked.get(cell)
+        if parked is not None and parked[0] != unit:
+            return False
+        for later in range(turn, self.turn + self.horizon + 1):
+            owner = self.slots[later % len(self.slots)].get(cell)
+            if owner is not None and owner != unit:
+                return False
+        return True
+
+    def reserve(self, unit, cells: list, turn: int = None, park: bool = True) -> None:
+        """
+        Reserves cells[i] for unit in turn + i, replacing what the unit had reserved before. Cells past the end of the
+        table are dropped, the unit has to plan again before it gets there.
+        :param cells: Cell ids, one per turn.
+        :param turn: Turn of cells[0], the current turn if None.
+        :param park: Keep the last cell after the path ends, the unit stays there until it plans again. Ignored if
+                     another unit is parked on it.
+        """
+        self.release(unit)
+        if turn is None:
+            turn = self.turn
+        first = max(turn, self.turn)
+        kept = cells[first - turn:self.turn + self.horizon + 1 - turn]
+        for offset, cell in enumerate(kept):
+            self.slots[(first + offset) % len(self.slots)][cell] = unit
+        parked = None
+        if park and len(cells) > 0 and turn + len(cells) - 1 <= self.turn + self.horizon and \
+                self.parked.get(cells[-1], (unit,))[0] == unit:
+            parked = cells[-1]
+            self.parked[parked] = (unit, turn + len(cells) - 1)
+        self.units[unit] = (first, kept, parked)
+
+    def release(self, unit) -> None:
+        """
+        Drops every reservation of unit which has not expired yet.
+        """
+        record = self.units.pop(unit, None)
+        if record is None:
+            return
+        for when, cell in self._pending(record):
+            slot = self.slots[when % len(self.slots)]
+            if slot.get(cell) == unit:
+                del slot[cell]
+        parked = record[2]
+        if parked is not None and self.parked.get(parked, (None,))[0] == unit:
+            del self.parked[parked]
+
+    def reservations(self, unit) -> list:
+        """
+        :return: (turn, cell) pairs still reserved by unit, in turn order.
+        """
+        record = self.units.get(unit)
+        if record is None:
+            return []
+        return [(when, cell) for when, cell in self._pending(record)
+                if self.slots[when % len(self.slots)].get(cell) == unit]
+
+    def _pending(self, record):
+        first, cells, _ = record
+        skip = max(0, self.turn - first)
+        return ((first + offset, cells[offset]) for offset in range(skip, len(cells)))
+
+    def advance(self, turns: int = 1) -> None:
+        """
+        Moves the clock on, dropping the reservations of every turn which has passed.
+        """
+        for _ in range(min(turns, len(self.slots))):
+            self.slots[self.turn % len(self.slots)].clear()
+            self.turn += 1
+        self.turn += max(0, turns - len(self.slots))
@@ -0,0 +1,132 @@
+from heapq import heappush, heappop
+from Cache.grid_cache import GridCache
+from Coordinate.coord import Coord
+from FlowField.flow_field import obstacle_array, distance_field, UNREACHABLE
+
+"""
+File: space_time_astar.py
+Author: Nathan Robertson
+Purpose:
+    A* over (cell, turn) states for one unit, avoiding the cells other units reserved in a ReservationTable.
+    Every turn the unit moves to a neighbor (the grid's NEIGHBOR_OFFSETS) or waits, both cost one turn, so g is the
+    number of turns since the search started and never has to be stored.
+
+    The heuristic is the true distance to the goal ignoring other units (Silver's reverse resumable search), taken
+    from a breadth first distance field per goal. Fields are cached (one per unit goal for up to cache_size goals)
+    until the grid changes. Reservations can only delay a unit, so the heuristic stays admissible and waiting is the only thing
+    the search has to work out.
+
+    The search looks no further than the end of the reservation table (windowed cooperative A*). The first state
+    popped at the end of the window has the lowest f, so a unit whose goal is further away gets the path to it and
+    plans again once it gets there. If the unit is boxed in it gets the path to the state closest to the goal where
+    it can stay until it plans again (nobody else has reserved the cell later on).
+"""
+
+
+__all__ = ["SpaceTimeAStar"]
+
+FIELD_CACHE_SIZE = 256
+
+
+class SpaceTimeAStar:
+    def __init__(self, grid, table, cache_size: int = FIELD_CACHE_SIZE):
+        """
+        :param grid: Any UniformGrid, its obstacles are the static map (units are in table, not on the grid).
+        :param table: ReservationTable shared by the units planned with this search.
+        """
+        self.grid = grid
+        self.table = table
+        self.fields = GridCache(grid, cache_size)
+        self.blocked = None
+        self.blocked_version = None
+        self.nodes_expanded = 0
+
+    def distances(self, goal: Coord) -> list:
+        """
+        :return: Flat list of moves from every cell id to goal, UNREACHABLE where goal cannot be reached.
+        """
+        field = self.fields.get(goal)
+        if field is None:
+            grid = self.grid
+            if self.blocked_version != grid.version:
+                self.blocked = obstacle_array(grid)
+                self.blocked_version = grid.version
+            field = distance_field(self.blocked, [goal], grid.NEIGHBOR_OFFSETS).ravel().tolist()
+            self.fields.put(goal, field)
+        return field
+
+    def search(self, unit, start: Coord, goal: Coord, turn: int = None) -> (list, bool):
+        """
+        :param unit: Id the unit's reservations are stored under, its own reservations never block it.
+        :param turn: Turn the unit stands on start, the table's current turn if None.
+        :return: (cell ids, one per turn starting with start, True if the path ends on goal and the unit can stay
+                 there). Without a way forward the unit waits on start for as long as it may.
+        """
+        grid, table = self.grid, self.table
+        xsize, ysize = grid.xsize, grid.ysize
+        cells = xsize * ysize
+        if turn is None:
+            turn = table.turn
+        start_id = start.y * xsize + start.x
+        goal_id = goal.y * xsize + goal.x
+        distance = self.distances(goal)
+        window = max(0, table.last_turn() - turn)
+        if distance[start_id] == UNREACHABLE:
+            self.nodes_expanded = 0
+            return self._wait(unit, start_id, turn, window), False
+        moves = [(dx, dy) for dx, dy in grid.NEIGHBOR_OFFSETS] + [(0, 0)]
+        rows = grid.bitboard.rows
+        depths = window + 1
+        # Heap keys order by f, then deeper states first (closer to the goal), then cell. state = g * cells + cell.
+        parent = {start_id: -1}
+        open_list = [(distance[start_id] * depths + window) * cells + start_id]
+        best, best_key = start_id, None
+        expanded = 0
+        while open_list:
+            key = heappop(open_list)
+            cell = key % cells
+            g = window - (key // cells) % depths
+            state = g * cells + cell
+            expanded += 1
+            if cell == goal_id and table.can_park(cell, turn + g, unit):
+                self.nodes_expanded = expanded
+                return self._backtrack(parent, state, cells), True
+            if g == window:
+                if table.can_park(cell, turn + g, unit):
+                    self.nodes_expanded = expanded
+                    return self._backtrack(parent, state, cells), False
+                continue
+            rank = (distance[cell], -g)
+            if (best_key is None or rank < best_key) and table.can_park(cell, turn + g, unit):
+                best, best_key = state, rank
+            y, x = divmod(cell, xsize)
+            when = turn + g
+            next_g = g + 1
+            for dx, dy in moves:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < xsize and 0 <= ny < ysize) or (rows[ny] >> nx) & 1:
+                    continue
+                neighbor = ny * xsize + nx
+                h = distance[neighbor]
+                next_state = next_g * cells + neighbor
+                if h == UNREACHABLE or next_state in parent or not table.can_move(cell, neighbor, when, unit):
+                    continue
+                parent[next_state] = state
+                heappush(open_list, ((next_g + h) * depths + window - next_g) * cells + neighbor)
+        self.nodes_expanded = expanded
+        return self._backtrack(parent, best, cells), False
+
+    def _wait(self, unit, cell: int, turn: int, window: int) -> list:
+        path = [cell]
+        while len(path) <= window and self.table.can_move(cell, cell, turn + len(path) - 1, unit):
+            path.append(cell)
+        return path
+
+    @staticmethod
+    def _backtrack(parent: dict, state: int, cells: int) -> list:
+        path = []
+        while state != -1:
+            path.append(state % cells)
+            state = parent[state]
+        path.reverse()
+        return path
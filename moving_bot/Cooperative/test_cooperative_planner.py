@@ -0,0 +1,106 @@
+import unittest
+import random
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+from search_testing import breadth_first_distance
+from Cooperative.reservation_table import ReservationTable
+from Cooperative.space_time_astar import SpaceTimeAStar
+from Cooperative.cooperative_planner import CooperativePlanner
+
+
+"""
+File: test_cooperative_planner.py
+Author: Nathan Robertson
+Purpose: Test that space-time A* finds shortest paths on its own and that cooperatively planned units never share a
+         cell or swap places while they walk to their goals.
+"""
+
+
+def random_grid(grid_class, size, density, rng):
+    obstacles = [Coord(x, y) for x in range(size) for y in range(size) if rng.random() < density]
+    return grid_class(size, size, obstacles)
+
+
+def free_cells(grid, rng, count):
+    cells = [Coord(x, y) for x in range(grid.xsize) for y in range(grid.ysize) if not grid.is_obstacle(Coord(x, y))]
+    return rng.sample(cells, count)
+
+
+class SpaceTimeAStarTest(unittest.TestCase):
+    def test_shortest_without_reservations(self):
+        rng = random.Random(4)
+        for grid_class in (DiagonalGrid, OrthogonalGrid):
+            for _ in range(20):
+                grid = random_grid(grid_class, rng.randrange(5, 20), 0.25, rng)
+                start, goal = free_cells(grid, rng, 2)
+                cells, reached = SpaceTimeAStar(grid, ReservationTable(64)).search(0, start, goal)
+                expected = breadth_first_distance(grid, start, goal)
+                if expected is None:
+                    self.assertFalse(reached)
+                else:
+                    self.assertTrue(reached)
+                    self.assertEqual(expected, len(cells) - 1)
+
+    def test_waits_for_reserved_cell(self):
+        grid = OrthogonalGrid(3, 1, [])
+        table = ReservationTable(8)
+        table.reserve('a', [1, 1], park=False)
+        cells, reached = SpaceTimeAStar(grid, table).search('b', Coord(0, 0), Coord(2, 0))
+        self.assertTrue(reached)
+        self.assertEqual([0, 0, 1, 2], cells)
+
+    def test_window_limits_path(self):
+        grid = DiagonalGrid(30, 1, [])
+        cells, reached = SpaceTimeAStar(grid, ReservationTable(10)).search(0, Coord(0, 0), Coord(29, 0))
+        self.assertFalse(reached)
+        self.assertEqual(list(range(11)), cells)
+
+
+class CooperativePlannerTest(unittest.TestCase):
+    def simulate(self, grid, starts, goals, horizon, turns):
+        planner = CooperativePlanner(grid, horizon)
+        positions = dict(enumerate(starts))
+        for _ in range(turns):
+            planner.plan([(unit, positions[unit], goals[unit]) for unit in positions])
+            moved = {unit: planner.next_position(unit) for unit in positions}
+            for unit, position in moved.items():
+                self.assertTrue(position == positions[unit] or grid.is_adjacent(position, positions[unit]))
+                self.assertFalse(grid.is_obstacle(position))
+            self.assertEqual(len(moved), len(set(moved.values())), "two units on one cell")
+            for unit, other in ((unit, other) for unit in moved for other in moved if unit < other):
+                self.assertFalse(moved[unit] == positions[other] and moved[other] == positions[unit], "units swapped")
+            positions = moved
+            planner.advance()
+        return positions, planner
+
+    def test_units_never_collide(self):
+        rng = random.Random(9)
+        for _ in range(5):
+            grid = random_grid(DiagonalGrid, 16, 0.2, rng)
+            cells = free_cells(grid, rng, 20)
+            starts, goals = cells[:10], cells[10:]
+            reachable = [unit for unit in range(10) if breadth_first_distance(grid, starts[unit], goals[unit])]
+            positions, _ = self.simulate(grid, starts, goals, 16, 60)
+            arrived = sum(1 for unit in reachable if positions[unit] == goals[unit])
+            self.assertTrue(arrived >= len(reachable) - 1)
+
+    def test_corridor_with_passing_place(self):
+        obstacles = [Coord(x, 1) for x in range(7) if x != 5]
+        grid = OrthogonalGrid(7, 2, obstacles)
+        positions, planner = self.simulate(grid, [Coord(0, 0), Coord(6, 0)], [Coord(6, 0), Coord(0, 0)], 20, 12)
+        self.assertEqual({0: Coord(6, 0), 1: Coord(0, 0)}, positions)
+
+    def test_replan_after_window(self):
+        grid = DiagonalGrid(20, 1, [])
+        positions, planner = self.simulate(grid, [Coord(0, 0)], [Coord(19, 0)], 5, 25)
+        self.assertEqual(Coord(19, 0), positions[0])
+        self.assertEqual(3, planner.replans)
+
+    def test_remove_frees_cells(self):
+        grid = OrthogonalGrid(3, 1, [])
+        planner = CooperativePlanner(grid, 8)
+        planner.plan_unit('a', Coord(1, 0), Coord(1, 0))
+        planner.remove('a')
+        self.assertEqual(0, len(planner.table))
+        self.assertEqual([Coord(0, 0), Coord(1, 0), Coord(2, 0)], planner.plan_unit('b', Coord(0, 0), Coord(2, 0)))
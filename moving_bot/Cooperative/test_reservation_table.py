@@ -0,0 +1,64 @@
+import unittest
+from Cooperative.reservation_table import ReservationTable
+
+
+"""
+File: test_reservation_table.py
+Author: Nathan Robertson
+Purpose: Test that reservations block vertex and swap conflicts, expire as turns pass and are released cleanly.
+"""
+
+
+class ReservationTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = ReservationTable(horizon=4)
+
+    def test_vertex_conflict(self):
+        self.table.reserve('a', [0, 1, 2], park=False)
+        self.assertEqual('a', self.table.owner(1, 1))
+        self.assertFalse(self.table.can_move(5, 1, 0, 'b'))
+        self.assertTrue(self.table.can_move(5, 1, 1, 'b'))
+        self.assertTrue(self.table.can_move(0, 1, 0, 'a'))
+
+    def test_swap_conflict(self):
+        self.table.reserve('a', [0, 1], park=False)
+        self.assertFalse(self.table.can_move(1, 0, 0, 'b'))
+        self.assertTrue(self.table.can_move(2, 0, 0, 'b'))
+
+    def test_parked_goal(self):
+        self.table.reserve('a', [0, 1, 2])
+        self.assertEqual(None, self.table.owner(2, 1))
+        self.assertEqual('a', self.table.owner(2, 3))
+        self.assertFalse(self.table.can_park(1, 0, 'b'))
+        self.assertTrue(self.table.can_park(1, 2, 'b'))
+        self.assertFalse(self.table.can_park(2, 4, 'b'))
+        self.table.advance(10)
+        self.assertEqual('a', self.table.owner(2, 12))
+
+    def test_cells_past_horizon_dropped(self):
+        self.table.reserve('a', list(range(10)))
+        self.assertEqual([(turn, turn) for turn in range(5)], self.table.reservations('a'))
+        self.assertEqual(None, self.table.owner(9, 9))
+
+    def test_advance_expires_reservations(self):
+        self.table.reserve('a', [0, 1, 2, 3], park=False)
+        self.table.advance(2)
+        self.assertEqual(2, len(self.table))
+        self.assertEqual(None, self.table.owner(1, 1))
+        self.assertEqual([(2, 2), (3, 3)], self.table.reservations('a'))
+        self.table.reserve('b', [7, 7, 7, 7, 7])
+        self.assertEqual('b', self.table.owner(7, 6))
+
+    def test_release(self):
+        self.table.reserve('a', [0, 1, 2])
+        self.table.reserve('b', [4, 4])
+        self.table.release('a')
+        self.assertEqual(None, self.table.owner(1, 1))
+        self.assertEqual(None, self.table.owner(2, 4))
+        self.assertEqual('b', self.table.owner(4, 4))
+
+    def test_reserve_replaces_previous_path(self):
+        self.table.reserve('a', [0, 1, 2])
+        self.table.reserve('a', [0, 5])
+        self.assertEqual(None, self.table.owner(1, 1))
+        self.assertEqual('a', self.table.owner(5, 3))
@@ -0,0 +1,191 @@
+import math
+from heapq import heappush, heappop
+from Coordinate.coord import Coord
+from AStar.astar import integer_heuristic, SCALE
+from heuristics import diagonal
+
+"""
+File: d_star_lite.py
+Author: Nathan Robertson
+Purpose:
+    D* Lite (Koenig and Likhachev 2002) incremental planner over any UniformGrid.
+    Robots block tiles and move every turn. Instead of planning from scratch after every insert_obstacle the planner
+    keeps its search state (g and rhs values) between calls and only repairs the part of the search affected by the
+    cells which changed. It subscribes to the grid so changes are picked up automatically on the next plan().
+
+    The search runs backwards from the goal, so g(s) is the cost from s to the goal and the start is allowed to move.
+    Costs are integers scaled like AStar (one step costs grid.cost() * SCALE).
+
+Terminology
+    rhs: One step lookahead value, rhs(s) = min over successors s' of cost(s, s') + g(s').
+    Consistent: A cell where g == rhs. Inconsistent cells sit in the open list.
+    km: Key modifier which keeps old keys valid after the start moves.
+"""
+
+
+__all__ = ["DStarLite"]
+
+INFINITY = math.inf
+
+
+class DStarLite:
+    def __init__(self, grid, start: Coord, goal: Coord, heuristic_fn=diagonal):
+        self.grid = grid
+        self.offsets = tuple(grid.NEIGHBOR_OFFSETS)
+        self.step_cost = grid.cost() * SCALE
+        self.heuristic_fn = heuristic_fn
+        self.start = start
+        self.goal = goal
+        self.km = 0
+        self.g = {}
+        self.rhs = {}
+        self.open_keys = {}
+        self.open_list = []
+        self.changed = []
+        self.nodes_expanded = 0
+        self._reset_heuristic()
+        self.rhs[self._id(goal)] = 0
+        self._insert(self._id(goal))
+        self._listener = lambda coord, blocked: self.changed.append(coord)
+        grid.subscribe(self._listener)
+
+    def detach(self) -> None:
+        """
+        Stop listening to obstacle changes on the grid.
+        """
+        self.grid.unsubscribe(self._listener)
+
+    def move_start(self, start: Coord) -> None:
+        """
+        Moves the start (the robot following the path) without invalidating previous work.
+        """
+        self.km += self._heuristic_between(self._id(self.start), self._id(start))
+        self.start = start
+        self._reset_heuristic()
+
+    def plan(self) -> list:
+        """
+        Repairs the search for every cell changed since the last call and extracts the path.
+        :return: Cells from start to goal (inclusive) or empty list if the goal cannot be reached.
+        """
+        if self.changed:
+            changed, self.changed = self.changed, []
+            for coord in changed:
+                cell = self._id(coord)
+                self._update_vertex(cell)
+                for neighbor in self._neighbors(cell):
+                    self._update_vertex(neighbor)
+        self._compute_shortest_path()
+        return self._extract_path()
+
+    def _id(self, coord: Coord) -> int:
+        return coord.y * self.grid.xsize + coord.x
+
+    def _reset_heuristic(self) -> None:
+        h = integer_heuristic(self.heuristic_fn, self.start)
+        xsize = self.grid.xsize
+        self._heuristic = lambda cell: h(cell % xsize, cell // xsize)
+
+    def _heuristic_between(self, first: int, second: int) -> int:
+        xsize = self.grid.xsize
+        return integer_heuristic(self.heuristic_fn, Coord(second % xsize, second // xsize))(first % xsize,
+                                                                                              first // xsize)
+
+    def _blocked(self, cell: int) -> bool:
+        xsize = self.grid.xsize
+        return (self.grid.bitboard.rows[cell // xsize] >> (cell % xsize)) & 1 == 1
+
+    def _neighbors(self, cell: int):
+        """
+        :return: Every cell one move away from cell (blocked or not), moves are symmetric so these are both the
+                 successors and predecessors of cell.
+        """
+        xsize, ysize = self.grid.xsize, self.grid.ysize
+        y, x = divmod(cell, xsize)
+        for dx, dy in self.offsets:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < xsize and 0 <= ny < ysize:
+                yield ny * xsize + nx
+
+    def _key(self, cell: int) -> tuple:
+        best = min(self.g.get(cell, INFINITY), self.rhs.get(cell, INFINITY))
+        return best + self._heuristic(cell) + self.km, best
+
+    def _insert(self, cell: int) -> None:
+        key = self._key(cell)
+        self.open_keys[cell] = key
+        heappush(self.open_list, (key, cell))
+
+    def _top(self):
+        """
+        :return: (key, cell) of the best open cell, dropping entries which were removed or re-keyed, or None.
+        """
+        open_list, open_keys = self.open_list, self.open_keys
+        while open_list:
+            key, cell = open_list[0]
+            if open_keys.get(cell) == key:
+                return key, cell
+            heappop(open_list)
+        return None
+
+    def _update_vertex(self, cell: int) -> None:
+        if cell != self._id(self.goal):
+            best = INFINITY
+            if not self._blocked(cell):
+                g, step_cost = self.g, self.step_cost
+                for neighbor in self._neighbors(cell):
+                    if not self._blocked(neighbor):
+                        best = min(best, g.get(neighbor, INFINITY) + step_cost)
+            self.rhs[cell] = best
+        self.open_keys.pop(cell, None)
+        if self.g.get(cell, INFINITY) != self.rhs.get(cell, INFINITY):
+            self._insert(cell)
+
+    def _compute_shortest_path(self) -> None:
+        start = self._id(self.start)
+        g, rhs = self.g, self.rhs
+        expanded = 0
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            old_key, cell = top
+            if old_key >= self._key(start) and rhs.get(start, INFINITY) == g.get(start, INFINITY):
+                break
+            expanded += 1
+            new_key = self._key(cell)
+            if old_key < new_key:
+                self._insert(cell)
+                continue
+            heappop(self.open_list)
+            del self.open_keys[cell]
+            if g.get(cell, INFINITY) > rhs.get(cell, INFINITY):
+                g[cell] = rhs[cell]
+                for neighbor in self._neighbors(cell):
+                    self._update_vertex(neighbor)
+            else:
+                g[cell] = INFINITY
+                self._update_vertex(cell)
+                for neighbor in self._neighbors(cell):
+                    self._update_vertex(neighbor)
+        self.nodes_expanded = expanded
+
+    def _extract_path(self) -> list:
+        cell = self._id(self.start)
+        goal = self._id(self.goal)
+        xsize = self.grid.xsize
+        if self._blocked(cell) or self.g.get(cell, INFINITY) == INFINITY:
+            return []
+        path = [Coord(cell % xsize, cell // xsize)]
+        for _ in range(xsize * self.grid.ysize):
+            if cell == goal:
+                return path
+            best, best_cost = None, INFINITY
+            for neighbor in self._neighbors(cell):
+                if not self._blocked(neighbor) and self.g.get(neighbor, INFINITY) < best_cost:
+                    best, best_cost = neighbor, self.g[neighbor]
+            if best is None:
+                return []
+            cell = best
+            path.append(Coord(cell % xsize, cell // xsize))
+        return []
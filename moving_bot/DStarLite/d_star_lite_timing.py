@@ -0,0 +1,58 @@
+from heuristics import diagonal
+from JumpPointSearch.jps_timing import make_diagonal_grid
+from AStar.astar import AStar
+from DStarLite.d_star_lite import DStarLite
+from Coordinate.coord import Coord
+import timeit
+import random
+
+"""
+File: d_star_lite_timing.py
+Author: Nathan Robertson
+Purpose:
+    Cost of repairing a D* Lite plan after k random obstacle flips compared with planning again from scratch
+    with A*. Flips are spread over the whole map (robots moving anywhere), each round flips k cells, replans
+    with both planners and the time per round is averaged.
+
+    Run from the moving_bot directory with: python -m DStarLite.d_star_lite_timing
+"""
+
+
+def flip_cells(grid, count: int, keep: set) -> None:
+    for _ in range(count):
+        cell = Coord(random.randrange(grid.xsize), random.randrange(grid.ysize))
+        if cell in keep:
+            continue
+        if grid.is_obstacle(cell):
+            grid.remove_obstacle(cell)
+        else:
+            grid.insert_obstacle(cell)
+
+
+size = 64
+obstacle_prob = 15
+flips = [1, 5, 20, 100]
+rounds = 20
+
+if __name__ == "__main__":
+    random.seed(0)
+    for count in flips:
+        grid = make_diagonal_grid((size, size), obstacle_prob=obstacle_prob)
+        start, goal = Coord(0, 0), Coord(size - 1, size - 1)
+        grid.remove_obstacle(start)
+        grid.remove_obstacle(goal)
+        planner = DStarLite(grid, start, goal, diagonal)
+        astar = AStar(grid, diagonal)
+        print("Initial D* Lite plan on " + str(size) + "x" + str(size) + " (s): ")
+        print(timeit.timeit(planner.plan, number=1))
+        incremental = 0.0
+        full = 0.0
+        for _ in range(rounds):
+            flip_cells(grid, count, {start, goal})
+            incremental += timeit.timeit(planner.plan, number=1)
+            full += timeit.timeit(lambda: astar.execute((start, goal)), number=1)
+        print(str(count) + " flips per round, D* Lite repair (s): ")
+        print(incremental / rounds)
+        print(str(count) + " flips per round, A* from scratch (s): ")
+        print(full / rounds)
+        planner.detach()
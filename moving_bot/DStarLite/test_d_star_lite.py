@@ -0,0 +1,85 @@
+import unittest
+import random
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+from AStar.astar import AStar
+from DStarLite.d_star_lite import DStarLite
+from heuristics import diagonal, manhattan
+
+
+"""
+File: test_d_star_lite.py
+Author: Nathan Robertson
+Purpose: Test that incremental replanning gives the same path lengths as planning from scratch.
+"""
+
+
+class ObstacleNotificationTest(unittest.TestCase):
+    def test_insert_and_remove_notify(self):
+        grid = DiagonalGrid(3, 3, [])
+        changes = []
+        grid.subscribe(lambda coord, blocked: changes.append((coord, blocked)))
+        grid.insert_obstacle(Coord(1, 1))
+        grid.insert_obstacle(Coord(1, 1))
+        grid.remove_obstacle(Coord(1, 1))
+        grid.remove_obstacle(Coord(0, 0))
+        self.assertEqual([(Coord(1, 1), True), (Coord(1, 1), False)], changes)
+        self.assertFalse(grid.is_obstacle(Coord(1, 1)))
+
+
+class DStarLiteTest(unittest.TestCase):
+    def assert_valid_path(self, grid, path, start, goal):
+        self.assertEqual(start, path[0])
+        self.assertEqual(goal, path[-1])
+        for first, second in zip(path, path[1:]):
+            self.assertTrue(second in grid.neighbors(first))
+
+    def test_simple_replan(self):
+        grid = OrthogonalGrid(3, 3, [])
+        planner = DStarLite(grid, Coord(0, 0), Coord(2, 0), manhattan)
+        self.assertEqual([Coord(0, 0), Coord(1, 0), Coord(2, 0)], planner.plan())
+        grid.insert_obstacle(Coord(1, 0))
+        self.assertEqual(5, len(planner.plan()))
+        grid.insert_obstacle(Coord(1, 1))
+        grid.insert_obstacle(Coord(1, 2))
+        self.assertEqual([], planner.plan())
+        grid.remove_obstacle(Coord(1, 1))
+        self.assertEqual(5, len(planner.plan()))
+
+    def test_matches_full_replanning(self):
+        rng = random.Random(12)
+        for grid_class, heuristic in ((DiagonalGrid, diagonal), (OrthogonalGrid, manhattan)):
+            obstacles = [Coord(x, y) for x in range(16) for y in range(16) if rng.random() < 0.2]
+            grid = grid_class(16, 16, obstacles)
+            start, goal = Coord(0, 0), Coord(15, 15)
+            grid.remove_obstacle(start)
+            grid.remove_obstacle(goal)
+            planner = DStarLite(grid, start, goal, heuristic)
+            astar = AStar(grid, heuristic)
+            for _ in range(30):
+                for _ in range(3):
+                    cell = Coord(rng.randrange(16), rng.randrange(16))
+                    if cell == start or cell == goal:
+                        continue
+                    if grid.is_obstacle(cell):
+                        grid.remove_obstacle(cell)
+                    else:
+                        grid.insert_obstacle(cell)
+                path = planner.plan()
+                expected = astar.execute((start, goal))
+                self.assertEqual(len(expected), len(path))
+                if path:
+                    self.assert_valid_path(grid, path, start, goal)
+            planner.detach()
+            self.assertEqual([], grid.listeners)
+
+    def test_move_start(self):
+        grid = DiagonalGrid(8, 8, [Coord(3, y) for y in range(7)])
+        planner = DStarLite(grid, Coord(0, 0), Coord(7, 0), diagonal)
+        path = planner.plan()
+        planner.move_start(path[3])
+        grid.insert_obstacle(Coord(4, 6))
+        new_path = planner.plan()
+        self.assertEqual(len(AStar(grid, diagonal).execute((path[3], Coord(7, 0)))), len(new_path))
+        self.assert_valid_path(grid, new_path, path[3], Coord(7, 0))
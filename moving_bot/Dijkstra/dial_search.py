@@ -0,0 +1,154 @@
+from array import array
+from Coordinate.coord import Coord
+
+"""
+File: dial_search.py
+Author: Nathan Robertson
+Purpose:
+    Shortest paths on a WeightedGrid with Dial's algorithm: Dijkstra where the open list is a ring of buckets, one
+    per distance, instead of a binary heap. Cell costs are small integers (at most grid.cost_limit), so every
+    distance still open lies in a window of cost_limit + 1 values and bucket d % (cost_limit + 1) holds the cells
+    at distance d. Pushing is a list append and popping takes the next non empty bucket, no log n sift.
+    A cheaper route to an open cell appends it again, the old entry is skipped when it comes out (lazy deletion).
+
+    Costs are paid for entering a cell, the start is free. Like AStar, cells are integer ids (y * xsize + x) and
+    the distance / parent / seen arrays are allocated once per grid and stamped with a query number.
+
+    execute: Cheapest path from start to goal, stops when the goal comes out of the buckets.
+    distance_field: Cost from every cell to the cheapest of several goals (what a unit standing there would pay),
+                    for flow fields over weighted terrain.
+"""
+
+
+__all__ = ["DialSearch", "UNREACHABLE"]
+
+UNREACHABLE = -1
+
+
+class DialSearch:
+    def __init__(self, grid):
+        """
+        :param grid: A WeightedGrid (WeightedDiagonalGrid or WeightedOrthogonalGrid).
+        """
+        self.grid = grid
+        self.query = 0
+        self.nodes_expanded = 0
+        self.distance = None
+        self.parent = None
+        self.seen = None
+
+    def execute(self, endpoints: (Coord, Coord)) -> list:
+        """
+        :param endpoints: A tuple containing (start, goal)
+        :return: Every cell on a cheapest path from start to goal (inclusive) or empty list if there is none.
+        """
+        start, goal = endpoints
+        grid = self.grid
+        for coord in (start, goal):
+            if not grid.is_valid_coord(coord) or grid.is_obstacle(coord):
+                return []
+        xsize = grid.xsize
+        goal_id = goal.y * xsize + goal.x
+        if self._search([start.y * xsize + start.x], goal_id, False):
+            return self._backtrack(goal_id)
+        return []
+
+    def path_cost(self, path: list) -> int:
+        """
+        :return: Cost of walking path, every cell after the first is paid for.
+        """
+        return sum(self.grid.cost(coord) for coord in path[1:])
+
+    def distance_field(self, goals: list) -> array:
+        """
+        :param goals: Goal Coords, ones outside the grid or on obstacles are ignored.
+        :return: Flat array('q') indexed by cell id with the cost of the cheapest path from the cell to any goal,
+                 UNREACHABLE where no goal can be reached.
+        """
+        grid = self.grid
+        xsize = grid.xsize
+        sources = [goal.y * xsize + goal.x for goal in goals
+                   if grid.is_valid_coord(goal) and not grid.is_obstacle(goal)]
+        self._search(sources, -1, True)
+        distance, seen, query = self.distance, self.seen, self.query
+        return array('q', [distance[cell] if seen[cell] == query else UNREACHABLE for cell in range(len(distance))])
+
+    def _reserve(self, cells: int) -> None:
+        if self.distance is None or len(self.distance) != cells:
+            self.distance = array('q', bytes(8 * cells))
+            self.parent = array('q', bytes(8 * cells))
+            self.seen = array('q', bytes(8 * cells))
+            self.query = 0
+
+    def _search(self, sources: list, target: int, reverse: bool) -> bool:
+        """
+        :param sources: Cell ids at distance 0.
+        :param target: Cell id to stop at, -1 to settle every reachable cell.
+        :param reverse: Charge the cost of the cell being left instead of the cell entered, giving distances to the
+                        sources rather than from them (moves are symmetric, only the costs paid differ).
+        :return: If target was reached.
+        """
+        grid = self.grid
+        xsize, ysize = grid.xsize, grid.ysize
+        self._reserve(xsize * ysize)
+        self.query += 1
+        query = self.query
+        distance, parent, seen = self.distance, self.parent, self.seen
+        rows = grid.bitboard.rows
+        costs = grid.costs
+        offsets = grid.NEIGHBOR_OFFSETS
+        ring = grid.cost_limit + 1
+        buckets = [[] for _ in range(ring)]
+        appends = [bucket.append for bucket in buckets]
+        for cell in set(sources):
+            seen[cell] = query
+            distance[cell] = 0
+            parent[cell] = -1
+            buckets[0].append(cell)
+        # Every open distance lies in [current, current + ring), so ring empty buckets in a row means nothing is open.
+        # An entry is stale if its cell was reached more cheaply after it was pushed, and a cell is only pushed
+        # again when it gets cheaper, so the settled distance is the one entry which matches current.
+        current = 0
+        empty = 0
+        expanded = 0
+        while empty < ring:
+            bucket = buckets[current % ring]
+            if not bucket:
+                empty += 1
+                current += 1
+                continue
+            empty = 0
+            while bucket:
+                cell = bucket.pop()
+                if distance[cell] != current:
+                    continue
+                expanded += 1
+                if cell == target:
+                    self.nodes_expanded = expanded
+                    return True
+                y, x = divmod(cell, xsize)
+                # Costs are >= 1, so leaving is 0 (falls through to the neighbor's cost) only in forward searches.
+                leaving = costs[cell] if reverse else 0
+                for dx, dy in offsets:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < xsize and 0 <= ny < ysize and not (rows[ny] >> nx) & 1:
+                        neighbor = ny * xsize + nx
+                        next_distance = current + (leaving or costs[neighbor])
+                        if seen[neighbor] != query or next_distance < distance[neighbor]:
+                            seen[neighbor] = query
+                            distance[neighbor] = next_distance
+                            parent[neighbor] = cell
+                            appends[next_distance % ring](neighbor)
+            current += 1
+        self.nodes_expanded = expanded
+        return False
+
+    def _backtrack(self, cell: int) -> list:
+        xsize = self.grid.xsize
+        parent = self.parent
+        path = []
+        while cell != -1:
+            path.append(Coord(cell % xsize, cell // xsize))
+            cell = parent[cell]
+        path.reverse()
+        return path
@@ -0,0 +1,147 @@
+from array import array
+from heapq import heappush, heappop
+from time import perf_counter
+import random
+import sys
+import numpy as np
+from Benchmark.benchmark import percentile
+from Benchmark.map_generators import noise_map
+from Coordinate.coord import Coord
+from Dijkstra.dial_search import DialSearch
+from UniformGrid.weighted_grid import WeightedDiagonalGrid
+from UniformGrid.uniform_grid import grid_from_rows
+
+"""
+File: dial_timing.py
+Author: Nathan Robertson
+Purpose:
+    Dial's bucket queue against a heapq Dijkstra written the same way (int cell ids, flat stamped arrays, int heap
+    entries dist * cells + id), on noise maps with random cell costs in 1..max_cost:
+    1. Point to point queries (p50 / p95 latency).
+    2. Full distance fields from one goal.
+    Costs found by both are compared on every query.
+    The last lines time bulk cost updates: a whole map from a 2D array, a 9x9 danger block, and the same block
+    written with set_cost one cell at a time.
+
+    Run from the moving_bot directory with: python -m Dijkstra.dial_timing [sizes...]
+"""
+
+
+sizes = [64, 128, 256]
+max_costs = [4, 16, 64]
+queries = 30
+
+
+class HeapDijkstra:
+    def __init__(self, grid):
+        self.grid = grid
+        cells = grid.xsize * grid.ysize
+        self.distance = array('q', bytes(8 * cells))
+        self.seen = array('q', bytes(8 * cells))
+        self.closed = array('q', bytes(8 * cells))
+        self.query = 0
+
+    def cost(self, start: Coord, goal: Coord):
+        """
+        :return: Cost of the cheapest path from start to goal, or every settled cell's distance if goal is None.
+        """
+        grid = self.grid
+        xsize, ysize = grid.xsize, grid.ysize
+        cells = xsize * ysize
+        self.query += 1
+        query = self.query
+        distance, seen, closed = self.distance, self.seen, self.closed
+        rows, costs, offsets = grid.bitboard.rows, grid.costs, grid.NEIGHBOR_OFFSETS
+        start_id = start.y * xsize + start.x
+        goal_id = -1 if goal is None else goal.y * xsize + goal.x
+        seen[start_id] = query
+        distance[start_id] = 0
+        open_list = [start_id]
+        while open_list:
+            entry = heappop(open_list)
+            cell = entry % cells
+            current = entry // cells
+            if closed[cell] == query or distance[cell] != current:
+                continue
+            closed[cell] = query
+            if cell == goal_id:
+                return current
+            y, x = divmod(cell, xsize)
+            for dx, dy in offsets:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < xsize and 0 <= ny < ysize and not (rows[ny] >> nx) & 1:
+                    neighbor = ny * xsize + nx
+                    next_distance = current + costs[neighbor]
+                    if seen[neighbor] != query or next_distance < distance[neighbor]:
+                        seen[neighbor] = query
+                        distance[neighbor] = next_distance
+                        heappush(open_list, next_distance * cells + neighbor)
+        return None
+
+
+def weighted_map(size: int, max_cost: int, seed: int = 0):
+    base = noise_map(size, seed, density=0.2)
+    costs = np.random.default_rng(seed).integers(1, max_cost + 1, size=(size, size), dtype=np.uint8)
+    return grid_from_rows(WeightedDiagonalGrid, size, size, list(base.bitboard.rows), costs.tobytes())
+
+
+def endpoints(grid, count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    free = [Coord(x, y) for y in range(grid.ysize) for x in range(grid.xsize) if not grid.is_obstacle(Coord(x, y))]
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
+
+
+def time_queries(run, pairs: list) -> (list, list):
+    times, results = [], []
+    for start, goal in pairs:
+        began = perf_counter()
+        results.append(run(start, goal))
+        times.append(perf_counter() - began)
+    return times, results
+
+
+def time_updates(size: int) -> None:
+    grid = weighted_map(size, 4)
+    costs = np.random.default_rng(1).integers(1, 10, size=(size, size))
+    danger = np.full((9, 9), 20)
+    began = perf_counter()
+    grid.set_costs(costs)
+    whole = perf_counter() - began
+    began = perf_counter()
+    for _ in range(100):
+        grid.add_costs(danger, 10, 10)
+    block = (perf_counter() - began) / 100
+    began = perf_counter()
+    for y in range(9):
+        for x in range(9):
+            grid.set_cost(Coord(10 + x, 10 + y), 20)
+    cells = perf_counter() - began
+    print("  updates: whole map {:.3f} ms, 9x9 block {:.4f} ms, 9x9 with set_cost {:.4f} ms".format(
+        whole * 1000, block * 1000, cells * 1000))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sizes = [int(size) for size in sys.argv[1:]]
+    for size in sizes:
+        for max_cost in max_costs:
+            grid = weighted_map(size, max_cost)
+            pairs = endpoints(grid, queries)
+            dial, heap = DialSearch(grid), HeapDijkstra(grid)
+            dial_times, paths = time_queries(lambda start, goal: dial.execute((start, goal)), pairs)
+            heap_times, heap_costs = time_queries(heap.cost, pairs)
+            mismatches = sum(1 for path, cost in zip(paths, heap_costs)
+                             if (dial.path_cost(path) if path else None) != cost)
+            goal = pairs[0][1]
+            began = perf_counter()
+            dial.distance_field([goal])
+            dial_field = perf_counter() - began
+            began = perf_counter()
+            heap.cost(goal, None)
+            heap_field = perf_counter() - began
+            print("{}x{} costs 1..{}: query p50 dial {:7.2f} ms heapq {:7.2f} ms, p95 dial {:7.2f} ms heapq {:7.2f} ms"
+                  ", field dial {:7.2f} ms heapq {:7.2f} ms{}".format(
+                      size, size, max_cost, percentile(dial_times, 0.5) * 1000, percentile(heap_times, 0.5) * 1000,
+                      percentile(dial_times, 0.95) * 1000, percentile(heap_times, 0.95) * 1000, dial_field * 1000,
+                      heap_field * 1000, "" if mismatches == 0 else ", {} cost mismatches!".format(mismatches)))
+        time_updates(size)
@@ -0,0 +1,89 @@
+import unittest
+import random
+from heapq import heappush, heappop
+from Coordinate.coord import Coord
+from UniformGrid.weighted_grid import WeightedDiagonalGrid, WeightedOrthogonalGrid
+from Dijkstra.dial_search import DialSearch, UNREACHABLE
+
+
+"""
+File: test_dial_search.py
+Author: Nathan Robertson
+Purpose: Test that the bucket queue search finds the same costs as a plain heap based Dijkstra over Coords.
+"""
+
+
+def reference_costs(grid, start):
+    """
+    :return: Dict of the cheapest cost from start to every reachable Coord.
+    """
+    best = {start: 0}
+    open_list = [(0, start.x, start.y)]
+    while open_list:
+        cost, x, y = heappop(open_list)
+        coord = Coord(x, y)
+        if cost > best[coord]:
+            continue
+        for neighbor in grid.neighbors(coord):
+            next_cost = cost + grid.cost(neighbor)
+            if next_cost < best.get(neighbor, next_cost + 1):
+                best[neighbor] = next_cost
+                heappush(open_list, (next_cost, neighbor.x, neighbor.y))
+    return best
+
+
+def random_weighted_grid(grid_class, size, rng, max_cost):
+    obstacles = [Coord(x, y) for x in range(size) for y in range(size) if rng.random() < 0.2]
+    costs = [[rng.randint(1, max_cost) for _ in range(size)] for _ in range(size)]
+    return grid_class(size, size, obstacles, costs)
+
+
+class DialSearchTest(unittest.TestCase):
+    def test_costs_match_heap_dijkstra(self):
+        rng = random.Random(6)
+        for grid_class in (WeightedDiagonalGrid, WeightedOrthogonalGrid):
+            for max_cost in (1, 5, 40):
+                grid = random_weighted_grid(grid_class, 15, rng, max_cost)
+                search = DialSearch(grid)
+                for _ in range(10):
+                    start, goal = Coord(rng.randrange(15), rng.randrange(15)), Coord(rng.randrange(15), rng.randrange(15))
+                    if grid.is_obstacle(start) or grid.is_obstacle(goal):
+                        continue
+                    expected = reference_costs(grid, start).get(goal)
+                    path = search.execute((start, goal))
+                    if expected is None:
+                        self.assertEqual([], path)
+                        continue
+                    self.assertEqual(expected, search.path_cost(path))
+                    self.assertEqual((start, goal), (path[0], path[-1]))
+                    for first, second in zip(path, path[1:]):
+                        self.assertTrue(grid.is_adjacent(first, second))
+
+    def test_avoids_expensive_cells(self):
+        grid = WeightedOrthogonalGrid(3, 3, [], [[1, 9, 1], [1, 9, 1], [1, 1, 1]])
+        path = DialSearch(grid).execute((Coord(0, 0), Coord(2, 0)))
+        self.assertEqual(7, len(path))
+        self.assertEqual(6, DialSearch(grid).path_cost(path))
+
+    def test_distance_field(self):
+        rng = random.Random(2)
+        grid = random_weighted_grid(WeightedDiagonalGrid, 12, rng, 7)
+        goal = next(Coord(x, y) for y in range(12) for x in range(12) if not grid.is_obstacle(Coord(x, y)))
+        field = DialSearch(grid).distance_field([goal])
+        for y in range(12):
+            for x in range(12):
+                coord = Coord(x, y)
+                if grid.is_obstacle(coord):
+                    self.assertEqual(UNREACHABLE, field[y * 12 + x])
+                    continue
+                # Walking from coord to goal pays for goal but not for coord.
+                expected = reference_costs(grid, coord).get(goal)
+                self.assertEqual(UNREACHABLE if expected is None else expected, field[y * 12 + x])
+
+    def test_cost_changes_between_queries(self):
+        grid = WeightedOrthogonalGrid(3, 1, [])
+        search = DialSearch(grid)
+        self.assertEqual(2, search.path_cost(search.execute((Coord(0, 0), Coord(2, 0)))))
+        grid.set_cost(Coord(1, 0), 50)
+        self.assertEqual(51, search.path_cost(search.execute((Coord(0, 0), Coord(2, 0)))))
+        self.assertEqual([], search.execute((Coord(0, 0), Coord(5, 0))))
@@ -0,0 +1,151 @@
+import numpy as np
+from Coordinate.coord import Coord
+
+"""
+File: flow_field.py
+Author: Nathan Robertson
+Purpose:
+    Distance fields and flow fields towards a shared set of goal cells.
+    Most units head to the same few places (the nearest castle, a resource cluster) so instead of one search per
+    unit per turn the whole grid is solved once:
+    1. Distance field: breadth first wavefront from every goal at once. Each wave is a handful of whole array
+       operations (shift the frontier by every neighbor offset, mask out obstacles and visited cells).
+    2. Flow field: for every cell the neighbor offset which leads to the smallest distance.
+    After that a unit finds its next step with one lookup.
+
+    Arrays are indexed [y, x] like the rows of the grid's bitboard.
+"""
+
+
+__all__ = ["FlowField", "obstacle_array", "distance_field", "UNREACHABLE"]
+
+UNREACHABLE = -1
+
+
+def obstacle_array(grid) -> np.ndarray:
+    """
+    :param grid: A UniformGrid.
+    :return: Boolean array of shape (ysize, xsize) which is True on obstacles.
+    """
+    row_bytes = (grid.xsize + 7) // 8
+    packed = b''.join(row.to_bytes(row_bytes, 'little') for row in grid.bitboard.rows)
+    bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8).reshape(grid.ysize, row_bytes), axis=1,
+                         bitorder='little')
+    return bits[:, :grid.xsize].astype(bool)
+
+
+def shifted(values: np.ndarray, dx: int, dy: int, fill) -> np.ndarray:
+    """
+    :return: Array where result[y, x] == values[y + dy, x + dx], positions off the array are set to fill.
+    """
+    ysize, xsize = values.shape
+    result = np.full_like(values, fill)
+    if abs(dx) >= xsize or abs(dy) >= ysize:
+        return result
+    result[max(0, -dy):ysize - max(0, dy), max(0, -dx):xsize - max(0, dx)] = \
+        values[max(0, dy):ysize - max(0, -dy), max(0, dx):xsize - max(0, -dx)]
+    return result
+
+
+def distance_field(blocked: np.ndarray, goals: list, offsets) -> np.ndarray:
+    """
+    Multi-source breadth first search as a vectorised wavefront.
+    :param blocked: Obstacle array from obstacle_array.
+    :param goals: Goal Coords, goals outside the grid or on obstacles are ignored.
+    :param offsets: Moves allowed on the grid (NEIGHBOR_OFFSETS).
+    :return: int32 array with the number of moves to the closest goal, UNREACHABLE where no goal can be reached.
+    """
+    ysize, xsize = blocked.shape
+    distance = np.full(blocked.shape, UNREACHABLE, dtype=np.int32)
+    frontier = np.zeros(blocked.shape, dtype=bool)
+    for goal in goals:
+        if 0 <= goal.x < xsize and 0 <= goal.y < ysize and not blocked[goal.y, goal.x]:
+            frontier[goal.y, goal.x] = True
+    open_cells = ~blocked
+    wave = 0
+    while frontier.any():
+        distance[frontier] = wave
+        open_cells &= ~frontier
+        reached = np.zeros(blocked.shape, dtype=bool)
+        for dx, dy in offsets:
+            reached |= shifted(frontier, dx, dy, False)
+        frontier = reached & open_cells
+        wave += 1
+    return distance
+
+
+class FlowField:
+    def __init__(self, grid, goals: list, build: bool = True):
+        """
+        :param grid: Any UniformGrid with NEIGHBOR_OFFSETS.
+        :param goals: Cells units should flow towards.
+        :param build: Compute the fields now. reflected passes False and fills them in itself.
+        """
+        self.grid = grid
+        self.goals = list(goals)
+        self.offsets = tuple(grid.NEIGHBOR_OFFSETS)
+        self.distance = None
+        self.moves = None
+        if build:
+            self.build()
+
+    def build(self) -> None:
+        """
+        (Re)computes the distance and flow fields, call again after obstacles or goals change.
+        """
+        distance = distance_field(obstacle_array(self.grid), self.goals, self.offsets)
+        unreachable = np.iinfo(np.int32).max
+        comparable = np.where(distance == UNREACHABLE, unreachable, distance)
+        candidates = np.stack([shifted(comparable, dx, dy, unreachable) for dx, dy in self.offsets])
+        best = candidates.argmin(axis=0)
+        improves = (np.take_along_axis(candidates, best[np.newaxis], axis=0)[0] < comparable) & \
+                   (distance != UNREACHABLE)
+        self.distance = distance
+        self.moves = np.where(improves, best, -1).astype(np.int8)
+
+    def reflected(self, symmetry) -> 'FlowField':
+        """
+        The field towards the mirrored goals (e.g. the enemy castles) without another wavefront.
+        :param symmetry: MapSymmetry of the grid, which must still hold.
+        :return: FlowField whose distance array is a reflected view of this one's.
+        """
+        field = FlowField(self.grid, symmetry.predict(self.goals), build=False)
+        field.distance = symmetry.reflect_array(self.distance)
+        # Appending -1 keeps cells without a move (-1) at -1 after the lookup.
+        mirrored = [self.offsets.index(symmetry.reflect_direction(dx, dy)) for dx, dy in self.offsets] + [-1]
+        field.moves = np.array(mirrored, dtype=np.int8)[symmetry.reflect_array(self.moves)]
+        return field
+
+    def distance_to_goal(self, coord: Coord):
+        """
+        :return: Number of moves from coord to the closest goal or None if no goal can be reached.
+        """
+        if not self.grid.is_valid_coord(coord):
+            return None
+        value = int(self.distance[coord.y, coord.x])
+        return None if value == UNREACHABLE else value
+
+    def next_step(self, coord: Coord):
+        """
+        :return: The next cell on a shortest path from coord to the closest goal, None on a goal or if unreachable.
+        """
+        if not self.grid.is_valid_coord(coord):
+            return None
+        move = int(self.moves[coord.y, coord.x])
+        if move < 0:
+            return None
+        dx, dy = self.offsets[move]
+        return Coord(coord.x + dx, coord.y + dy)
+
+    def path(self, coord: Coord) -> list:
+        """
+        :return: Cells from coord to the closest goal (inclusive) or empty list if no goal can be reached.
+        """
+        if self.distance_to_goal(coord) is None:
+            return []
+        path = [coord]
+        step = self.next_step(coord)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(step)
+        return path
@@ -0,0 +1,44 @@
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jps_timing import make_diagonal_grid, print_result
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from AStar.astar_timing import random_endpoints
+from FlowField.flow_field import FlowField
+import random
+
+"""
+File: flow_field_timing.py
+Author: Nathan Robertson
+Purpose:
+    Compare one flow field towards a shared goal against one jump point search per unit.
+    Both sides produce the full path of every unit to the goal.
+
+    Run from the moving_bot directory with: python -m FlowField.flow_field_timing
+"""
+
+
+def flow_field_paths(grid, goal, starts) -> list:
+    field = FlowField(grid, [goal])
+    return [field.path(start) for start in starts]
+
+
+def jps_paths(jps, goal, starts) -> list:
+    return [jps.connect_path(jps.execute((start, goal))) for start in starts]
+
+
+sizes = [64, 128, 256]
+units = [10, 50]
+obstacle_prob = 10
+
+if __name__ == "__main__":
+    random.seed(0)
+    for size in sizes:
+        grid = make_diagonal_grid((size, size), obstacle_prob=obstacle_prob)
+        goal = random_endpoints(grid, 1)[0][1]
+        jps = JumpPointSearch(grid, diagonal_tie_breaker)
+        for count in units:
+            starts = [start for start, _ in random_endpoints(grid, count)]
+            print("Grid " + str(size) + "x" + str(size) + ", " + str(count) + " units:")
+            print("Flow field build and lookups (s): ")
+            print_result(lambda: flow_field_paths(grid, goal, starts), 1)
+            print("Individual JPS queries (s): ")
+            print_result(lambda: jps_paths(jps, goal, starts), 1)
@@ -0,0 +1,252 @@
+from array import array
+from Coordinate.coord import Coord
+
+"""
+File: nearest_target.py
+Author: Nathan Robertson
+Purpose:
+    "Which of these K cells is closest and how do I get there?" (the nearest resource tile for a pilgrim, the
+    nearest castle to drop resources at) without K separate searches.
+
+    nearest_target: One breadth first search out from the unit which stops at the first target it reaches.
+                    Good for a single question, UniformGrid.nearest_target calls it.
+    NearestTargets: Keeps a distance field and a Voronoi style owner field (the target each cell is closest to) for
+                    a set of targets, so every unit's question is a lookup plus a walk down the field.
+                    add: The new target spreads out only over the cells it is now closest to.
+                    remove (a resource used up): Only the cells the target owned are cleared and filled again
+                    from the neighboring targets' cells around their border.
+                    Obstacle changes mark the fields stale and they are rebuilt on the next query.
+
+    Distances are numbers of moves, which is also the path cost JumpPointSearch uses on a DiagonalGrid.
+    Fields are flat arrays indexed by cell id (y * xsize + x) like the search cores.
+"""
+
+
+__all__ = ["NearestTargets", "nearest_target", "UNREACHABLE"]
+
+UNREACHABLE = -1
+NO_TARGET = -1
+
+
+def nearest_target(grid, coord: Coord, targets) -> (Coord, list):
+    """
+    :param grid: Any UniformGrid.
+    :param coord: Where the unit stands.
+    :param targets: Candidate cells, ones outside the grid or on obstacles are ignored.
+    :return: (closest target, cells from coord to it inclusive) or (None, []) if no target can be reached.
+    """
+    xsize, ysize = grid.xsize, grid.ysize
+    rows = grid.bitboard.rows
+    if not grid.is_valid_coord(coord) or grid.is_obstacle(coord):
+        return None, []
+    wanted = {target.y * xsize + target.x for target in targets
+              if grid.is_valid_coord(target) and not grid.is_obstacle(target)}
+    start = coord.y * xsize + coord.x
+    parent = {start: -1}
+    frontier = [start]
+    found = start if start in wanted else -1
+    while frontier and found < 0:
+        reached = []
+        for cell in frontier:
+            y, x = divmod(cell, xsize)
+            for dx, dy in grid.NEIGHBOR_OFFSETS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < xsize and 0 <= ny < ysize and not (rows[ny] >> nx) & 1:
+                    neighbor = ny * xsize + nx
+                    if neighbor not in parent:
+                        parent[neighbor] = cell
+                        if neighbor in wanted:
+                            found = neighbor
+                            break
+                        reached.append(neighbor)
+            if found >= 0:
+                break
+        frontier = reached
+    if found < 0:
+        return None, []
+    path = []
+    cell = found
+    while cell != -1:
+        path.append(Coord(cell % xsize, cell // xsize))
+        cell = parent[cell]
+    path.reverse()
+    return path[-1], path
+
+
+class NearestTargets:
+    def __init__(self, grid, targets=()):
+        """
+        :param grid: Any UniformGrid, its NEIGHBOR_OFFSETS decide the moves.
+        :param targets: Initial target cells, ones outside the grid are ignored (as by add).
+        """
+        self.grid = grid
+        self.offsets = tuple(grid.NEIGHBOR_OFFSETS)
+        self.targets = {}
+        self.distance = None
+        self.owner = None
+        self.stale = True
+        self.rebuilds = 0
+        self.cells_updated = 0
+        for target in targets:
+            if grid.is_valid_coord(target):
+                self.targets[target.y * grid.xsize + target.x] = target
+        self._listener = lambda coord, blocked: self._invalidate()
+        grid.subscribe(self._listener)
+
+    def detach(self) -> None:
+        """
+        Stop listening to obstacle changes on the grid.
+        """
+        self.grid.unsubscribe(self._listener)
+
+    def add(self, target: Coord) -> None:
+        """
+        :param target: New target cell, ignored if it is outside the grid.
+        """
+        if not self.grid.is_valid_coord(target):
+            return
+        cell = target.y * self.grid.xsize + target.x
+        if cell in self.targets:
+            return
+        self.targets[cell] = target
+        if self.stale or not self._is_free(cell):
+            return
+        self.distance[cell] = 0
+        self.owner[cell] = cell
+        self._spread([cell])
+
+    def remove(self, target: Coord) -> None:
+        if not self.grid.is_valid_coord(target):
+            return
+        cell = target.y * self.grid.xsize + target.x
+        if self.targets.pop(cell, None) is None or self.stale or self.owner[cell] != cell:
+            return
+        distance, owner = self.distance, self.owner
+        # Cells owned by a target are connected to it through cells it owns (each got its owner from its parent).
+        region = [cell]
+        owner[cell] = NO_TARGET
+        for current in region:
+            for neighbor in self._free_neighbors(current):
+                if owner[neighbor] == cell:
+                    owner[neighbor] = NO_TARGET
+                    region.append(neighbor)
+        for current in region:
+            distance[current] = UNREACHABLE
+        border = set()
+        for current in region:
+            for neighbor in self._free_neighbors(current):
+                if owner[neighbor] != NO_TARGET:
+                    border.add(neighbor)
+        self._spread(sorted(border, key=lambda seed: distance[seed]))
+
+    def nearest(self, coord: Coord) -> (Coord, list):
+        """
+        :return: (closest target, cells from coord to it inclusive) or (None, []) if no target can be reached.
+        """
+        if not self.grid.is_valid_coord(coord):
+            return None, []
+        self._refresh()
+        xsize = self.grid.xsize
+        cell = coord.y * xsize + coord.x
+        target = self.owner[cell]
+        if target == NO_TARGET:
+            return None, []
+        distance = self.distance
+        path = [coord]
+        while cell != target:
+            # Some neighbor one move closer which belongs to the same target always exists, the one cell was reached
+            # from.
+            for neighbor in self._free_neighbors(cell):
+                if distance[neighbor] == distance[cell] - 1 and self.owner[neighbor] == target:
+                    cell = neighbor
+                    break
+            path.append(Coord(cell % xsize, cell // xsize))
+        return self.targets[target], path
+
+    def distance_to_nearest(self, coord: Coord):
+        """
+        :return: Number of moves from coord to the closest target or None if no target can be reached.
+        """
+        if not self.grid.is_valid_coord(coord):
+            return None
+        self._refresh()
+        value = self.distance[coord.y * self.grid.xsize + coord.x]
+        return None if value == UNREACHABLE else value
+
+    def build(self) -> None:
+        """
+        Recomputes both fields from every target at once.
+        """
+        cells = self.grid.xsize * self.grid.ysize
+        self.distance = array('l', [UNREACHABLE]) * cells
+        self.owner = array('l', [NO_TARGET]) * cells
+        seeds = [cell for cell in self.targets if self._is_free(cell)]
+        for cell in seeds:
+            self.distance[cell] = 0
+            self.owner[cell] = cell
+        self._spread(seeds)
+        self.stale = False
+        self.rebuilds += 1
+
+    def _refresh(self) -> None:
+        if self.stale:
+            self.build()
+
+    def _invalidate(self) -> None:
+        self.stale = True
+
+    def _is_free(self, cell: int) -> bool:
+        xsize = self.grid.xsize
+        return 0 <= cell < xsize * self.grid.ysize and not self.grid.bitboard.test(cell % xsize, cell // xsize)
+
+    def _free_neighbors(self, cell: int) -> list:
+        grid = self.grid
+        xsize, ysize = grid.xsize, grid.ysize
+        rows = grid.bitboard.rows
+        y, x = divmod(cell, xsize)
+        found = []
+        for dx, dy in self.offsets:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < xsize and 0 <= ny < ysize and not (rows[ny] >> nx) & 1:
+                found.append(ny * xsize + nx)
+        return found
+
+    def _spread(self, seeds: list) -> None:
+        """
+        Breadth first search from cells whose distance and owner are already set, lowering the distance of every
+        cell it reaches more cheaply and handing it the owner of the cell it was reached from.
+        :param seeds: Starting cells sorted by distance, each joins the wavefront when it gets to its distance.
+        """
+        grid = self.grid
+        xsize, ysize = grid.xsize, grid.ysize
+        rows = grid.bitboard.rows
+        offsets = self.offsets
+        distance, owner = self.distance, self.owner
+        index = 0
+        frontier = []
+        level = 0
+        updated = 0
+        while frontier or index < len(seeds):
+            if not frontier:
+                level = distance[seeds[index]]
+            while index < len(seeds) and distance[seeds[index]] == level:
+                frontier.append(seeds[index])
+                index += 1
+            step = level + 1
+            reached = []
+            for cell in frontier:
+                y, x = divmod(cell, xsize)
+                label = owner[cell]
+                for dx, dy in offsets:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < xsize and 0 <= ny < ysize and not (rows[ny] >> nx) & 1:
+                        neighbor = ny * xsize + nx
+                        current = distance[neighbor]
+                        if current == UNREACHABLE or current > step:
+                            distance[neighbor] = step
+                            owner[neighbor] = label
+                            reached.append(neighbor)
+            updated += len(reached)
+            frontier = reached
+            level = step
+        self.cells_updated += updated
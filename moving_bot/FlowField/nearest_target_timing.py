@@ -0,0 +1,104 @@
+from Benchmark.benchmark import percentile
+from Benchmark.map_generators import noise_map
+from Coordinate.coord import Coord
+from FlowField.nearest_target import NearestTargets
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from time import perf_counter
+import random
+import sys
+
+"""
+File: nearest_target_timing.py
+Author: Nathan Robertson
+Purpose:
+    Finding the nearest of K targets (resource tiles, castles) and the path to it on noise maps, three ways:
+    jps: K JumpPointSearch queries per unit, the shortest path wins (what the bot would do today).
+    nearest_target: grid.nearest_target, one breadth first search per unit.
+    NearestTargets: Fields built once for the target set (build time reported separately), then a lookup per unit.
+    Reported per unit: p50 / p95 latency. Move counts of the three are compared on every query.
+    The update line times NearestTargets.add and remove (a resource tile used up) against a full rebuild.
+
+    Run from the moving_bot directory with: python -m FlowField.nearest_target_timing [sizes...]
+"""
+
+
+sizes = [64, 128, 256]
+target_counts = [4, 16, 64]
+units = 20
+
+
+def time_units(find, starts: list) -> (list, list):
+    """
+    :param find: Function of a start returning (target, path).
+    :return: Seconds per unit, moves to the target found (None if none).
+    """
+    times, moves = [], []
+    for start in starts:
+        began = perf_counter()
+        target, path = find(start)
+        times.append(perf_counter() - began)
+        moves.append(len(path) - 1 if path else None)
+    return times, moves
+
+
+def nearest_by_jps(jps, targets: list):
+    def find(start: Coord):
+        best = (None, [])
+        for target in targets:
+            path = jps.connect_path(jps.execute((start, target)))
+            if path and (not best[1] or len(path) < len(best[1])):
+                best = (target, path)
+        return best
+    return find
+
+
+def print_row(name: str, times: list) -> None:
+    print("  {:<15} p50 {:9.3f} ms  p95 {:9.3f} ms".format(
+        name, percentile(times, 0.5) * 1000, percentile(times, 0.95) * 1000))
+
+
+def time_updates(nearest: NearestTargets, free: list, rng: random.Random) -> None:
+    added = rng.sample(free, 10)
+    began = perf_counter()
+    for target in added:
+        nearest.add(target)
+    add = (perf_counter() - began) / len(added)
+    began = perf_counter()
+    for target in added:
+        nearest.remove(target)
+    remove = (perf_counter() - began) / len(added)
+    began = perf_counter()
+    nearest.build()
+    build = perf_counter() - began
+    print("  updates: add {:.3f} ms, remove {:.3f} ms, rebuild {:.3f} ms".format(
+        add * 1000, remove * 1000, build * 1000))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sizes = [int(size) for size in sys.argv[1:]]
+    rng = random.Random(0)
+    for size in sizes:
+        grid = noise_map(size, 0, density=0.2)
+        jps = JumpPointSearch(grid, diagonal_tie_breaker)
+        free = [Coord(x, y) for y in range(size) for x in range(size) if not grid.is_obstacle(Coord(x, y))]
+        for count in target_counts:
+            targets = rng.sample(free, count)
+            starts = rng.sample(free, units)
+            print("noise {}x{}, {} targets, {} units".format(size, size, count, units))
+            jps_times, jps_moves = time_units(nearest_by_jps(jps, targets), starts)
+            search_times, search_moves = time_units(lambda start: grid.nearest_target(start, targets), starts)
+            began = perf_counter()
+            nearest = NearestTargets(grid, targets)
+            nearest.build()
+            build = perf_counter() - began
+            field_times, field_moves = time_units(nearest.nearest, starts)
+            print_row("jps x {}".format(count), jps_times)
+            print_row("nearest_target", search_times)
+            print_row("NearestTargets", field_times)
+            print("  NearestTargets build {:.3f} ms".format(build * 1000))
+            if not jps_moves == search_moves == field_moves:
+                print("  move counts differ!")
+            time_updates(nearest, free, rng)
+            nearest.detach()
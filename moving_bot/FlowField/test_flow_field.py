@@ -0,0 +1,64 @@
+import unittest
+import random
+from collections import deque
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+from FlowField.flow_field import FlowField, obstacle_array
+
+
+"""
+File: test_flow_field.py
+Author: Nathan Robertson
+Purpose: Test that flow fields agree with breadth first search from the goals.
+"""
+
+
+def breadth_first_distances(grid, goals):
+    distance = {goal: 0 for goal in goals}
+    frontier = deque(goals)
+    while frontier:
+        current = frontier.popleft()
+        for neighbor in grid.neighbors(current):
+            if neighbor not in distance:
+                distance[neighbor] = distance[current] + 1
+                frontier.append(neighbor)
+    return distance
+
+
+class ObstacleArrayTest(unittest.TestCase):
+    def test_obstacle_array(self):
+        grid = DiagonalGrid(10, 3, [Coord(9, 0), Coord(0, 2)])
+        blocked = obstacle_array(grid)
+        self.assertEqual((3, 10), blocked.shape)
+        self.assertEqual(2, blocked.sum())
+        self.assertTrue(blocked[0, 9])
+        self.assertTrue(blocked[2, 0])
+
+
+class FlowFieldTest(unittest.TestCase):
+    def test_matches_breadth_first_search(self):
+        rng = random.Random(4)
+        for grid_class in (DiagonalGrid, OrthogonalGrid):
+            obstacles = [Coord(x, y) for x in range(20) for y in range(15) if rng.random() < 0.25]
+            grid = grid_class(20, 15, obstacles)
+            goals = [Coord(rng.randrange(20), rng.randrange(15)) for _ in range(3)]
+            goals = [goal for goal in goals if not grid.is_obstacle(goal)]
+            field = FlowField(grid, goals)
+            expected = breadth_first_distances(grid, goals)
+            for x in range(20):
+                for y in range(15):
+                    coord = Coord(x, y)
+                    self.assertEqual(expected.get(coord), field.distance_to_goal(coord))
+                    path = field.path(coord)
+                    if coord in expected:
+                        self.assertEqual(expected[coord] + 1, len(path))
+                        self.assertTrue(path[-1] in goals)
+                    else:
+                        self.assertEqual([], path)
+
+    def test_next_step(self):
+        grid = OrthogonalGrid(3, 1, [])
+        field = FlowField(grid, [Coord(2, 0)])
+        self.assertEqual(Coord(1, 0), field.next_step(Coord(0, 0)))
+        self.assertIsNone(field.next_step(Coord(2, 0)))
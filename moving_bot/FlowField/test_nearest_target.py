@@ -0,0 +1,112 @@
+import random
+import unittest
+from Coordinate.coord import Coord
+from FlowField.flow_field import obstacle_array, distance_field, UNREACHABLE
+from FlowField.nearest_target import NearestTargets
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+
+
+"""
+File: test_nearest_target.py
+Author: Nathan Robertson
+Purpose: Test that nearest target queries agree with a distance field from every target, through target and
+         obstacle changes, and that the paths returned are valid walks of that length.
+"""
+
+
+def random_grid(grid_class, size: int, seed: int):
+    rng = random.Random(seed)
+    obstacles = [Coord(x, y) for y in range(size) for x in range(size) if rng.random() < 0.3]
+    return grid_class(size, size, obstacles)
+
+
+class NearestTargetTest(unittest.TestCase):
+    def check_against_field(self, grid, nearest: NearestTargets) -> None:
+        expected = distance_field(obstacle_array(grid), list(nearest.targets.values()), grid.NEIGHBOR_OFFSETS)
+        for y in range(grid.ysize):
+            for x in range(grid.xsize):
+                coord = Coord(x, y)
+                target, path = nearest.nearest(coord)
+                if grid.is_obstacle(coord) or expected[y, x] == UNREACHABLE:
+                    self.assertEqual((None, []), (target, path))
+                    continue
+                self.assertEqual(int(expected[y, x]), nearest.distance_to_nearest(coord))
+                self.check_path(grid, path, coord, target, int(expected[y, x]))
+
+    def check_path(self, grid, path: list, start: Coord, target: Coord, moves: int) -> None:
+        self.assertEqual(start, path[0])
+        self.assertEqual(target, path[-1])
+        self.assertEqual(moves + 1, len(path))
+        for current, following in zip(path, path[1:]):
+            self.assertIn(following, grid.neighbors(current))
+
+    def test_one_search_matches_field(self):
+        for grid_class in (DiagonalGrid, OrthogonalGrid):
+            grid = random_grid(grid_class, 16, 1)
+            targets = [Coord(1, 1), Coord(14, 3), Coord(7, 12)]
+            expected = distance_field(obstacle_array(grid), targets, grid.NEIGHBOR_OFFSETS)
+            for y in range(grid.ysize):
+                for x in range(grid.xsize):
+                    target, path = grid.nearest_target(Coord(x, y), targets)
+                    if grid.is_obstacle(Coord(x, y)) or expected[y, x] == UNREACHABLE:
+                        self.assertEqual((None, []), (target, path))
+                    else:
+                        self.assertIn(target, targets)
+                        self.check_path(grid, path, Coord(x, y), target, int(expected[y, x]))
+
+    def test_closest_target_and_path(self):
+        grid = DiagonalGrid(10, 3, [])
+        nearest = NearestTargets(grid, [Coord(0, 0), Coord(9, 2)])
+        target, path = nearest.nearest(Coord(6, 1))
+        self.assertEqual(Coord(9, 2), target)
+        self.assertEqual(4, len(path))
+        self.assertEqual((Coord(0, 0), [Coord(0, 0)]), nearest.nearest(Coord(0, 0)))
+
+    def test_no_targets(self):
+        grid = DiagonalGrid(4, 4, [])
+        nearest = NearestTargets(grid)
+        self.assertEqual((None, []), nearest.nearest(Coord(1, 1)))
+        self.assertEqual(None, nearest.distance_to_nearest(Coord(1, 1)))
+        self.assertEqual((None, []), grid.nearest_target(Coord(1, 1), []))
+
+    def test_off_grid_targets_ignored(self):
+        grid = DiagonalGrid(5, 3, [])
+        nearest = NearestTargets(grid, [Coord(-1, 1), Coord(5, 0), Coord(2, 3)])
+        self.assertEqual({}, nearest.targets)
+        self.assertEqual(None, nearest.distance_to_nearest(Coord(4, 0)))
+        nearest.add(Coord(0, 2))
+        nearest.add(Coord(-1, 1))
+        nearest.remove(Coord(5, 2))
+        self.assertEqual([Coord(0, 2)], list(nearest.targets.values()))
+        self.assertEqual(4, nearest.distance_to_nearest(Coord(4, 0)))
+        self.check_against_field(grid, nearest)
+
+    def test_add_and_remove(self):
+        rng = random.Random(3)
+        for grid_class in (DiagonalGrid, OrthogonalGrid):
+            grid = random_grid(grid_class, 14, 2)
+            free = [Coord(x, y) for y in range(14) for x in range(14) if not grid.is_obstacle(Coord(x, y))]
+            nearest = NearestTargets(grid, rng.sample(free, 3))
+            nearest.build()
+            for _ in range(20):
+                if len(nearest.targets) > 1 and rng.random() < 0.5:
+                    nearest.remove(rng.choice(list(nearest.targets.values())))
+                else:
+                    nearest.add(rng.choice(free))
+                self.check_against_field(grid, nearest)
+            self.assertEqual(1, nearest.rebuilds)
+
+    def test_rebuilds_after_obstacle_change(self):
+        grid = DiagonalGrid(5, 5, [])
+        nearest = NearestTargets(grid, [Coord(4, 2)])
+        self.assertEqual(4, nearest.distance_to_nearest(Coord(0, 2)))
+        for y in range(5):
+            grid.insert_obstacle(Coord(2, y))
+        self.assertEqual(None, nearest.distance_to_nearest(Coord(0, 2)))
+        grid.remove_obstacle(Coord(2, 4))
+        self.check_against_field(grid, nearest)
+        self.assertEqual(3, nearest.rebuilds)
+        nearest.detach()
+        grid.insert_obstacle(Coord(2, 4))
+        self.assertFalse(nearest.stale)
@@ -0,0 +1,412 @@
+from array import array
+from collections import deque
+from heapq import heappush, heappop
+from Coordinate.coord import Coord
+from heuristics import diagonal, xy_heuristic
+
+"""
+File: hpa_star.py
+Author: Nathan Robertson
+Purpose:
+    Hierarchical path finding (HPA*, Botea, Mueller and Schaeffer 2004) over any UniformGrid.
+    The map is split into square clusters. Where two clusters share a run of free cells along their border an
+    entrance is made (one transition in the middle of short runs, one at each end of long runs) and the cells on
+    both sides of a transition become nodes of a small abstract graph. Inside each cluster the shortest paths
+    between its entrance nodes are found once and cached, so a query only searches the abstract graph and then
+    stitches cached segments together. refine lets a unit expand only the segment it is about to walk.
+
+    Paths are near optimal, not optimal: a route is forced through the chosen transitions.
+    Every move costs one step (the same as jump point search counts them).
+
+    The planner subscribes to the grid. insert_obstacle / remove_obstacle mark only the cluster holding the cell
+    (and the borders it lies on) for a rebuild, which is done before the next query. Call detach when done.
+
+Terminology
+    Border: Cells on both sides of the line between two neighboring clusters, or the four cells around a corner
+            shared by four clusters (diagonal grids only).
+    Transition: A pair of free, adjacent cells on opposite sides of a border.
+    Entrance node: A cell of a cluster which is one end of a transition.
+"""
+
+
+__all__ = ["HPAStar", "LONG_ENTRANCE"]
+
+LONG_ENTRANCE = 6
+
+
+class HPAStar:
+    def __init__(self, grid, cluster_size: int = 10, heuristic_fn=diagonal):
+        """
+        :param grid: UniformGrid to plan on.
+        :param cluster_size: Width and height of a cluster in cells.
+        :param heuristic_fn: Admissible heuristic in steps for the grid (diagonal for diagonal grids, manhattan
+                             for orthogonal grids).
+        """
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.heuristic_fn = heuristic_fn
+        self.offsets = tuple(grid.NEIGHBOR_OFFSETS)
+        self.diagonal_moves = any(dx != 0 and dy != 0 for dx, dy in self.offsets)
+        self.columns = -(-grid.xsize // cluster_size)
+        self.rows = -(-grid.ysize // cluster_size)
+        self.transitions = {}
+        self.crossings = {}
+        self.entrances = {}
+        self.intra = {}
+        self.paths = {}
+        self.dirty_borders = set()
+        self.dirty_clusters = set()
+        self.clusters_rebuilt = 0
+        self.nodes_expanded = 0
+        self.build()
+        self._listener = lambda coord, blocked: self._mark_dirty(coord.x, coord.y)
+        grid.subscribe(self._listener)
+
+    def detach(self) -> None:
+        """
+        Stop listening to obstacle changes on the grid.
+        """
+        self.grid.unsubscribe(self._listener)
+
+    def build(self) -> None:
+        """
+        Finds every entrance and caches every intra-cluster path from scratch.
+        """
+        self.transitions.clear()
+        self.crossings.clear()
+        for cx in range(self.columns):
+            for cy in range(self.rows):
+                for key in self._cluster_borders(cx, cy):
+                    if key not in self.transitions:
+                        self._update_border(key)
+        for cx in range(self.columns):
+            for cy in range(self.rows):
+                self._rebuild_cluster((cx, cy))
+        self.dirty_borders.clear()
+        self.dirty_clusters.clear()
+
+    def execute(self, endpoints: (Coord, Coord)) -> list:
+        """
+        :param endpoints: A tuple containing (start, goal)
+        :return: Every cell from start to goal, [start] if start == goal, empty list if there is no path.
+        """
+        waypoints = self._abstract_search(endpoints)
+        if len(waypoints) == 0:
+            return []
+        xsize = self.grid.xsize
+        cells = [waypoints[0]]
+        for first, second in zip(waypoints, waypoints[1:]):
+            cells.extend(self._refine_ids(first, second))
+        return [Coord(cell % xsize, cell // xsize) for cell in cells]
+
+    def abstract_path(self, endpoints: (Coord, Coord)) -> list:
+        """
+        :return: Cells where the path enters or leaves a cluster, from start to goal. Consecutive waypoints are
+                 either in the same cluster or on opposite sides of a border. Empty list if there is no path.
+        """
+        xsize = self.grid.xsize
+        return [Coord(cell % xsize, cell // xsize) for cell in self._abstract_search(endpoints)]
+
+    def refine(self, first: Coord, second: Coord) -> list:
+        """
+        :param first: A waypoint of abstract_path.
+        :param second: The waypoint after it.
+        :return: The cells after first up to and including second.
+        """
+        xsize = self.grid.xsize
+        cells = self._refine_ids(first.y * xsize + first.x, second.y * xsize + second.x)
+        return [Coord(cell % xsize, cell // xsize) for cell in cells]
+
+    def node_count(self) -> int:
+        return sum(len(nodes) for nodes in self.entrances.values())
+
+    def edge_count(self) -> int:
+        return sum(len(partners) for partners in self.crossings.values()) + \
+            sum(len(edges) for intra in self.intra.values() for edges in intra.values())
+
+    def _abstract_search(self, endpoints) -> list:
+        """
+        A* over the entrance nodes with the start and goal linked in for this query only.
+        :return: Waypoint cell ids from start to goal, empty list if there is no path.
+        """
+        start, goal = endpoints
+        grid = self.grid
+        if not grid.is_valid_coord(start) or not grid.is_valid_coord(goal) or \
+                grid.is_obstacle(start) or grid.is_obstacle(goal):
+            return []
+        self._refresh()
+        xsize = grid.xsize
+        start_id, goal_id = start.y * xsize + start.x, goal.y * xsize + goal.x
+        if start_id == goal_id:
+            return [start_id]
+        start_cluster, goal_cluster = self._cluster_of(start_id), self._cluster_of(goal_id)
+        start_distance, _ = self._cluster_search(start_cluster, start_id)
+        start_links = {node: start_distance[node] for node in self.entrances[start_cluster]
+                       if node in start_distance}
+        if goal_id in start_distance:
+            start_links[goal_id] = start_distance[goal_id]
+        goal_distance, _ = self._cluster_search(goal_cluster, goal_id)
+        goal_links = {node: goal_distance[node] for node in self.entrances[goal_cluster] if node in goal_distance}
+
+        heuristic = xy_heuristic(self.heuristic_fn, goal)
+        g = {start_id: 0}
+        parent = {start_id: -1}
+        closed = set()
+        open_list = [(heuristic(start.x, start.y), 0, start_id)]
+        expanded = 0
+        found = False
+        while open_list:
+            _, cost, node = heappop(open_list)
+            if node in closed:
+                continue
+            closed.add(node)
+            expanded += 1
+            if node == goal_id:
+                found = True
+                break
+            for neighbor, step in self._abstract_neighbors(node, start_id, start_links, goal_id, goal_links):
+                next_g = cost + step
+                if next_g < g.get(neighbor, next_g + 1):
+                    g[neighbor] = next_g
+                    parent[neighbor] = node
+                    heappush(open_list, (next_g + heuristic(neighbor % xsize, neighbor // xsize), next_g, neighbor))
+        self.nodes_expanded = expanded
+        if not found:
+            return []
+        waypoints = []
+        node = goal_id
+        while node != -1:
+            waypoints.append(node)
+            node = parent[node]
+        waypoints.reverse()
+        return waypoints
+
+    def _abstract_neighbors(self, node: int, start_id: int, start_links: dict, goal_id: int, goal_links: dict):
+        if node == start_id:
+            yield from start_links.items()
+        intra = self.intra[self._cluster_of(node)].get(node)
+        if intra is not None:
+            yield from intra.items()
+        for partner in self.crossings.get(node, ()):
+            yield partner, 1
+        if node in goal_links:
+            yield goal_id, goal_links[node]
+
+    def _refine_ids(self, first: int, second: int) -> list:
+        cluster = self._cluster_of(first)
+        if cluster != self._cluster_of(second):
+            return [second]
+        if first < second:
+            cached = self.paths[cluster].get((first, second))
+            if cached is not None:
+                return list(cached[1:])
+        else:
+            cached = self.paths[cluster].get((second, first))
+            if cached is not None:
+                return list(reversed(cached[:-1]))
+        _, parent = self._cluster_search(cluster, first)
+        return self._trace(parent, second)[1:]
+
+    def _cluster_of(self, cell: int) -> tuple:
+        y, x = divmod(cell, self.grid.xsize)
+        return x // self.cluster_size, y // self.cluster_size
+
+    def _cluster_bounds(self, cluster: tuple) -> tuple:
+        """
+        :return: (x0, y0, x1, y1), the cluster covers x0 <= x < x1 and y0 <= y < y1.
+        """
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size, cluster[1] * size
+        return x0, y0, min(x0 + size, self.grid.xsize), min(y0 + size, self.grid.ysize)
+
+    def _cluster_search(self, cluster: tuple, source: int) -> (dict, dict):
+        """
+        Breadth first search which never leaves cluster.
+        :return: (steps from source, parent) for every cell of the cluster reachable from source.
+        """
+        x0, y0, x1, y1 = self._cluster_bounds(cluster)
+        xsize = self.grid.xsize
+        rows = self.grid.bitboard.rows
+        distance = {source: 0}
+        parent = {source: -1}
+        frontier = deque([source])
+        while frontier:
+            cell = frontier.popleft()
+            y, x = divmod(cell, xsize)
+            next_distance = distance[cell] + 1
+            for dx, dy in self.offsets:
+                nx, ny = x + dx, y + dy
+                if x0 <= nx < x1 and y0 <= ny < y1 and not (rows[ny] >> nx) & 1:
+                    neighbor = ny * xsize + nx
+                    if neighbor not in distance:
+                        distance[neighbor] = next_distance
+                        parent[neighbor] = cell
+                        frontier.append(neighbor)
+        return distance, parent
+
+    @staticmethod
+    def _trace(parent: dict, cell: int) -> list:
+        path = []
+        while cell != -1:
+            path.append(cell)
+            cell = parent[cell]
+        path.reverse()
+        return path
+
+    def _rebuild_cluster(self, cluster: tuple) -> None:
+        """
+        Collects the entrance nodes of cluster and caches the shortest path between every pair of them.
+        """
+        nodes = set()
+        for key in self._cluster_borders(*cluster):
+            for pair in self.transitions.get(key, ()):
+                for cell in pair:
+                    if self._cluster_of(cell) == cluster:
+                        nodes.add(cell)
+        intra = {node: {} for node in nodes}
+        paths = {}
+        for node in sorted(nodes):
+            distance, parent = self._cluster_search(cluster, node)
+            for other in nodes:
+                if other > node and other in distance:
+                    intra[node][other] = intra[other][node] = distance[other]
+                    paths[(node, other)] = array('l', self._trace(parent, other))
+        self.entrances[cluster] = nodes
+        self.intra[cluster] = intra
+        self.paths[cluster] = paths
+        self.clusters_rebuilt += 1
+
+    def _cluster_borders(self, cx: int, cy: int) -> list:
+        """
+        :return: Keys of the borders around cluster (cx, cy). ('v', cx, cy) is the border on the left of cluster
+                 (cx, cy), ('h', cx, cy) the one above it and ('d', cx, cy) the corner at its top left.
+        """
+        keys = []
+        if cx > 0:
+            keys.append(('v', cx, cy))
+        if cx + 1 < self.columns:
+            keys.append(('v', cx + 1, cy))
+        if cy > 0:
+            keys.append(('h', cx, cy))
+        if cy + 1 < self.rows:
+            keys.append(('h', cx, cy + 1))
+        if self.diagonal_moves:
+            for kx in (cx, cx + 1):
+                for ky in (cy, cy + 1):
+                    if 0 < kx < self.columns and 0 < ky < self.rows:
+                        keys.append(('d', kx, ky))
+        return keys
+
+    @staticmethod
+    def _border_clusters(key: tuple) -> list:
+        kind, cx, cy = key
+        if kind == 'v':
+            return [(cx - 1, cy), (cx, cy)]
+        if kind == 'h':
+            return [(cx, cy - 1), (cx, cy)]
+        return [(cx - 1, cy - 1), (cx, cy - 1), (cx - 1, cy), (cx, cy)]
+
+    def _update_border(self, key: tuple) -> None:
+        for first, second in self.transitions.get(key, ()):
+            self.crossings[first].discard(second)
+            self.crossings[second].discard(first)
+        pairs = self._find_transitions(key)
+        self.transitions[key] = pairs
+        for first, second in pairs:
+            self.crossings.setdefault(first, set()).add(second)
+            self.crossings.setdefault(second, set()).add(first)
+
+    def _find_transitions(self, key: tuple) -> list:
+        """
+        :return: (cell id, cell id) pairs of the transitions across the border.
+        """
+        kind, cx, cy = key
+        size = self.cluster_size
+        xsize = self.grid.xsize
+        board = self.grid.bitboard
+
+        def free(x, y):
+            return not board.test(x, y)
+
+        if kind == 'd':
+            x, y = cx * size, cy * size
+            pairs = []
+            if free(x - 1, y - 1) and free(x, y):
+                pairs.append(((y - 1) * xsize + x - 1, y * xsize + x))
+            if free(x, y - 1) and free(x - 1, y):
+                pairs.append(((y - 1) * xsize + x, y * xsize + x - 1))
+            return pairs
+        if kind == 'v':
+            x0, y0, x1, y1 = self._cluster_bounds((cx, cy))
+            line = range(y0, y1)
+
+            def cell(side, offset):
+                return offset * xsize + x0 - 1 + side
+        else:
+            x0, y0, x1, y1 = self._cluster_bounds((cx, cy))
+            line = range(x0, x1)
+
+            def cell(side, offset):
+                return (y0 - 1 + side) * xsize + offset
+
+        def cell_free(side, offset):
+            y, x = divmod(cell(side, offset), xsize)
+            return free(x, y)
+
+        straight = {offset: cell_free(0, offset) and cell_free(1, offset) for offset in line}
+        pairs = []
+        run = []
+        for offset in list(line) + [None]:
+            if offset is not None and straight[offset]:
+                run.append(offset)
+                continue
+            if len(run) >= LONG_ENTRANCE:
+                picks = (run[0], run[-1])
+            elif len(run) > 0:
+                picks = (run[len(run) // 2],)
+            else:
+                picks = ()
+            pairs.extend((cell(0, pick), cell(1, pick)) for pick in picks)
+            run = []
+        if self.diagonal_moves:
+            # A diagonal step is the only way across when neither cell has a straight crossing of its own.
+            for offset in line:
+                for near, far in ((offset, offset + 1), (offset + 1, offset)):
+                    if near not in straight or far not in straight or straight[near] or straight[far]:
+                        continue
+                    if cell_free(0, near) and cell_free(1, far):
+                        pairs.append((cell(0, near), cell(1, far)))
+        return pairs
+
+    def _mark_dirty(self, x: int, y: int) -> None:
+        """
+        Records the cluster holding (x, y) and every border (x, y) lies on for a rebuild before the next query.
+        """
+        size = self.cluster_size
+        cx, cy = x // size, y // size
+        self.dirty_clusters.add((cx, cy))
+        on_left, on_right = x % size == 0, x % size == size - 1
+        on_top, on_bottom = y % size == 0, y % size == size - 1
+        for key in self._cluster_borders(cx, cy):
+            kind, kx, ky = key
+            if kind == 'v' and ((kx == cx and on_left) or (kx == cx + 1 and on_right)):
+                self.dirty_borders.add(key)
+            elif kind == 'h' and ((ky == cy and on_top) or (ky == cy + 1 and on_bottom)):
+                self.dirty_borders.add(key)
+            elif kind == 'd' and ((kx == cx and on_left) or (kx == cx + 1 and on_right)) and \
+                    ((ky == cy and on_top) or (ky == cy + 1 and on_bottom)):
+                self.dirty_borders.add(key)
+
+    def _refresh(self) -> None:
+        """
+        Rebuilds the borders and clusters touched by obstacle changes since the last query.
+        """
+        if not self.dirty_clusters:
+            return
+        for key in self.dirty_borders:
+            self._update_border(key)
+            self.dirty_clusters.update(self._border_clusters(key))
+        for cluster in self.dirty_clusters:
+            self._rebuild_cluster(cluster)
+        self.dirty_borders.clear()
+        self.dirty_clusters.clear()
@@ -0,0 +1,76 @@
+from heuristics import diagonal, diagonal_tie_breaker
+from JumpPointSearch.jps_timing import make_diagonal_grid
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from AStar.astar_timing import random_endpoints
+from HPAStar.hpa_star import HPAStar
+from Coordinate.coord import Coord
+from time import perf_counter
+import tracemalloc
+import random
+
+"""
+File: hpa_timing.py
+Author: Nathan Robertson
+Purpose:
+    Build time and memory of the HPA* abstraction, and the speed of 100 long queries (start and goal on opposite
+    halves of the map) against flat jump point search on grids of increasing size. Path length is reported as a
+    ratio to the optimal length found by JPS. The last column is the time to repair the abstraction after one
+    obstacle is inserted, compared with the full build.
+
+    Run from the moving_bot directory with: python -m HPAStar.hpa_timing
+"""
+
+
+sizes = [64, 128, 256]
+cluster_size = 16
+queries = 100
+obstacle_prob = 10
+
+
+def long_endpoints(grid, count: int) -> list:
+    half = grid.xsize // 2
+    return [(start, goal) for start, goal in random_endpoints(grid, count * 4)
+            if (start.x < half) != (goal.x < half)][:count]
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    for size in sizes:
+        grid = make_diagonal_grid((size, size), obstacle_prob=obstacle_prob)
+        endpoints = long_endpoints(grid, queries)
+        tracemalloc.start()
+        HPAStar(grid, cluster_size, diagonal).detach()
+        _, memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        began = perf_counter()
+        hpa = HPAStar(grid, cluster_size, diagonal)
+        build_time = perf_counter() - began
+
+        jps = JumpPointSearch(grid, diagonal_tie_breaker)
+        began = perf_counter()
+        jps_lengths = [len(jps.connect_path(jps.execute(pair))) for pair in endpoints]
+        jps_time = perf_counter() - began
+        began = perf_counter()
+        hpa_lengths = [len(hpa.execute(pair)) for pair in endpoints]
+        hpa_time = perf_counter() - began
+        began = perf_counter()
+        for pair in endpoints:
+            hpa.abstract_path(pair)
+        abstract_time = perf_counter() - began
+        ratios = [hpa_length / jps_length for hpa_length, jps_length in zip(hpa_lengths, jps_lengths)
+                  if jps_length > 0]
+
+        grid.insert_obstacle(Coord(size // 2 + 1, size // 2 + 1))
+        began = perf_counter()
+        hpa.execute(endpoints[0])
+        repair_time = perf_counter() - began
+
+        print("{}x{} grid, {}% obstacles, {}x{} clusters:".format(size, size, obstacle_prob, cluster_size,
+                                                                  cluster_size))
+        print("    build {:.3f} s, peak {:.0f} KiB, {} nodes, {} edges".format(
+            build_time, memory / 1024, hpa.node_count(), hpa.edge_count()))
+        print("    {} queries: JPS {:.3f} s, HPA* {:.3f} s ({:.1f}x), abstract path only {:.3f} s ({:.1f}x)".format(
+            len(endpoints), jps_time, hpa_time, jps_time / hpa_time, abstract_time, jps_time / abstract_time))
+        print("    path length vs JPS: mean {:.3f}, max {:.3f}".format(sum(ratios) / len(ratios), max(ratios)))
+        print("    repair after one insert_obstacle {:.4f} s (full build {:.3f} s)".format(repair_time, build_time))
+        hpa.detach()
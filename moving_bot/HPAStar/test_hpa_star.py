@@ -0,0 +1,104 @@
+import unittest
+import random
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+from search_testing import breadth_first_distance
+from HPAStar.hpa_star import HPAStar
+from heuristics import manhattan
+
+
+"""
+File: test_hpa_star.py
+Author: Nathan Robertson
+Purpose: Test that hierarchical path finding returns connected paths whenever one exists and rebuilds only the
+         clusters an obstacle change touches.
+"""
+
+
+def random_grid(grid_class, size, density, rng):
+    obstacles = [Coord(x, y) for x in range(size) for y in range(size) if rng.random() < density]
+    return grid_class(size, size, obstacles)
+
+
+class HPAStarTest(unittest.TestCase):
+    def assertWalkable(self, grid, path, start, goal):
+        self.assertEqual(start, path[0])
+        self.assertEqual(goal, path[-1])
+        for first, second in zip(path, path[1:]):
+            self.assertTrue(grid.is_adjacent(first, second))
+
+    def check_random_queries(self, grid_class, heuristic_fn=None):
+        rng = random.Random(14)
+        for _ in range(20):
+            grid = random_grid(grid_class, rng.randrange(8, 30), 0.3, rng)
+            hpa = HPAStar(grid, 5) if heuristic_fn is None else HPAStar(grid, 5, heuristic_fn)
+            for _ in range(10):
+                start = Coord(rng.randrange(grid.xsize), rng.randrange(grid.ysize))
+                goal = Coord(rng.randrange(grid.xsize), rng.randrange(grid.ysize))
+                if grid.is_obstacle(start) or grid.is_obstacle(goal):
+                    continue
+                expected = breadth_first_distance(grid, start, goal)
+                path = hpa.execute((start, goal))
+                if expected is None:
+                    self.assertEqual([], path)
+                else:
+                    self.assertWalkable(grid, path, start, goal)
+                    self.assertTrue(len(path) - 1 >= expected)
+
+    def test_diagonal_grid(self):
+        self.check_random_queries(DiagonalGrid)
+
+    def test_orthogonal_grid(self):
+        self.check_random_queries(OrthogonalGrid, manhattan)
+
+    def test_open_grid_is_optimal(self):
+        grid = DiagonalGrid(40, 40, [])
+        path = HPAStar(grid, 10).execute((Coord(0, 0), Coord(39, 39)))
+        self.assertEqual(40, len(path))
+
+    def test_diagonal_squeeze(self):
+        grid = DiagonalGrid(4, 4, [Coord(2, 1), Coord(1, 2)])
+        path = HPAStar(grid, 2).execute((Coord(0, 0), Coord(3, 3)))
+        self.assertWalkable(grid, path, Coord(0, 0), Coord(3, 3))
+
+    def test_abstract_path_and_refine(self):
+        grid = DiagonalGrid(30, 30, [])
+        hpa = HPAStar(grid, 10)
+        waypoints = hpa.abstract_path((Coord(0, 15), Coord(29, 15)))
+        path = [waypoints[0]]
+        for first, second in zip(waypoints, waypoints[1:]):
+            path.extend(hpa.refine(first, second))
+        self.assertEqual(hpa.execute((Coord(0, 15), Coord(29, 15))), path)
+
+    def test_interior_change_rebuilds_one_cluster(self):
+        grid = DiagonalGrid(30, 30, [])
+        hpa = HPAStar(grid, 10)
+        rebuilt = hpa.clusters_rebuilt
+        grid.insert_obstacle(Coord(15, 15))
+        hpa.execute((Coord(0, 0), Coord(29, 29)))
+        self.assertEqual(rebuilt + 1, hpa.clusters_rebuilt)
+
+    def test_border_change(self):
+        grid = DiagonalGrid(20, 10, [])
+        hpa = HPAStar(grid, 10)
+        rebuilt = hpa.clusters_rebuilt
+        for y in range(10):
+            grid.insert_obstacle(Coord(10, y))
+        self.assertEqual([], hpa.execute((Coord(0, 0), Coord(19, 9))))
+        self.assertEqual(rebuilt + 2, hpa.clusters_rebuilt)
+        grid.remove_obstacle(Coord(10, 9))
+        path = hpa.execute((Coord(0, 0), Coord(19, 0)))
+        self.assertWalkable(grid, path, Coord(0, 0), Coord(19, 0))
+        self.assertTrue(Coord(10, 9) in path)
+
+    def test_detach(self):
+        grid = DiagonalGrid(10, 10, [])
+        hpa = HPAStar(grid, 5)
+        hpa.detach()
+        grid.insert_obstacle(Coord(1, 1))
+        self.assertEqual(set(), hpa.dirty_clusters)
+
+
+if __name__ == '__main__':
+    unittest.main()
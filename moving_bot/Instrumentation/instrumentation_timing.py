@@ -0,0 +1,46 @@
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from Benchmark.map_generators import noise_map, rooms_map
+from Benchmark.benchmark import make_queries
+import timeit
+
+"""
+File: instrumentation_timing.py
+Author: Nathan Robertson
+Purpose:
+    Cost of the search instrumentation. The same queries are timed on a searcher which was never instrumented,
+    one which was instrumented and then uninstrumented (should match the first) and one with counters enabled,
+    with and without a trace hook. The aggregate counters of the enabled run are printed as an example.
+
+    Run from the moving_bot directory with: python -m Instrumentation.instrumentation_timing
+"""
+
+
+def best_of(search, queries: list) -> float:
+    return min(timeit.repeat(lambda: [search.execute(pair) for pair in queries], number=1, repeat=5))
+
+
+if __name__ == "__main__":
+    for name, grid in (("noise 128x128", noise_map(128, 0)), ("rooms 128x128", rooms_map(128, 0))):
+        queries = make_queries(grid, 5, 20, 0)
+        plain = JumpPointSearch(grid, diagonal_tie_breaker)
+        removed = JumpPointSearch(grid, diagonal_tie_breaker)
+        removed.instrument()
+        removed.uninstrument()
+        counted = JumpPointSearch(grid, diagonal_tie_breaker)
+        stats = counted.instrument()
+        traced = JumpPointSearch(grid, diagonal_tie_breaker)
+        events = []
+        traced.instrument(lambda event, *details: events.append(event))
+
+        baseline = best_of(plain, queries)
+        print("{}, {} queries:".format(name, len(queries)))
+        for label, search in (("never instrumented", plain), ("uninstrumented", removed),
+                              ("counters", counted), ("counters + trace", traced)):
+            elapsed = best_of(search, queries) if search is not plain else baseline
+            print("    {:<20} {:8.2f} ms  ({:+.1f}%)".format(label, elapsed * 1000, 100 * (elapsed / baseline - 1)))
+        per_query = {counter: round(stats.mean(counter), 1) for counter in
+                     ('popped', 'pushed', 'jumps', 'scans', 'cells_scanned', 'forced_checks', 'forced_found')}
+        phases = {phase: round(stats.mean(phase) * 1000, 3) for phase in stats.times}
+        print("    mean per query: " + str(per_query))
+        print("    mean ms per query by phase (instrumented): " + str(phases))
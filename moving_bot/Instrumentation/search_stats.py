@@ -0,0 +1,330 @@
+from time import perf_counter
+
+"""
+File: search_stats.py
+Author: Nathan Robertson
+Purpose:
+    Opt-in counters, phase timers and trace hooks for JumpPointSearch and the grids, as an alternative to running
+    the whole bot under cProfile.
+    Nothing here is active until JumpPointSearch.instrument() or UniformGrid.instrument() is called. Those install
+    counting wrappers as instance attributes over the hot methods (_jump_xy, _jump_straight, _prune_xy, the open
+    list's push and pop, ...). The class methods are never touched, so an object which is not instrumented runs
+    exactly the same code as before and uninstrument() removes every wrapper again.
+
+Search counters (one QueryStats per execute / resume call, summed in SearchStats)
+    pushed / decreased / popped: Open list operations.
+    jumps: Jumps started from an expanded node (one per pruned direction).
+    scans: Straight block scans, including the ones made from every cell of a diagonal run.
+    cells_scanned: Cells covered by straight scans and diagonal steps.
+    diagonal_steps: Cells visited one at a time by diagonal jumps.
+    forced_checks / forced_found: Obstacle tests for forced neighbors while pruning and jumping diagonally, and how
+                                  many forced neighbors they found while pruning.
+    forced_cache_hits / forced_cache_misses: Lookups of the searcher's forced neighbor cache.
+    neighbor_cache_hits / neighbor_cache_misses: Lookups of the grid's neighbor cache, if it has one.
+    neighbors_calls / obstacle_checks: Calls of grid.neighbors and grid.is_obstacle (instrumented grids only).
+Phases (seconds)
+    total, heap, prune, jump, backtrack. Timers add overhead of their own, compare phases with each other rather
+    than with uninstrumented runs.
+Trace hook
+    A function called as trace(event, *details) for 'push' (cell, f, g), 'decrease' (cell, f, g), 'pop' (cell),
+    'jump' (x, y, dx, dy, result) and 'query' (QueryStats).
+"""
+
+
+__all__ = ["QueryStats", "SearchStats", "GridStats", "SearchInstrumentation", "GridInstrumentation",
+           "SEARCH_COUNTERS", "GRID_COUNTERS", "PHASES"]
+
+SEARCH_COUNTERS = ('pushed', 'decreased', 'popped', 'jumps', 'scans', 'cells_scanned', 'diagonal_steps',
+                   'forced_checks', 'forced_found', 'forced_cache_hits', 'forced_cache_misses',
+                   'neighbor_cache_hits', 'neighbor_cache_misses')
+GRID_COUNTERS = ('neighbors_calls', 'obstacle_checks', 'obstacles_inserted', 'obstacles_removed')
+PHASES = ('total', 'heap', 'prune', 'jump', 'backtrack')
+
+
+class QueryStats:
+    def __init__(self, endpoints=None):
+        self.endpoints = endpoints
+        self.counters = dict.fromkeys(SEARCH_COUNTERS + GRID_COUNTERS, 0)
+        self.times = dict.fromkeys(PHASES, 0.0)
+
+    def as_dict(self) -> dict:
+        return {'counters': dict(self.counters), 'times': dict(self.times)}
+
+
+class SearchStats:
+    """
+    Totals over every query since the searcher was instrumented (or since reset).
+    """
+    def __init__(self):
+        self.queries = 0
+        self.counters = dict.fromkeys(SEARCH_COUNTERS + GRID_COUNTERS, 0)
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.last = None
+
+    def add(self, query: QueryStats) -> None:
+        self.queries += 1
+        for name, value in query.counters.items():
+            self.counters[name] += value
+        for name, value in query.times.items():
+            self.times[name] += value
+        self.last = query
+
+    def mean(self, name: str) -> float:
+        """
+        :param name: A counter or phase name.
+        :return: Average of the counter or phase time per query.
+        """
+        total = self.counters[name] if name in self.counters else self.times[name]
+        return total / self.queries if self.queries else 0.0
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def as_dict(self) -> dict:
+        return {'queries': self.queries, 'counters': dict(self.counters), 'times': dict(self.times)}
+
+
+class GridStats:
+    def __init__(self):
+        self.counters = dict.fromkeys(GRID_COUNTERS, 0)
+
+    def as_dict(self) -> dict:
+        return dict(self.counters)
+
+
+def _install(target, wrappers: dict) -> None:
+    for name, wrapper in wrappers.items():
+        setattr(target, name, wrapper)
+
+
+def _remove(target, names) -> None:
+    for name in names:
+        target.__dict__.pop(name, None)
+
+
+class GridInstrumentation:
+    WRAPPED = ('neighbors', 'is_obstacle', 'insert_obstacle', 'remove_obstacle')
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.stats = GridStats()
+
+    def install(self) -> None:
+        grid, counters = self.grid, self.stats.counters
+        neighbors, is_obstacle = grid.neighbors, grid.is_obstacle
+        insert_obstacle, remove_obstacle = grid.insert_obstacle, grid.remove_obstacle
+
+        def counted_neighbors(coord):
+            counters['neighbors_calls'] += 1
+            return neighbors(coord)
+
+        def counted_is_obstacle(coord):
+            counters['obstacle_checks'] += 1
+            return is_obstacle(coord)
+
+        def counted_insert(coord):
+            version = grid.version
+            insert_obstacle(coord)
+            counters['obstacles_inserted'] += grid.version - version
+
+        def counted_remove(coord):
+            version = grid.version
+            remove_obstacle(coord)
+            counters['obstacles_removed'] += grid.version - version
+
+        _install(grid, {'neighbors': counted_neighbors, 'is_obstacle': counted_is_obstacle,
+                        'insert_obstacle': counted_insert, 'remove_obstacle': counted_remove})
+
+    def uninstall(self) -> None:
+        _remove(self.grid, self.WRAPPED)
+
+
+class SearchInstrumentation:
+    WRAPPED = ('execute', 'resume', '_reserve', '_reserve_backward', '_prune_xy', '_jump_xy', '_jump_straight', '_jump_diagonal',
+               '_backtrack_id')
+    HEAP_WRAPPED = ('push', 'push_or_decrease', 'pop')
+
+    def __init__(self, search, trace=None):
+        self.search = search
+        self.trace = trace
+        self.stats = SearchStats()
+        self.current = QueryStats()
+        self.heaps = []
+        self.depth = 0
+
+    def install(self) -> None:
+        search = self.search
+        original = {name: getattr(search, name) for name in self.WRAPPED}
+        board = search.grid.bitboard
+
+        def begin_query(endpoints):
+            self.depth += 1
+            if self.depth > 1:
+                return None, None
+            query = QueryStats(endpoints)
+            self.current = query
+            return query, self._cache_snapshot()
+
+        def end_query(query, snapshot, began):
+            self.depth -= 1
+            if query is None:
+                return
+            query.times['total'] += perf_counter() - began
+            for name, value in self._cache_snapshot().items():
+                query.counters[name] += value - snapshot[name]
+            self.stats.add(query)
+            if self.trace is not None:
+                self.trace('query', query)
+
+        def execute(endpoints):
+            query, snapshot = begin_query(endpoints)
+            began = perf_counter()
+            try:
+                return original['execute'](endpoints)
+            finally:
+                end_query(query, snapshot, began)
+
+        def resume(handle, max_expansions=None, deadline=None):
+            query, snapshot = begin_query((handle.start, handle.goal))
+            self._wrap_heap(handle.open_set)
+            began = perf_counter()
+            try:
+                return original['resume'](handle, max_expansions, deadline)
+            finally:
+                self._unwrap_heap(handle.open_set)
+                end_query(query, snapshot, began)
+
+        def reserve():
+            original['_reserve']()
+            if search.open_set is not None and search.open_set not in self.heaps:
+                self._wrap_heap(search.open_set)
+
+        def reserve_backward():
+            original['_reserve_backward']()
+            if search.backward_open_set not in self.heaps:
+                self._wrap_heap(search.backward_open_set)
+
+        def prune_xy(x, y, direction):
+            began = perf_counter()
+            result = original['_prune_xy'](x, y, direction)
+            query = self.current
+            query.times['prune'] += perf_counter() - began
+            if direction >= 0:
+                query.counters['forced_checks'] += 2
+                query.counters['forced_found'] += len(result) - (3 if direction >= 4 else 1)
+            return result
+
+        def jump_xy(x, y, dx, dy, goal_x, goal_y):
+            began = perf_counter()
+            result = original['_jump_xy'](x, y, dx, dy, goal_x, goal_y)
+            query = self.current
+            query.times['jump'] += perf_counter() - began
+            query.counters['jumps'] += 1
+            if self.trace is not None:
+                self.trace('jump', x, y, dx, dy, result)
+            return result
+
+        def jump_straight(x, y, dx, dy, goal_x, goal_y):
+            result = original['_jump_straight'](x, y, dx, dy, goal_x, goal_y)
+            counters = self.current.counters
+            counters['scans'] += 1
+            if result is not None:
+                counters['cells_scanned'] += abs(result[0] - x) + abs(result[1] - y)
+            elif board.contains(x + dx, y + dy):
+                if dy == 0:
+                    counters['cells_scanned'] += (board.next_in_row(x, y, dx) - x) * dx - 1
+                else:
+                    counters['cells_scanned'] += (board.next_in_column(x, y, dy) - y) * dy - 1
+            return result
+
+        def jump_diagonal(x, y, dx, dy, goal_x, goal_y):
+            result = original['_jump_diagonal'](x, y, dx, dy, goal_x, goal_y)
+            if result is not None:
+                steps = abs(result[0] - x)
+            else:
+                steps = 0
+                while board.contains(x + dx * (steps + 1), y + dy * (steps + 1)) and \
+                        not board.test(x + dx * (steps + 1), y + dy * (steps + 1)):
+                    steps += 1
+            counters = self.current.counters
+            counters['diagonal_steps'] += steps
+            counters['cells_scanned'] += steps
+            counters['forced_checks'] += 2 * steps
+            return result
+
+        def backtrack_id(cell, open_set=None, parent=None, arrival=None):
+            began = perf_counter()
+            result = original['_backtrack_id'](cell, open_set, parent, arrival)
+            self.current.times['backtrack'] += perf_counter() - began
+            return result
+
+        _install(search, {'execute': execute, 'resume': resume, '_reserve': reserve,
+                          '_reserve_backward': reserve_backward, '_prune_xy': prune_xy,
+                          '_jump_xy': jump_xy, '_jump_straight': jump_straight, '_jump_diagonal': jump_diagonal,
+                          '_backtrack_id': backtrack_id})
+        for heap in (search.open_set, search.backward_open_set):
+            if heap is not None:
+                self._wrap_heap(heap)
+
+    def uninstall(self) -> None:
+        _remove(self.search, self.WRAPPED)
+        for heap in list(self.heaps):
+            self._unwrap_heap(heap)
+
+    def _cache_snapshot(self) -> dict:
+        search = self.search
+        snapshot = {'forced_cache_hits': search.forced_cache.hits, 'forced_cache_misses': search.forced_cache.misses,
+                    'neighbor_cache_hits': 0, 'neighbor_cache_misses': 0}
+        cache = getattr(search.grid, 'neighbor_cache', None)
+        if cache is not None:
+            snapshot['neighbor_cache_hits'] = cache.hits
+            snapshot['neighbor_cache_misses'] = cache.misses
+        grid_instrumentation = getattr(search.grid, 'instrumentation', None)
+        if grid_instrumentation is not None:
+            snapshot.update(grid_instrumentation.stats.counters)
+        return snapshot
+
+    def _wrap_heap(self, heap) -> None:
+        push, push_or_decrease, pop = heap.push, heap.push_or_decrease, heap.pop
+
+        def counted_push(cell, f, g):
+            began = perf_counter()
+            push(cell, f, g)
+            query = self.current
+            query.times['heap'] += perf_counter() - began
+            query.counters['pushed'] += 1
+            if self.trace is not None:
+                self.trace('push', cell, f, g)
+
+        def counted_push_or_decrease(cell, f, g):
+            # A cell seen for the first time goes through heap.push, which is counted_push: only decreases are
+            # counted (and timed) here.
+            if cell not in heap:
+                return push_or_decrease(cell, f, g)
+            began = perf_counter()
+            changed = push_or_decrease(cell, f, g)
+            query = self.current
+            query.times['heap'] += perf_counter() - began
+            if changed:
+                query.counters['decreased'] += 1
+                if self.trace is not None:
+                    self.trace('decrease', cell, f, g)
+            return changed
+
+        def counted_pop():
+            began = perf_counter()
+            cell = pop()
+            query = self.current
+            query.times['heap'] += perf_counter() - began
+            query.counters['popped'] += 1
+            if self.trace is not None:
+                self.trace('pop', cell)
+            return cell
+
+        _install(heap, {'push': counted_push, 'push_or_decrease': counted_push_or_decrease, 'pop': counted_pop})
+        self.heaps.append(heap)
+
+    def _unwrap_heap(self, heap) -> None:
+        _remove(heap, self.HEAP_WRAPPED)
+        if heap in self.heaps:
+            self.heaps.remove(heap)
@@ -0,0 +1,115 @@
+import unittest
+import random
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from JumpPointSearch.jps_node import JPSNode
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from JumpPointSearch.jump_point_search_plus import JumpPointSearchPlus
+from heuristics import diagonal, diagonal_tie_breaker
+
+
+"""
+File: test_search_stats.py
+Author: Nathan Robertson
+Purpose: Test the opt-in search and grid counters, trace hooks and that uninstrumenting restores the plain methods.
+"""
+
+
+class SearchStatsTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(17)
+        obstacles = [Coord(x, y) for x in range(25) for y in range(25) if rng.random() < 0.2]
+        self.grid = DiagonalGrid(25, 25, obstacles)
+        self.pairs = []
+        while len(self.pairs) < 10:
+            start, goal = Coord(rng.randrange(25), rng.randrange(25)), Coord(rng.randrange(25), rng.randrange(25))
+            if not self.grid.is_obstacle(start) and not self.grid.is_obstacle(goal) and start != goal:
+                self.pairs.append((start, goal))
+
+    def test_counts_match_search(self):
+        plain = JumpPointSearch(self.grid, diagonal_tie_breaker)
+        jps = JumpPointSearch(self.grid, diagonal_tie_breaker)
+        stats = jps.instrument()
+        for pair in self.pairs:
+            self.assertEqual(plain.connect_path(plain.execute(pair)), jps.connect_path(jps.execute(pair)))
+            counters = stats.last.counters
+            self.assertEqual(jps.nodes_expanded, counters['popped'])
+            cells = self.grid.xsize * self.grid.ysize
+            self.assertEqual(sum(jps.open_set.is_seen(cell) for cell in range(cells)), counters['pushed'])
+            self.assertTrue(counters['jumps'] > 0 and counters['scans'] > 0)
+            self.assertTrue(counters['cells_scanned'] >= counters['diagonal_steps'])
+            self.assertTrue(stats.last.times['total'] >= stats.last.times['jump'])
+        self.assertEqual(len(self.pairs), stats.queries)
+        self.assertAlmostEqual(stats.counters['popped'] / len(self.pairs), stats.mean('popped'))
+
+    def test_exact_heap_counts(self):
+        grid = DiagonalGrid(10, 10, [Coord(5, y) for y in range(9)])
+        jps = JumpPointSearch(grid, diagonal)
+        stats = jps.instrument()
+        events = []
+        jps.instrument(lambda event, *details: events.append(event))
+        jps.execute((Coord(0, 0), Coord(9, 0)))
+        touched = sum(jps.open_set.is_seen(cell) for cell in range(100))
+        self.assertEqual(13, touched)
+        self.assertEqual(touched, stats.last.counters['pushed'])
+        self.assertEqual(touched, events.count('push'))
+        self.assertEqual(stats.last.counters['decreased'], events.count('decrease'))
+        self.assertEqual(jps.nodes_expanded, stats.last.counters['popped'])
+
+    def test_uninstrument(self):
+        jps = JumpPointSearch(self.grid, diagonal)
+        jps.instrument()
+        jps.execute(self.pairs[0])
+        jps.uninstrument()
+        for name in ('execute', '_jump_xy', '_jump_straight', '_prune_xy', '_reserve'):
+            self.assertFalse(name in jps.__dict__)
+        for name in ('push', 'pop', 'push_or_decrease'):
+            self.assertFalse(name in jps.open_set.__dict__)
+        self.assertIsNone(jps.instrumentation)
+
+    def test_trace(self):
+        events = []
+        jps = JumpPointSearch(self.grid, diagonal)
+        jps.instrument(lambda event, *details: events.append(event))
+        jps.execute(self.pairs[0])
+        self.assertEqual('push', events[0])
+        self.assertEqual('query', events[-1])
+        self.assertEqual(jps.nodes_expanded, events.count('pop'))
+        self.assertTrue('jump' in events)
+
+    def test_budgeted_search(self):
+        jps = JumpPointSearch(self.grid, diagonal)
+        stats = jps.instrument()
+        handle = jps.execute_budgeted(self.pairs[0], max_expansions=1)
+        while not handle.done:
+            jps.resume(handle, max_expansions=1)
+        self.assertEqual(handle.calls, stats.queries)
+        self.assertEqual(handle.expansions, stats.counters['popped'])
+        stats.reset()
+        jps.execute_budgeted((self.pairs[0][0], self.pairs[0][0]))
+        self.assertEqual(1, stats.queries)
+
+    def test_jps_plus_uses_tables(self):
+        jps = JumpPointSearchPlus(self.grid, diagonal)
+        stats = jps.instrument()
+        jps.execute(self.pairs[0])
+        self.assertTrue(stats.counters['jumps'] > 0)
+        self.assertEqual(0, stats.counters['scans'])
+
+    def test_grid_counters(self):
+        grid_stats = self.grid.instrument()
+        jps = JumpPointSearch(self.grid, diagonal)
+        stats = jps.instrument()
+        jps.prune(JPSNode(Coord(1, 1), None))
+        jps.execute(self.pairs[0])
+        self.assertEqual(1, grid_stats.counters['neighbors_calls'])
+        self.assertEqual(0, stats.last.counters['neighbors_calls'])
+        self.grid.insert_obstacle(Coord(0, 0))
+        self.grid.insert_obstacle(Coord(0, 0))
+        self.assertEqual(1, grid_stats.counters['obstacles_inserted'])
+        self.grid.uninstrument()
+        self.assertFalse('neighbors' in self.grid.__dict__)
+
+
+if __name__ == '__main__':
+    unittest.main()
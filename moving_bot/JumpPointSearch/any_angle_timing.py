@@ -0,0 +1,100 @@
+from Benchmark.benchmark import make_queries, percentile
+from Benchmark.map_generators import noise_map, rooms_map, maze_map
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from UniformGrid.line_of_sight import line_of_sight, smooth_path, path_length
+from time import perf_counter
+import sys
+
+"""
+File: any_angle_timing.py
+Author: Nathan Robertson
+Purpose:
+    JumpPointSearch paths smoothed to any angle waypoints against the raw connect_path cells, on open, noisy,
+    room and maze maps:
+    waypoints: Mean cells of connect_path, jump points of execute and waypoints after smoothing.
+    length: Mean Euclidean length of connect_path and of the smoothed waypoints.
+    cpu: p50 of execute + connect_path and of the smoothing on top of it.
+    The last line per size times one line of sight test on the bitboard (a mask per row) against testing cell by
+    cell along the same Bresenham line.
+
+    Run from the moving_bot directory with: python -m JumpPointSearch.any_angle_timing [sizes...]
+"""
+
+
+sizes = [64, 128, 256]
+maps = {
+    'open': lambda size: noise_map(size, 0, density=0.0),
+    'noise': lambda size: noise_map(size, 0, density=0.2),
+    'rooms': lambda size: rooms_map(size, 0),
+    'maze': lambda size: maze_map(size, 0),
+}
+
+
+def cell_by_cell(grid, start, goal) -> bool:
+    """
+    Bresenham line of sight with one is_obstacle call per cell, for comparison.
+    """
+    dx, dy = abs(goal.x - start.x), abs(goal.y - start.y)
+    sx, sy = (1 if goal.x >= start.x else -1), (1 if goal.y >= start.y else -1)
+    x, y = start.x, start.y
+    error = dx - dy
+    rows = grid.bitboard.rows
+    while True:
+        if (rows[y] >> x) & 1:
+            return False
+        if x == goal.x and y == goal.y:
+            return True
+        twice = 2 * error
+        if twice > -dy:
+            error -= dy
+            x += sx
+        if twice < dx:
+            error += dx
+            y += sy
+
+
+def compare(name: str, grid) -> None:
+    jps = JumpPointSearch(grid, diagonal_tie_breaker)
+    cells, jump_points, waypoints = [], [], []
+    raw_lengths, smooth_lengths = [], []
+    search_times, smooth_times = [], []
+    for endpoints in make_queries(grid, 5, 10, 0):
+        began = perf_counter()
+        result = jps.execute(endpoints)
+        path = jps.connect_path(result)
+        search_times.append(perf_counter() - began)
+        began = perf_counter()
+        smoothed = smooth_path(grid, path)
+        smooth_times.append(perf_counter() - began)
+        cells.append(len(path))
+        jump_points.append(len(result))
+        waypoints.append(len(smoothed))
+        raw_lengths.append(path_length(path))
+        smooth_lengths.append(path_length(smoothed))
+    count = len(cells)
+    print("  {:<6} waypoints cells {:7.1f} jump points {:5.1f} smoothed {:5.1f}  length {:7.1f} -> {:7.1f}  "
+          "cpu search {:7.3f} ms + smoothing {:7.3f} ms".format(
+              name, sum(cells) / count, sum(jump_points) / count, sum(waypoints) / count,
+              sum(raw_lengths) / count, sum(smooth_lengths) / count,
+              percentile(search_times, 0.5) * 1000, percentile(smooth_times, 0.5) * 1000))
+
+
+def time_line_of_sight(grid) -> None:
+    pairs = [endpoints for endpoints in make_queries(grid, 10, 20, 1)]
+    for name, test in (("bitboard runs", lambda start, goal: line_of_sight(grid, start, goal)),
+                       ("cell by cell", lambda start, goal: cell_by_cell(grid, start, goal))):
+        began = perf_counter()
+        for start, goal in pairs:
+            test(start, goal)
+        print("  line of sight {:<14} {:7.2f} us per test".format(name, (perf_counter() - began) / len(pairs) * 1e6))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sizes = [int(size) for size in sys.argv[1:]]
+    for size in sizes:
+        print("{}x{}".format(size, size))
+        for name, generator in maps.items():
+            compare(name, generator(size))
+        time_line_of_sight(maps['open'](size))
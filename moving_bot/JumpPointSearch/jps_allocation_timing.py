@@ -0,0 +1,72 @@
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jps_timing import make_diagonal_grid, xsize, ysize, top_left, bottom_right
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from JumpPointSearch.jps_node import JPSNode
+from AStar.astar_timing import random_endpoints
+from Coordinate.coord import Coord
+import tracemalloc
+import timeit
+import random
+
+"""
+File: jps_allocation_timing.py
+Author: Nathan Robertson
+Purpose:
+    Counts the objects the search allocates and times it on the jps_timing.py scenarios
+    (the 10x10 corner to corner query) plus 100 random queries on a 100x100 grid. Grids are seeded so runs
+    before and after a change are comparable.
+    Coord and JPSNode constructors are wrapped with counters for the duration of the count, and tracemalloc
+    reports the peak memory of one batch of queries.
+
+    Run from the moving_bot directory with: python -m JumpPointSearch.jps_allocation_timing
+"""
+
+
+class AllocationCounter:
+    def __init__(self, *classes):
+        self.classes = classes
+        self.originals = {}
+        self.counts = {cls.__name__: 0 for cls in classes}
+
+    def __enter__(self):
+        for cls in self.classes:
+            original = cls.__init__
+            self.originals[cls] = original
+
+            def counting_init(obj, *args, _original=original, _name=cls.__name__, **kwargs):
+                self.counts[_name] += 1
+                _original(obj, *args, **kwargs)
+            cls.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc):
+        for cls, original in self.originals.items():
+            cls.__init__ = original
+
+
+def report(name: str, run) -> None:
+    with AllocationCounter(Coord, JPSNode) as counter:
+        run()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(name + ":")
+    print("    objects allocated: " + str(counter.counts))
+    print("    peak traced memory (bytes): " + str(peak))
+    print("    wall time x10 (s): " + str(timeit.timeit(run, number=10)))
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    jps = JumpPointSearch(make_diagonal_grid((xsize, ysize), obstacle_prob=10), diagonal_tie_breaker)
+    report("jps_timing.py 10x10 corner to corner, execute",
+           lambda: jps.execute((top_left, bottom_right)))
+    report("jps_timing.py 10x10 corner to corner, execute and connect_path",
+           lambda: jps.connect_path(jps.execute((top_left, bottom_right))))
+
+    large_grid = make_diagonal_grid((100, 100), obstacle_prob=10)
+    large_jps = JumpPointSearch(large_grid, diagonal_tie_breaker)
+    pairs = random_endpoints(large_grid, 100)
+    report("100 random queries on 100x100, execute and connect_path",
+           lambda: [large_jps.connect_path(large_jps.execute(pair)) for pair in pairs])
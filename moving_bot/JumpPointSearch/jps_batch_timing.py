@@ -0,0 +1,36 @@
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jps_timing import make_diagonal_grid
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from AStar.astar_timing import random_endpoints
+import os
+import timeit
+import random
+
+"""
+File: jps_batch_timing.py
+Author: Nathan Robertson
+Purpose:
+    Measures the goal from jps_timing.py: find 100 randomly generated paths on a grid in < 1 second.
+    Batches of queries on a 100x100 grid are answered with execute_many using 1 to N worker processes
+    (N is the number of cpus). Worker start up is included in the times, which is why small batches are
+    faster with one worker.
+
+    Run from the moving_bot directory with: python -m JumpPointSearch.jps_batch_timing
+"""
+
+
+size = 100
+obstacle_prob = 10
+batches = [100, 1000]
+
+if __name__ == "__main__":
+    random.seed(0)
+    grid = make_diagonal_grid((size, size), obstacle_prob=obstacle_prob)
+    jps = JumpPointSearch(grid, diagonal_tie_breaker)
+    worker_counts = sorted({1, 2, max(1, os.cpu_count() or 1)})
+    for count in batches:
+        pairs = random_endpoints(grid, count)
+        for workers in worker_counts:
+            seconds = timeit.timeit(lambda: list(jps.execute_many(pairs, workers=workers)), number=1)
+            print(str(count) + " paths on " + str(size) + "x" + str(size) + " with " + str(workers) +
+                  " worker(s): " + str(seconds) + " s" + (" (goal met)" if count == 100 and seconds < 1 else ""))
@@ -0,0 +1,84 @@
+from Benchmark.benchmark import make_queries, percentile
+from Benchmark.map_generators import noise_map, maze_map, rooms_map
+from Coordinate.coord import Coord
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from UniformGrid.uniform_grid import grid_from_rows
+from UniformGrid.diagonal_grid import DiagonalGrid
+from time import perf_counter
+import sys
+
+"""
+File: jps_bidirectional_timing.py
+Author: Nathan Robertson
+Purpose:
+    Compares bidirectional JumpPointSearch with the plain one on open, noisy, room and maze maps of growing size:
+    mean nodes expanded and p50/p95 latency over the same reachable queries, plus a check that both return paths
+    of the same length.
+    The last rows time unreachable goals: a goal walled into a small box in the corner of a noisy map, where the
+    plain search has to expand everything reachable from the start before giving up.
+
+    Run from the moving_bot directory with: python -m JumpPointSearch.jps_bidirectional_timing [sizes...]
+"""
+
+
+sizes = [64, 128, 256]
+maps = {
+    'open': lambda size, seed: noise_map(size, seed, density=0.0),
+    'noise': lambda size, seed: noise_map(size, seed, density=0.2),
+    'rooms': rooms_map,
+    'maze': maze_map,
+}
+
+
+def boxed_goal_map(size: int):
+    """
+    :return: Noise map with a closed 5x5 box in the bottom right corner and the cell inside the box.
+    """
+    rows = list(noise_map(size, 0, density=0.2).bitboard.rows)
+    low, high = size - 6, size - 2
+    for y in range(low, high + 1):
+        for x in range(low, high + 1):
+            if x in (low, high) or y in (low, high):
+                rows[y] |= 1 << x
+            else:
+                rows[y] &= ~(1 << x)
+    return grid_from_rows(DiagonalGrid, size, size, rows), Coord(size - 4, size - 4)
+
+
+def measure(search, queries: list) -> (list, list, list):
+    times, expanded, lengths = [], [], []
+    for endpoints in queries:
+        began = perf_counter()
+        result = search.execute(endpoints)
+        times.append(perf_counter() - began)
+        expanded.append(search.nodes_expanded)
+        lengths.append(len(search.connect_path(result)))
+    return times, expanded, lengths
+
+
+def print_row(name: str, times: list, expanded: list) -> None:
+    print("  {:<15} expanded {:9.1f}  p50 {:8.3f} ms  p95 {:8.3f} ms".format(
+        name, sum(expanded) / len(expanded), percentile(times, 0.5) * 1000, percentile(times, 0.95) * 1000))
+
+
+def compare(title: str, grid, queries: list) -> None:
+    print(title)
+    plain = measure(JumpPointSearch(grid, diagonal_tie_breaker), queries)
+    bidirectional = measure(JumpPointSearch(grid, diagonal_tie_breaker, bidirectional=True), queries)
+    print_row("unidirectional", plain[0], plain[1])
+    print_row("bidirectional", bidirectional[0], bidirectional[1])
+    if plain[2] != bidirectional[2]:
+        print("  path lengths differ!")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sizes = [int(size) for size in sys.argv[1:]]
+    for size in sizes:
+        for name, generator in maps.items():
+            grid = generator(size, 0)
+            compare("{} {}x{}".format(name, size, size), grid, make_queries(grid, 5, 10, 0))
+        grid, goal = boxed_goal_map(size)
+        starts = [Coord(x, 0) for x in range(0, size, size // 8) if not grid.is_obstacle(Coord(x, 0))]
+        compare("unreachable {}x{}".format(size, size), grid, [(start, goal) for start in starts])
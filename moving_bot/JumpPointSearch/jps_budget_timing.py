@@ -0,0 +1,68 @@
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jps_timing import make_diagonal_grid
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from AStar.astar_timing import random_endpoints
+from time import perf_counter
+import random
+
+"""
+File: jps_budget_timing.py
+Author: Nathan Robertson
+Purpose:
+    Shows how execute_budgeted and resume bound the time spent per call. 100 random queries on a 200x200 grid are
+    run to completion in slices, once per budget, and the p50/p99/max time of a single call is reported next to the
+    number of calls (turns) a query needed. The unbudgeted row is one plain execute per query.
+
+    Run from the moving_bot directory with: python -m JumpPointSearch.jps_budget_timing
+"""
+
+
+size = 200
+queries = 100
+expansion_budgets = [None, 500, 100, 20]
+time_budgets = [0.005, 0.001]
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def print_calls(name: str, call_times: list, turns: list) -> None:
+    print("{:<24} p50 {:7.3f} ms  p99 {:7.3f} ms  max {:7.3f} ms  turns/query mean {:5.1f} max {}".format(
+        name, percentile(call_times, 0.5) * 1000, percentile(call_times, 0.99) * 1000, max(call_times) * 1000,
+        sum(turns) / len(turns), max(turns)))
+
+
+def run(jps, endpoints, max_expansions=None, time_budget=None):
+    call_times, turns = [], []
+    for pair in endpoints:
+        handle = None
+        while handle is None or not handle.done:
+            began = perf_counter()
+            deadline = None if time_budget is None else began + time_budget
+            if handle is None:
+                handle = jps.execute_budgeted(pair, max_expansions, deadline)
+            else:
+                jps.resume(handle, max_expansions, deadline)
+            call_times.append(perf_counter() - began)
+        turns.append(handle.calls)
+    return call_times, turns
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    grid = make_diagonal_grid((size, size), obstacle_prob=20)
+    endpoints = random_endpoints(grid, queries)
+    jps = JumpPointSearch(grid, diagonal_tie_breaker)
+    print("{}x{} grid, 20% obstacles, {} queries".format(size, size, queries))
+    times = []
+    for pair in endpoints:
+        began = perf_counter()
+        jps.execute(pair)
+        times.append(perf_counter() - began)
+    print_calls("execute (no budget)", times, [1] * queries)
+    for budget in expansion_budgets:
+        print_calls("max_expansions=" + str(budget), *run(jps, endpoints, max_expansions=budget))
+    for budget in time_budgets:
+        print_calls("deadline +{} ms".format(budget * 1000), *run(jps, endpoints, time_budget=budget))
@@ -7,11 +7,14 @@ Purpose:
 
 
 class JPSNode:
+    __slots__ = ('coord', 'direction', 'g', 'f', 'parent')
+
     def __init__(self, coord, direction, g=1, f=0):
         self.coord = coord
         self.direction = direction
-        self.f = g
-        self.g = f
+        self.g = g
+        self.f = f
+        self.parent = None
 
     def __lt__(self, other):
         return self.f < other.f
@@ -0,0 +1,42 @@
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jps_timing import make_diagonal_grid, print_result
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from JumpPointSearch.jump_point_search_plus import JumpPointSearchPlus
+from Coordinate.coord import Coord
+import timeit
+import random
+
+"""
+File: jps_plus_timing.py
+Author: Nathan Robertson
+Purpose:
+    Compare JPS+ against the online jump point search.
+    Reports how long building the jump tables takes, how much memory they use and the query time of both
+    searches on the same randomly generated grids and endpoints.
+
+    Run from the moving_bot directory with: python -m JumpPointSearch.jps_plus_timing
+"""
+
+
+sizes = [(32, 32), (64, 64), (100, 100)]
+obstacle_prob = 10
+queries = 100
+
+if __name__ == "__main__":
+    random.seed(0)
+    for xsize, ysize in sizes:
+        grid = make_diagonal_grid((xsize, ysize), obstacle_prob=obstacle_prob)
+        endpoints = [(Coord(random.randrange(xsize), random.randrange(ysize)),
+                      Coord(random.randrange(xsize), random.randrange(ysize))) for _ in range(queries)]
+        jps = JumpPointSearch(grid, diagonal_tie_breaker)
+        jps_plus = JumpPointSearchPlus(grid, diagonal_tie_breaker)
+
+        print("Grid " + str(xsize) + "x" + str(ysize) + ":")
+        print("Preprocessing time (s): ")
+        print(timeit.timeit(jps_plus.preprocess, number=1))
+        print("Table memory (bytes): ")
+        print(jps_plus.table_bytes())
+        print("JPS query time for " + str(queries) + " paths (s): ")
+        print_result(lambda: [jps.execute(pair) for pair in endpoints], 1)
+        print("JPS+ query time for " + str(queries) + " paths (s): ")
+        print_result(lambda: [jps_plus.execute(pair) for pair in endpoints], 1)
@@ -1,5 +1,4 @@
 from UniformGrid.diagonal_grid import DiagonalGrid
-from UniformGrid.uniform_grid import print_diagonal
 from heuristics import diagonal_tie_breaker
 # My JPS implementation
 from JumpPointSearch.jump_point_search import *
@@ -59,12 +58,8 @@ top_left = Coord(0, 0)
 bottom_right = Coord(xsize - 1, ysize - 1)
 
 if __name__ == "__main__":
-    try:
-        print("Compute jump points only: ")
-        jps = JumpPointSearch(grid, diagonal_tie_breaker)
-        print_result(lambda: jps.execute((top_left, bottom_right)), 1000)
-        print("Compute jump points and points between them.")
-        print_result(lambda: jps.connect_path(jps.execute((top_left, bottom_right))), 1000)
-    except RecursionError as e:
-        print(e)
-        print_diagonal(grid, [])
+    print("Compute jump points only: ")
+    jps = JumpPointSearch(grid, diagonal_tie_breaker)
+    print_result(lambda: jps.execute((top_left, bottom_right)), 1000)
+    print("Compute jump points and points between them.")
+    print_result(lambda: jps.connect_path(jps.execute((top_left, bottom_right))), 1000)
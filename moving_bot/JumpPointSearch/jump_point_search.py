@@ -1,8 +1,15 @@
-import math
-from JumpPointSearch.jps_hash_heap import JPSHashHeap
-from functools import lru_cache
+from array import array
+from time import perf_counter
+from PriorityQueue.indexed_heap import IndexedHeap
+from concurrent.futures import ProcessPoolExecutor
+from heuristics import xy_heuristic
+from Cache.grid_cache import GridCache
 from JumpPointSearch.jps_node import JPSNode
+from JumpPointSearch.search_handle import SearchHandle
+from Instrumentation.search_stats import SearchInstrumentation
 from Coordinate.coord import Coord
+from UniformGrid.bitboard import next_set_bit
+from UniformGrid.line_of_sight import smooth_path
 
 """
 File: jump_point_search.py
@@ -22,17 +29,116 @@ Terminology
                        to all neighbors of node x:
         1. Straight moves: length of path from the parent to node n is <= the length of the path including x.
         2. Diagonal moves: Same as straight moves except <= becomes <
+
+Search core
+    Inside _raw_execute cells are integer ids (y * xsize + x) and directions are indexes into DIRECTIONS.
+    Parent links and arrival directions live in flat arrays next to the IndexedHeap, so a query allocates no Coords
+    or JPSNodes until the path is handed back. The Coord based methods (jump, prune, successors, forced_neighbors)
+    are thin wrappers over the same core.
+
+Budgeted search
+    execute_budgeted and resume run the same search in slices bounded by a number of expansions or a
+    perf_counter deadline, keeping the open list in a SearchHandle between calls (e.g. across turns).
+
+Bidirectional search
+    With bidirectional set, execute runs a forward search from the start and a backward search from the goal
+    (moves are symmetric so the backward search jumps exactly like the forward one, towards the start), always
+    expanding the side with the smaller open list. mu is the cheapest start to goal route seen so far through a
+    cell reached by both sides. The search stops once the lowest f of either open list is >= mu: every open list
+    minimum is a lower bound on the shortest route while that side has not finished, so mu is optimal.
+    The two sides prune differently and need not share many jump points, but the goal (start) is always one of the
+    forward (backward) search's, so stopping never depends on the sides happening to meet in the middle.
+    If either open list runs dry before the sides meet the goal is unreachable, which the side walled into the
+    smaller region finds after expanding only that region.
+
+Reachability
+    Given a ComponentIndex (Reachability/component_index.py) of the grid, execute and execute_budgeted answer
+    queries whose start and goal lie in different components with no path and 0 nodes expanded. The index keeps
+    itself up to date as obstacles change, so one index can serve every search on the grid.
 """
 
 
 NEXT_DIAGONALS = frozenset({(1, 1), (-1, -1), (-1, 1), (1, -1)})
 STRAIGHT_COST = 1
+FORCED_NEIGHBOR_CACHE_SIZE = 8192
+
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, 1), (-1, 1), (1, -1))
+DIRECTION_IDS = {direction: index for index, direction in enumerate(DIRECTIONS)}
+NO_DIRECTION = -1
+
+
+def _pruning_rules(dx: int, dy: int) -> tuple:
+    """
+    :return: (natural direction ids, ((obstacle x offset, obstacle y offset, forced direction id), ...)) for a node
+             reached by moving in direction (dx, dy).
+    """
+    if dx != 0 and dy != 0:
+        natural = ((dx, 0), (0, dy), (dx, dy))
+        forced = ((0, -dy, (dx, -dy)), (-dx, 0, (-dx, dy)))
+    else:
+        natural = ((dx, dy),)
+        forced = ((dy, dx, (dx + dy, dy + dx)), (-dy, -dx, (dx - dy, dy - dx)))
+    return (tuple(DIRECTION_IDS[direction] for direction in natural),
+            tuple((ox, oy, DIRECTION_IDS[direction]) for ox, oy, direction in forced))
+
+
+PRUNING_RULES = tuple(_pruning_rules(dx, dy) for dx, dy in DIRECTIONS)
+
+# Searcher owned by a worker process of execute_many, built once per worker by _initialize_worker.
+_worker_search = None
+
+
+def _initialize_worker(search_class, grid, heuristic_fn, bidirectional=False):
+    global _worker_search
+    _worker_search = search_class(grid, heuristic_fn)
+    _worker_search.bidirectional = bidirectional
+
+
+def _worker_execute(endpoints):
+    return _worker_search.execute(endpoints)
 
 
 class JumpPointSearch:
-    def __init__(self, grid, heuristic_fn):
+    def __init__(self, grid, heuristic_fn, bidirectional: bool = False, reachability=None):
+        """
+        :param bidirectional: Search from both ends, see Bidirectional search above.
+        :param reachability: Optional ComponentIndex of grid (Reachability/component_index.py). Queries between
+                             different components are answered with no path before any search runs.
+        """
         self.grid = grid
         self.heuristic_fn = heuristic_fn
+        self.bidirectional = bidirectional
+        self.reachability = reachability
+        self.open_set = None
+        self.parent = None
+        self.arrival = None
+        self.backward_open_set = None
+        self.backward_parent = None
+        self.backward_arrival = None
+        self.nodes_expanded = 0
+        self.forced_cache = GridCache(grid, FORCED_NEIGHBOR_CACHE_SIZE)
+        self.instrumentation = None
+
+    def instrument(self, trace=None):
+        """
+        Starts counting what every query does (see Instrumentation/search_stats.py). Costs nothing until called.
+        :param trace: Optional function called as trace(event, *details) for pushes, pops, jumps and whole queries.
+        :return: SearchStats with totals over the queries, stats.last holds the QueryStats of the latest one.
+        """
+        if self.instrumentation is None:
+            self.instrumentation = SearchInstrumentation(self, trace)
+            self.instrumentation.install()
+        else:
+            self.instrumentation.trace = trace
+        return self.instrumentation.stats
+
+    def uninstrument(self) -> None:
+        """
+        Removes the counting wrappers, the searcher runs its plain methods again.
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.uninstall()
+            self.instrumentation = None
 
     def connect_path(self, jump_points: []) -> []:
         """
@@ -41,9 +147,9 @@ class JumpPointSearch:
         :return: A connected sequence (list) of nodes which comprises the path from a start node to a goal node.
         """
         def connect_jump_points(begin, end):
-            total_cells = int(self.heuristic_fn(begin.coord, end.coord))
-            return list(map(lambda offset: Coord(begin.coord.x + end.direction.x * offset, begin.coord.y + end.direction.y * offset),
-                            range(0, total_cells)))
+            total_cells = max(abs(end.coord.x - begin.coord.x), abs(end.coord.y - begin.coord.y))
+            return [Coord(begin.coord.x + end.direction.x * offset, begin.coord.y + end.direction.y * offset)
+                    for offset in range(0, total_cells)]
 
         path = []
         valid_jump_points = [jump_point for jump_point in jump_points if jump_point is not None]
@@ -55,6 +161,15 @@ class JumpPointSearch:
             path.append(valid_jump_points[len(valid_jump_points) - 1].coord)
         return path
 
+    def any_angle_path(self, jump_points: []) -> []:
+        """
+        Smooths the connected path down to the cells where a unit moving in straight lines has to turn
+        (see UniformGrid/line_of_sight.py).
+        :param jump_points: Result of execute.
+        :return: Waypoints from start to goal, every two consecutive ones in line of sight.
+        """
+        return smooth_path(self.grid, self.connect_path(jump_points))
+
     def execute(self, endpoints: (Coord, Coord)):
         """
         Finds the jump points that comprise a path from some start to some goal
@@ -62,24 +177,273 @@ class JumpPointSearch:
         :return:
         """
         start, goal = endpoints
+        self.nodes_expanded = 0
         if start == goal:
-            return [start]
-        elif len(self.grid.neighbors(start)) == 0 or len(self.grid.neighbors(goal)) == 0:
+            return [JPSNode(start, None, 0, 0)]
+        elif self._unreachable(start, goal):
             return []
+        elif self.bidirectional:
+            return self._bidirectional_execute(start, goal)
         else:
             return self._raw_execute(start, goal)
 
+    def execute_many(self, pairs, workers: int = 1, chunksize: int = 64):
+        """
+        Answers many queries on the same grid. Results are yielded in the order of pairs as they become available.
+        With one worker every query reuses this searcher's open list and caches.
+        With more workers each worker process gets a pickled copy of the grid (see UniformGrid.__reduce__) and
+        builds its own searcher once, so precomputed state such as JPS+ tables is built once per worker, not per query.
+        :param pairs: Iterable of (start, goal) tuples.
+        :param workers: Number of processes to spread the queries over.
+        :param chunksize: Queries sent to a worker at a time.
+        :return: Generator of execute results.
+        """
+        if workers <= 1:
+            for endpoints in pairs:
+                yield self.execute(endpoints)
+            return
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker,
+                                 initargs=(self.__class__, self.grid, self.heuristic_fn,
+                                           self.bidirectional)) as executor:
+            yield from executor.map(_worker_execute, pairs, chunksize=chunksize)
+
     def _raw_execute(self, start, goal):
-        start_node = JPSNode(start, None, 0, self.heuristic_fn(start, goal))
-        open_set = JPSHashHeap()
-        open_set.add(start_node)
-        jump_points = []
-        while len(open_set) > 0 and open_set.top().coord != goal:
-            current = open_set.pop()
-            jump_points.append(current)
-            for successor in self.successors(current, goal):
-                open_set.add(successor)
-        return jump_points + [open_set.top()]
+        """
+        A* over jump points. The open list is an IndexedHeap keyed on cell id (y * xsize + x) so a cheaper route to
+        a jump point lowers its cost in place, and cells which have been expanded are closed and never expanded again.
+        :return: Jump points from start to goal (following parent links) or empty list if goal is unreachable.
+        """
+        xsize = self.grid.xsize
+        self._reserve()
+        open_set, parent, arrival = self.open_set, self.parent, self.arrival
+        open_set.clear()
+        heuristic = xy_heuristic(self.heuristic_fn, goal)
+        start_id = start.y * xsize + start.x
+        parent[start_id] = -1
+        arrival[start_id] = NO_DIRECTION
+        open_set.push(start_id, heuristic(start.x, start.y), 0)
+        cell, self.nodes_expanded = self._expand(open_set, parent, arrival, heuristic, goal)
+        if cell == -1:
+            return []
+        return self._backtrack_id(cell)
+
+    def _expand(self, open_set, parent, arrival, heuristic, goal: Coord, max_expansions: int = None,
+                deadline: float = None, handle: SearchHandle = None) -> (int, int):
+        """
+        The A* loop shared by execute and resume: pops jump points until the goal is expanded, the open list runs
+        empty or the budget is spent.
+        :param open_set: Open list holding the search so far, parent and arrival the links of its cells.
+        :param max_expansions: Most jump points to expand, None for no limit.
+        :param deadline: time.perf_counter() value after which to stop, None for no limit.
+        :param handle: SearchHandle whose expansions and closest jump point to the goal are kept up to date.
+        :return: (goal cell id, -1 if the goal is unreachable or None if the budget ran out first, expansions).
+        """
+        xsize = self.grid.xsize
+        g_values = open_set.g
+        goal_x, goal_y = goal.x, goal.y
+        goal_id = goal_y * xsize + goal_x
+        expanded = 0
+        while len(open_set) > 0:
+            if max_expansions is not None and expanded >= max_expansions:
+                return None, expanded
+            if deadline is not None and perf_counter() >= deadline:
+                return None, expanded
+            cell = open_set.pop()
+            expanded += 1
+            if handle is not None:
+                handle.expansions += 1
+                h = open_set.f[cell] - g_values[cell]
+                if handle.best_h is None or h < handle.best_h:
+                    handle.best, handle.best_h = cell, h
+            if cell == goal_id:
+                return cell, expanded
+            y, x = divmod(cell, xsize)
+            g = g_values[cell]
+            for jump_x, jump_y, direction in self._successors_xy(x, y, arrival[cell], goal_x, goal_y):
+                next_g = g + max(abs(jump_x - x), abs(jump_y - y)) * STRAIGHT_COST
+                next_id = jump_y * xsize + jump_x
+                if open_set.push_or_decrease(next_id, next_g + heuristic(jump_x, jump_y), next_g):
+                    parent[next_id] = cell
+                    arrival[next_id] = direction
+        return -1, expanded
+
+    def _bidirectional_execute(self, start, goal):
+        """
+        Forward and backward A* over jump points, see Bidirectional search above.
+        :return: Jump points from start to goal through the best meeting cell or empty list if goal is unreachable.
+        """
+        xsize = self.grid.xsize
+        self._reserve()
+        self._reserve_backward()
+        start_id = start.y * xsize + start.x
+        goal_id = goal.y * xsize + goal.x
+        forward = (self.open_set, self.parent, self.arrival, xy_heuristic(self.heuristic_fn, goal), goal.x, goal.y,
+                   self.backward_open_set)
+        backward = (self.backward_open_set, self.backward_parent, self.backward_arrival,
+                    xy_heuristic(self.heuristic_fn, start), start.x, start.y, self.open_set)
+        for (open_set, parent, arrival, heuristic, _, _, _), (origin, x, y) in \
+                ((forward, (start_id, start.x, start.y)), (backward, (goal_id, goal.x, goal.y))):
+            open_set.clear()
+            parent[origin] = -1
+            arrival[origin] = NO_DIRECTION
+            open_set.push(origin, heuristic(x, y), 0)
+        forward_set, backward_set = forward[0], backward[0]
+        best = float('inf')
+        meeting = -1
+        expanded = 0
+        while len(forward_set) > 0 and len(backward_set) > 0:
+            if best <= forward_set.f[forward_set.top()] or best <= backward_set.f[backward_set.top()]:
+                break
+            open_set, parent, arrival, heuristic, target_x, target_y, other = \
+                forward if len(forward_set) <= len(backward_set) else backward
+            cell = open_set.pop()
+            expanded += 1
+            y, x = divmod(cell, xsize)
+            g = open_set.g[cell]
+            for jump_x, jump_y, direction in self._successors_xy(x, y, arrival[cell], target_x, target_y):
+                next_g = g + max(abs(jump_x - x), abs(jump_y - y)) * STRAIGHT_COST
+                next_id = jump_y * xsize + jump_x
+                if open_set.push_or_decrease(next_id, next_g + heuristic(jump_x, jump_y), next_g):
+                    parent[next_id] = cell
+                    arrival[next_id] = direction
+                    if other.is_seen(next_id) and next_g + other.g[next_id] < best:
+                        best = next_g + other.g[next_id]
+                        meeting = next_id
+        self.nodes_expanded = expanded
+        if meeting == -1:
+            return []
+        return self._join_id(meeting)
+
+    def _join_id(self, cell: int) -> list:
+        """
+        :param cell: Id of a cell reached by both sides of a bidirectional search.
+        :return: Nodes from the start to cell (forward parents) followed by the backward search's jump points from
+                 cell to the goal, with directions and costs as if the forward search had found them.
+        """
+        xsize = self.grid.xsize
+        path = self._backtrack_id(cell)
+        previous = path[-1]
+        parent = self.backward_parent
+        cell = parent[cell]
+        while cell != -1:
+            x, y = cell % xsize, cell // xsize
+            dx, dy = x - previous.coord.x, y - previous.coord.y
+            g = previous.g + max(abs(dx), abs(dy)) * STRAIGHT_COST
+            node = JPSNode(Coord(x, y), Coord((dx > 0) - (dx < 0), (dy > 0) - (dy < 0)), g, g)
+            node.parent = previous
+            path.append(node)
+            previous = node
+            cell = parent[cell]
+        return path
+
+    def execute_budgeted(self, endpoints: (Coord, Coord), max_expansions: int = None,
+                         deadline: float = None) -> SearchHandle:
+        """
+        Starts a search which stops once its budget is spent. Keep calling resume with the handle until handle.done.
+        :param endpoints: A tuple containing (start, goal)
+        :param max_expansions: Most jump points to expand in this call, None for no limit.
+        :param deadline: time.perf_counter() value after which this call stops, None for no limit.
+        :return: Handle holding the search state. handle.result is the same as execute once handle.done is True.
+        """
+        start, goal = endpoints
+        handle = SearchHandle(start, goal, self.grid.xsize * self.grid.ysize, self.grid.version)
+        return self.resume(handle, max_expansions, deadline)
+
+    def resume(self, handle: SearchHandle, max_expansions: int = None, deadline: float = None) -> SearchHandle:
+        """
+        Continues a search started by execute_budgeted. If the grid changed since the handle was last run the search
+        starts over, since its open list and costs may no longer be right.
+        :return: handle, with handle.done set when the goal was reached or found unreachable.
+        """
+        if handle.done and handle.version == self.grid.version:
+            return handle
+        if handle.version != self.grid.version:
+            handle.reset(self.grid.version)
+        handle.calls += 1
+        if handle.heuristic is None and not self._start_handle(handle):
+            return handle
+        cell, _ = self._expand(handle.open_set, handle.parent, handle.arrival, handle.heuristic, handle.goal,
+                               max_expansions, deadline, handle)
+        if cell is None:
+            return handle
+        handle.done = True
+        handle.result = [] if cell == -1 else self._backtrack_id(cell, handle.open_set, handle.parent, handle.arrival)
+        return handle
+
+    def partial_path(self, handle: SearchHandle) -> list:
+        """
+        :return: Jump points from the start to the expanded jump point closest to the goal (the full result once the
+                 search is done), empty list if nothing was expanded or the goal is unreachable.
+        """
+        if handle.done:
+            return handle.result
+        if handle.best == -1:
+            return []
+        return self._backtrack_id(handle.best, handle.open_set, handle.parent, handle.arrival)
+
+    def _start_handle(self, handle: SearchHandle) -> bool:
+        """
+        Pushes the start of a fresh handle, or finishes it straight away like execute does for trivial queries.
+        :return: True if the search has to run.
+        """
+        start, goal = handle.start, handle.goal
+        if start == goal or self._unreachable(start, goal):
+            handle.done = True
+            handle.result = self.execute((start, goal))
+            return False
+        xsize = self.grid.xsize
+        start_id = start.y * xsize + start.x
+        handle.heuristic = xy_heuristic(self.heuristic_fn, goal)
+        handle.parent[start_id] = -1
+        handle.arrival[start_id] = NO_DIRECTION
+        handle.open_set.push(start_id, handle.heuristic(start.x, start.y), 0)
+        return True
+
+    def _reserve(self) -> None:
+        """
+        Allocates the open list and the parent/arrival arrays once per searcher.
+        """
+        if self.open_set is None:
+            cells = self.grid.xsize * self.grid.ysize
+            self.open_set = IndexedHeap(cells)
+            self.parent = array('l', [-1]) * cells
+            self.arrival = array('b', [NO_DIRECTION]) * cells
+
+    def _reserve_backward(self) -> None:
+        """
+        Allocates the second open list and arrays used by bidirectional search, only once it is first needed.
+        """
+        if self.backward_open_set is None:
+            cells = self.grid.xsize * self.grid.ysize
+            self.backward_open_set = IndexedHeap(cells)
+            self.backward_parent = array('l', [-1]) * cells
+            self.backward_arrival = array('b', [NO_DIRECTION]) * cells
+
+    def _backtrack_id(self, cell: int, open_set=None, parent=None, arrival=None) -> list:
+        """
+        Builds the JPSNodes handed back to the caller, the only nodes a query creates.
+        :param cell: Id of the last cell of a path.
+        :param open_set: Search state to follow, the searcher's own unless given (a SearchHandle's).
+        :return: Nodes from the start of the path to cell.
+        """
+        xsize = self.grid.xsize
+        if open_set is None:
+            open_set, parent, arrival = self.open_set, self.parent, self.arrival
+        cells = []
+        while cell != -1:
+            cells.append(cell)
+            cell = parent[cell]
+        path = []
+        previous = None
+        for cell in reversed(cells):
+            direction = arrival[cell]
+            node = JPSNode(Coord(cell % xsize, cell // xsize),
+                           None if direction == NO_DIRECTION else Coord(*DIRECTIONS[direction]),
+                           open_set.g[cell], open_set.f[cell])
+            node.parent = previous
+            path.append(node)
+            previous = node
+        return path
 
     def successors(self, current: JPSNode, goal: Coord):
         """
@@ -89,50 +453,136 @@ class JumpPointSearch:
         :return: A set of successors, including empty set if no successors are found.
         """
         succ = set()
-        neighbors = self.prune(current)
-        parent_x, parent_y = current.coord.x, current.coord.y
-        for neighbor in neighbors:
-            dir_coord = self.direction(current.coord, neighbor)
-            next_jump_point = self.jump(Coord(parent_x, parent_y), Coord(dir_coord.x, dir_coord.y), goal)
-            if next_jump_point is not None:
-                next_node = JPSNode(next_jump_point, dir_coord)
-                next_node.g = current.g + STRAIGHT_COST
-                next_node.f = next_node.g + self.heuristic_fn(next_node.coord, goal)
-                succ.add(next_node)
+        x, y = current.coord.x, current.coord.y
+        direction = NO_DIRECTION if current.direction is None else \
+            DIRECTION_IDS[(current.direction.x, current.direction.y)]
+        heuristic = xy_heuristic(self.heuristic_fn, goal)
+        for jump_x, jump_y, next_direction in self._successors_xy(x, y, direction, goal.x, goal.y):
+            next_node = JPSNode(Coord(jump_x, jump_y), Coord(*DIRECTIONS[next_direction]))
+            next_node.g = current.g + max(abs(jump_x - x), abs(jump_y - y)) * STRAIGHT_COST
+            next_node.f = next_node.g + heuristic(jump_x, jump_y)
+            succ.add(next_node)
         return succ
 
+    def _successors_xy(self, x: int, y: int, direction: int, goal_x: int, goal_y: int) -> list:
+        """
+        :return: (x, y, direction id) of every jump point reachable from (x, y) after pruning.
+        """
+        found = []
+        for next_direction in self._prune_xy(x, y, direction):
+            dx, dy = DIRECTIONS[next_direction]
+            jump_point = self._jump_xy(x, y, dx, dy, goal_x, goal_y)
+            if jump_point is not None:
+                found.append((jump_point[0], jump_point[1], next_direction))
+        return found
+
+    def _prune_xy(self, x: int, y: int, direction: int):
+        """
+        :return: Direction ids of the natural neighbors plus forced neighbors of (x, y). Every direction is tried
+                 from the start (direction == NO_DIRECTION), jumping rejects the ones which are blocked.
+        """
+        if direction == NO_DIRECTION:
+            return range(len(DIRECTIONS))
+        natural, forced = PRUNING_RULES[direction]
+        test = self.grid.bitboard.test
+        extra = [forced_direction for ox, oy, forced_direction in forced if test(x + ox, y + oy)]
+        if extra:
+            return natural + tuple(extra)
+        return natural
+
+    def _unreachable(self, start: Coord, goal: Coord) -> bool:
+        """
+        :return: True if a search from start cannot reach goal, judged without searching.
+        """
+        if self._is_isolated(start.x, start.y) or self._is_isolated(goal.x, goal.y):
+            return True
+        return self.reachability is not None and not self.reachability.connected(start, goal)
+
+    def _is_isolated(self, x: int, y: int) -> bool:
+        """
+        :return: True if (x, y) is off the grid, an obstacle or has no free neighbor.
+        """
+        board = self.grid.bitboard
+        if not board.contains(x, y) or board.test(x, y):
+            return True
+        for dx, dy in DIRECTIONS:
+            if board.contains(x + dx, y + dy) and not board.test(x + dx, y + dy):
+                return False
+        return True
+
     def jump(self, parent: Coord, direction: Coord, goal):
         """
-        Finds next jump point recursively.
-        Base cases:
+        Finds next jump point iteratively.
+        Straight directions are scanned a whole row or column at a time on the grid's bitboard (block-based JPS):
+        the closest obstacle ahead, the closest obstacle beside the run (which creates a forced neighbor) and
+        the goal are found with bit operations instead of stepping one cell at a time.
+        Diagonal directions step one cell at a time and block-scan both straight directions from every cell.
+        Stopping cases:
         1. Next coordinate is out of bounds
         2. Next coordinate is an obstacle
-        3. Next coordinate has forced neighbors
+        3. Next coordinate has forced neighbors or is the goal
 
         :param parent: Previously considered point (not necessarily a jump point)
         :param direction: Direction to try finding next jump point.
         :param goal: Goal cell.
         :return: Next jump point to consider or None if direction is invalid.
         """
-        def straight_moves():
-            return {Coord(0, direction.y), Coord(direction.x, 0)}
+        found = self._jump_xy(parent.x, parent.y, direction.x, direction.y, goal.x, goal.y)
+        if found is None:
+            return None
+        return Coord(found[0], found[1])
 
-        def invalid_direction() -> bool:
-            return not self.grid.is_valid_coord(next_coord) or next_coord in self.grid.obstacles()
+    def _jump_xy(self, x: int, y: int, dx: int, dy: int, goal_x: int, goal_y: int):
+        """
+        :return: (x, y) of the next jump point from (x, y) in direction (dx, dy) or None.
+        """
+        if dx != 0 and dy != 0:
+            return self._jump_diagonal(x, y, dx, dy, goal_x, goal_y)
+        return self._jump_straight(x, y, dx, dy, goal_x, goal_y)
 
-        def is_jump_point() -> bool:
-            return next_coord == goal or self.has_forced_neighbors(next_coord, direction)
+    def _jump_diagonal(self, x: int, y: int, dx: int, dy: int, goal_x: int, goal_y: int):
+        """
+        :return: (x, y) of the next diagonal jump point or None.
+        """
+        board = self.grid.bitboard
+        rows = board.rows
+        xsize, ysize = board.xsize, board.ysize
+        while True:
+            x += dx
+            y += dy
+            if not (0 <= x < xsize and 0 <= y < ysize) or (rows[y] >> x) & 1:
+                return None
+            if (x == goal_x and y == goal_y) or board.test(x, y - dy) or board.test(x - dx, y):
+                return x, y
+            if self._jump_straight(x, y, 0, dy, goal_x, goal_y) is not None or \
+                    self._jump_straight(x, y, dx, 0, goal_x, goal_y) is not None:
+                return x, y
 
-        next_coord = Coord(parent.x + direction.x, parent.y + direction.y)
-        if invalid_direction():
+    def _jump_straight(self, x: int, y: int, dx: int, dy: int, goal_x: int, goal_y: int):
+        """
+        Block scan along a row (dy == 0) or column (dx == 0).
+        :return: (x, y) of the next straight jump point or None.
+        """
+        board = self.grid.bitboard
+        if not board.contains(x + dx, y + dy):
             return None
-        if is_jump_point():
-            return next_coord
-        if self.is_diagonal(direction):
-            for i in straight_moves():
-                if self.jump(next_coord, i, goal) is not None:
-                    return next_coord
-        return self.jump(next_coord, direction, goal)
+        if dy == 0:
+            step, start, goal_on_line, goal_position = dx, x, goal_y == y, goal_x
+            blocked = board.next_in_row(x, y, dx)
+            forced = next_set_bit(board.row(y - 1) | board.row(y + 1), x, dx)
+        else:
+            step, start, goal_on_line, goal_position = dy, y, goal_x == x, goal_y
+            blocked = board.next_in_column(x, y, dy)
+            forced = next_set_bit(board.column(x - 1) | board.column(x + 1), y, dy)
+        limit = (blocked - start) * step
+        stop = limit
+        if forced is not None:
+            stop = (forced - start) * step
+        if goal_on_line and 0 < (goal_position - start) * step < stop:
+            stop = (goal_position - start) * step
+        if stop >= limit:
+            return None
+        return x + dx * stop, y + dy * stop
 
     def has_forced_neighbors(self, coord: Coord, direction: Coord):
         """
@@ -153,18 +603,36 @@ class JumpPointSearch:
         natural_neighbors = self.natural_neighbors(current.coord, current.direction)
         forced_neighbors = self.forced_neighbors(current.coord, current.direction)
         neighbors = natural_neighbors.union(forced_neighbors)
-        return set(filter(lambda neighbor: neighbor not in self.grid.obstacles(), neighbors))
+        return set(filter(lambda neighbor: not self.grid.is_obstacle(neighbor), neighbors))
+
+    def cache_stats(self) -> dict:
+        """
+        :return: Hit rate and memory of the caches used by this search (and its grid, if the grid caches).
+        """
+        stats = {'forced_neighbors': self.forced_cache.stats()}
+        if hasattr(self.grid, 'neighbor_cache'):
+            stats['neighbors'] = self.grid.neighbor_cache.stats()
+        return stats
 
-    @lru_cache(maxsize=None)
     def forced_neighbors(self, coord, direction) -> set:
+        """
+        Cached version of compute_forced_neighbors. The cache is bounded, belongs to this search and is emptied
+        when the grid's obstacles change.
+        """
+        key = (coord.x, coord.y, direction.x, direction.y)
+        forced = self.forced_cache.get(key)
+        if forced is None:
+            forced = self.compute_forced_neighbors(coord, direction)
+            self.forced_cache.put(key, forced)
+        return forced
+
+    def compute_forced_neighbors(self, coord, direction) -> set:
         """
         Forced neighbors are defined by the paper as:
         1. Not a natural neighbor of coord
         2. The length of a path from coord's parent to the coord through coord is less than the corresponding path
             without coord.
-        This method is cached because the same coord and direction are called in hot areas of code. (Once in pruning
-        and once in jump.) Recomputing it will slow program execution by an order of magnitude. A cache is a much cheaper
-        way of obtaining the same information twice.
+        forced_neighbors caches the result because pruning asks for the same coord and direction over and over.
 
         :param coord: The current coordinate
         :param direction: Direction traveled to get to coord.
@@ -174,13 +642,16 @@ class JumpPointSearch:
             orthogonal_direction = Coord(direction.y, direction.x)
             forced_candidates = {Coord(coord.x + orthogonal_direction.x, coord.y + orthogonal_direction.y),
                                  Coord(coord.x - orthogonal_direction.x, coord.y - orthogonal_direction.y)}
-            forced = set(filter(lambda candidate: candidate in self.grid.obstacles(), forced_candidates))
+            forced = set(filter(self.grid.is_obstacle, forced_candidates))
             return set(map(lambda cell: Coord(cell.x + direction.x, cell.y + direction.y), forced))
 
         def diagonal_forced_neighbors(coord, direction):
-            forced_candidates = {Coord(coord.x, coord.y - direction.y)}
-            forced = set(filter(lambda candidate: candidate in self.grid.obstacles(), forced_candidates))
-            return set(map(lambda cell: Coord(cell.x + direction.x, cell.y), forced))
+            forced = set()
+            if self.grid.is_obstacle(Coord(coord.x, coord.y - direction.y)):
+                forced.add(Coord(coord.x + direction.x, coord.y - direction.y))
+            if self.grid.is_obstacle(Coord(coord.x - direction.x, coord.y)):
+                forced.add(Coord(coord.x - direction.x, coord.y + direction.y))
+            return forced
 
         if self.is_diagonal(direction):
             return diagonal_forced_neighbors(coord, direction)
@@ -0,0 +1,174 @@
+from array import array
+from JumpPointSearch.jump_point_search import JumpPointSearch
+
+"""
+File: jump_point_search_plus.py
+Author: Nathan Robertson
+Purpose:
+    JPS+ (Harabor and Grastien 2014). Battlecode maps do not change apart from robots so the distance to the
+    next jump point from every cell in all eight directions can be computed once when the game starts.
+    A jump is then one table lookup plus a check whether the goal lies on the way, instead of a scan.
+    The goal independent tables give exactly the same jump points as JumpPointSearch.jump.
+
+Table values (one flat array per direction, indexed by y * xsize + x):
+    n > 0: The next jump point is n steps away.
+    n <= 0: There is no jump point ahead and -n cells can be walked before hitting an obstacle or the edge.
+
+Symmetric maps
+    Given a MapSymmetry (Symmetry/map_symmetry.py) the table of a direction is the reflection of the table of the
+    mirrored direction, and the two directions running along the axis only need their primary half built.
+    That is half the work of building all eight. Without symmetry, or once the map is no longer mirrored, all
+    eight are built.
+"""
+
+
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, 1), (-1, 1), (1, -1))
+
+
+class JumpPointSearchPlus(JumpPointSearch):
+    def __init__(self, grid, heuristic_fn, symmetry=None, bidirectional: bool = False, reachability=None,
+                 tables=None):
+        """
+        :param tables: Tables built earlier for this grid as it is now (e.g. from a Snapshot), any sequence of ints
+                       per direction. They are used until the grid changes instead of preprocessing.
+        """
+        super().__init__(grid, heuristic_fn, bidirectional, reachability)
+        self.symmetry = symmetry
+        self.tables = {}
+        self.tables_version = None
+        if tables is None:
+            self.preprocess()
+        else:
+            self.tables = dict(tables)
+            self.tables_version = grid.version
+
+    def preprocess(self) -> None:
+        """
+        Builds the jump distance tables. jump calls it again by itself after obstacles on the grid change.
+        Straight tables are built first because a diagonal cell is a jump point if either of its straight
+        directions has one.
+        """
+        self.tables = {}
+        self.tables_version = self.grid.version
+        symmetry = self.symmetry if self.symmetry is not None and self.symmetry.holds() else None
+        for direction in DIRECTIONS:
+            if direction[0] == 0 or direction[1] == 0:
+                self.tables[direction] = self._table(direction, symmetry)
+        for direction in DIRECTIONS:
+            if direction[0] != 0 and direction[1] != 0:
+                self.tables[direction] = self._table(direction, symmetry)
+
+    def _table(self, direction, symmetry) -> array:
+        """
+        :return: The table of direction, reflected from the mirrored direction when symmetry allows.
+        """
+        if symmetry is None:
+            return self._build_table(direction)
+        mirrored = symmetry.reflect_direction(*direction)
+        if mirrored in self.tables:
+            return symmetry.reflect_table(self.tables[mirrored])
+        if mirrored == direction:
+            table = self._build_table(direction, symmetry)
+            symmetry.complete_table(table)
+            return table
+        return self._build_table(direction)
+
+    def table_bytes(self) -> int:
+        """
+        :return: Memory used by the jump distance tables in bytes.
+        """
+        return sum(len(table) * table.itemsize for table in self.tables.values())
+
+    def _build_table(self, direction, symmetry=None) -> array:
+        """
+        Dynamic programming pass over the grid. Cells are visited so that the neighbor in direction is always
+        finished before the cell itself.
+        :param symmetry: Only build the primary half, for a direction running along the symmetry axis.
+        """
+        board = self.grid.bitboard
+        rows = board.rows
+        xsize, ysize = board.xsize, board.ysize
+        dx, dy = direction
+        table = array('i', bytes(4 * xsize * ysize))
+        xs = range(xsize - 1, -1, -1) if dx > 0 else range(xsize)
+        ys = range(ysize - 1, -1, -1) if dy > 0 else range(ysize)
+        if symmetry is not None:
+            if dy == 0:
+                ys = range((ysize - 1) // 2 + 1)
+            else:
+                xs = range((xsize - 1) // 2 + 1)
+        diagonal = dx != 0 and dy != 0
+        if diagonal:
+            vertical, horizontal = self.tables[(0, dy)], self.tables[(dx, 0)]
+        for y in ys:
+            ny = y + dy
+            for x in xs:
+                nx = x + dx
+                if not (0 <= nx < xsize and 0 <= ny < ysize) or (rows[ny] >> nx) & 1:
+                    continue
+                n = ny * xsize + nx
+                if diagonal:
+                    stop = board.test(nx, ny - dy) or board.test(nx - dx, ny) or \
+                           vertical[n] > 0 or horizontal[n] > 0
+                else:
+                    stop = board.test(nx + dy, ny + dx) or board.test(nx - dy, ny - dx)
+                if stop:
+                    table[y * xsize + x] = 1
+                elif table[n] > 0:
+                    table[y * xsize + x] = table[n] + 1
+                else:
+                    table[y * xsize + x] = table[n] - 1
+        return table
+
+    def _jump_xy(self, x: int, y: int, dx: int, dy: int, goal_x: int, goal_y: int):
+        """
+        Looks up the next jump point in the precomputed tables instead of scanning.
+        :return: (x, y) of the next jump point from (x, y) in direction (dx, dy) or None.
+        """
+        if not self.grid.bitboard.contains(x, y):
+            return super()._jump_xy(x, y, dx, dy, goal_x, goal_y)
+        if self.tables_version != self.grid.version:
+            self.preprocess()
+        if dx != 0 and dy != 0:
+            steps = self._diagonal_steps(x, y, dx, dy, goal_x, goal_y)
+        else:
+            steps = self._straight_steps(x, y, dx, dy, goal_x, goal_y)
+        if steps is None:
+            return None
+        return x + dx * steps, y + dy * steps
+
+    def _straight_steps(self, x: int, y: int, dx: int, dy: int, goal_x: int, goal_y: int):
+        """
+        :return: Steps to the next straight jump point, including the goal, or None.
+        """
+        distance = self.tables[(dx, dy)][y * self.grid.xsize + x]
+        if dy == 0 and goal_y == y:
+            to_goal = (goal_x - x) * dx
+        elif dx == 0 and goal_x == x:
+            to_goal = (goal_y - y) * dy
+        else:
+            to_goal = 0
+        if to_goal > 0 and (to_goal <= distance or to_goal <= -distance):
+            return to_goal
+        if distance > 0:
+            return distance
+        return None
+
+    def _diagonal_steps(self, x: int, y: int, dx: int, dy: int, goal_x: int, goal_y: int):
+        """
+        A diagonal run also stops on the cell which shares a row or column with the goal when a straight jump
+        from that cell reaches the goal.
+        :return: Steps to the next diagonal jump point or None.
+        """
+        distance = self.tables[(dx, dy)][y * self.grid.xsize + x]
+        limit = distance if distance > 0 else -distance
+        best = distance if distance > 0 else None
+        for steps in sorted(((goal_y - y) * dy, (goal_x - x) * dx)):
+            if steps <= 0 or steps > limit or (best is not None and steps >= best):
+                continue
+            cell_x, cell_y = x + dx * steps, y + dy * steps
+            if (cell_x == goal_x and cell_y == goal_y) or \
+                    self._straight_steps(cell_x, cell_y, dx, 0, goal_x, goal_y) is not None or \
+                    self._straight_steps(cell_x, cell_y, 0, dy, goal_x, goal_y) is not None:
+                return steps
+        return best
@@ -0,0 +1,47 @@
+from array import array
+from PriorityQueue.indexed_heap import IndexedHeap
+from Coordinate.coord import Coord
+
+"""
+File: search_handle.py
+Author: Nathan Robertson
+Purpose:
+    State of a jump point search which ran out of budget (see JumpPointSearch.execute_budgeted and resume).
+    A handle owns its own open list, parent and arrival arrays, so the searcher can answer other queries between
+    turns without disturbing it. It also tracks the expanded jump point closest to the goal, which gives a best
+    partial path while the search is still running.
+"""
+
+
+__all__ = ["SearchHandle"]
+
+
+class SearchHandle:
+    def __init__(self, start: Coord, goal: Coord, cells: int, version: int):
+        self.start = start
+        self.goal = goal
+        self.open_set = IndexedHeap(cells)
+        self.parent = array('l', [-1]) * cells
+        self.arrival = array('b', [-1]) * cells
+        self.version = version
+        self.heuristic = None
+        self.expansions = 0
+        self.calls = 0
+        self.restarts = 0
+        self.best = -1
+        self.best_h = None
+        self.done = False
+        self.result = None
+
+    def reset(self, version: int) -> None:
+        """
+        Forget all progress, used when the grid changed since the search started.
+        """
+        self.open_set.clear()
+        self.version = version
+        self.heuristic = None
+        self.best = -1
+        self.best_h = None
+        self.done = False
+        self.result = None
+        self.restarts += 1
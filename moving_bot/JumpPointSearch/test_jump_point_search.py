@@ -1,10 +1,12 @@
 import unittest
+import random
 from Coordinate.coord import Coord
 from functools import reduce
 from UniformGrid.diagonal_grid import DiagonalGrid
 from JumpPointSearch.jps_node import JPSNode
 from JumpPointSearch.jump_point_search import JumpPointSearch
 from heuristics import diagonal, diagonal_tie_breaker
+from search_testing import breadth_first_distance
 
 
 """
@@ -44,6 +46,43 @@ class JumpTest(unittest.TestCase):
         self.assertIsNone(coord)
 
 
+class IterativeJumpTest(unittest.TestCase):
+    def reference_jump(self, jps, parent, direction, goal):
+        """
+        The cell by cell recursive definition of jump which the block scan has to agree with.
+        """
+        next_coord = Coord(parent.x + direction.x, parent.y + direction.y)
+        if not jps.grid.is_valid_coord(next_coord) or jps.grid.is_obstacle(next_coord):
+            return None
+        if next_coord == goal or jps.has_forced_neighbors(next_coord, direction):
+            return next_coord
+        if jps.is_diagonal(direction):
+            for straight in (Coord(0, direction.y), Coord(direction.x, 0)):
+                if self.reference_jump(jps, next_coord, straight, goal) is not None:
+                    return next_coord
+        return self.reference_jump(jps, next_coord, direction, goal)
+
+    def test_matches_reference_jump(self):
+        rng = random.Random(7)
+        directions = [Coord(x, y) for x in (-1, 0, 1) for y in (-1, 0, 1) if x != 0 or y != 0]
+        for _ in range(5):
+            obstacles = [Coord(x, y) for x in range(12) for y in range(12) if rng.random() < 0.2]
+            jps = JumpPointSearch(DiagonalGrid(12, 12, obstacles), diagonal)
+            for _ in range(200):
+                parent = Coord(rng.randrange(12), rng.randrange(12))
+                goal = Coord(rng.randrange(12), rng.randrange(12))
+                direction = rng.choice(directions)
+                self.assertEqual(self.reference_jump(jps, parent, direction, goal),
+                                 jps.jump(parent, direction, goal))
+
+    def test_open_grid_without_recursion_limit(self):
+        size = 5000
+        jps = JumpPointSearch(DiagonalGrid(size, size, []), diagonal)
+        goal = Coord(size - 1, size - 1)
+        self.assertEqual(goal, jps.jump(Coord(0, 0), Coord(1, 1), goal))
+        self.assertIsNone(jps.jump(Coord(0, 0), Coord(1, 0), goal))
+
+
 class ForcedNeighborTest(unittest.TestCase):
     def setUp(self):
         self.grid = DiagonalGrid(4, 4, [])
@@ -132,6 +171,143 @@ class JumpPointSearchTest(unittest.TestCase):
         path = obstacle_jps.execute((Coord(0, 0), Coord(9, 9)))
 
 
+class OptimalPathTest(unittest.TestCase):
+    def test_paths_are_shortest(self):
+        rng = random.Random(5)
+        for _ in range(100):
+            size = rng.randrange(5, 20)
+            obstacles = [Coord(x, y) for x in range(size) for y in range(size) if rng.random() < 0.25]
+            grid = DiagonalGrid(size, size, obstacles)
+            start, goal = Coord(rng.randrange(size), rng.randrange(size)), Coord(rng.randrange(size), rng.randrange(size))
+            if grid.is_obstacle(start) or grid.is_obstacle(goal):
+                continue
+            jps = JumpPointSearch(grid, diagonal_tie_breaker)
+            path = jps.connect_path(jps.execute((start, goal)))
+            expected = breadth_first_distance(grid, start, goal)
+            self.assertEqual(expected, len(path) - 1 if len(path) > 0 else None)
+
+    def test_unreachable_goal(self):
+        walled_grid = DiagonalGrid(4, 4, [Coord(2, 0), Coord(2, 1), Coord(2, 2), Coord(2, 3)])
+        jps = JumpPointSearch(walled_grid, diagonal)
+        self.assertEqual([], jps.execute((Coord(0, 0), Coord(3, 3))))
+
+
+class ExecuteManyTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(8)
+        obstacles = [Coord(x, y) for x in range(12) for y in range(12) if rng.random() < 0.2]
+        self.jps = JumpPointSearch(DiagonalGrid(12, 12, obstacles), diagonal_tie_breaker)
+        self.pairs = [(Coord(rng.randrange(12), rng.randrange(12)), Coord(rng.randrange(12), rng.randrange(12)))
+                      for _ in range(20)]
+
+    def test_sequential(self):
+        expected = [self.jps.execute(pair) for pair in self.pairs]
+        self.assertEqual(expected, list(self.jps.execute_many(self.pairs)))
+
+    def test_process_pool(self):
+        expected = [self.jps.execute(pair) for pair in self.pairs]
+        self.assertEqual(expected, list(self.jps.execute_many(self.pairs, workers=2, chunksize=4)))
+
+
+class BudgetedSearchTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(13)
+        obstacles = [Coord(x, y) for x in range(30) for y in range(30) if rng.random() < 0.3]
+        self.grid = DiagonalGrid(30, 30, obstacles)
+        self.jps = JumpPointSearch(self.grid, diagonal_tie_breaker)
+        self.pairs = []
+        while len(self.pairs) < 10:
+            start, goal = Coord(rng.randrange(30), rng.randrange(30)), Coord(rng.randrange(30), rng.randrange(30))
+            if not self.grid.is_obstacle(start) and not self.grid.is_obstacle(goal):
+                self.pairs.append((start, goal))
+
+    def test_resumed_search_matches_execute(self):
+        for pair in self.pairs:
+            handle = self.jps.execute_budgeted(pair, max_expansions=3)
+            while not handle.done:
+                self.assertTrue(len(self.jps.partial_path(handle)) > 0)
+                self.jps.execute(self.pairs[0])
+                self.jps.resume(handle, max_expansions=3)
+            self.assertEqual(self.jps.connect_path(self.jps.execute(pair)),
+                             self.jps.connect_path(handle.result))
+
+    def test_expansion_budget(self):
+        handle = self.jps.execute_budgeted(self.pairs[1], max_expansions=0)
+        self.assertFalse(handle.done)
+        self.assertEqual(0, handle.expansions)
+        self.assertEqual([], self.jps.partial_path(handle))
+
+    def test_deadline(self):
+        grid = DiagonalGrid(200, 200, [Coord(100, y) for y in range(199)])
+        handle = JumpPointSearch(grid, diagonal).execute_budgeted((Coord(0, 0), Coord(199, 0)), deadline=0.0)
+        self.assertFalse(handle.done)
+        self.assertEqual(0, handle.expansions)
+
+    def test_grid_change_restarts(self):
+        start, goal = Coord(0, 0), Coord(5, 0)
+        grid = DiagonalGrid(6, 6, [])
+        jps = JumpPointSearch(grid, diagonal)
+        handle = jps.execute_budgeted((start, goal))
+        self.assertTrue(handle.done)
+        grid.insert_obstacle(Coord(3, 0))
+        jps.resume(handle)
+        self.assertEqual(1, handle.restarts)
+        self.assertFalse(Coord(3, 0) in jps.connect_path(handle.result))
+
+
+class BidirectionalSearchTest(unittest.TestCase):
+    def assert_walkable(self, grid, path):
+        for begin, end in zip(path, path[1:]):
+            self.assertEqual(1, max(abs(end.x - begin.x), abs(end.y - begin.y)))
+            self.assertFalse(grid.is_obstacle(end))
+
+    def test_paths_are_shortest(self):
+        rng = random.Random(21)
+        for _ in range(150):
+            size = rng.randrange(5, 25)
+            obstacles = [Coord(x, y) for x in range(size) for y in range(size) if rng.random() < 0.3]
+            grid = DiagonalGrid(size, size, obstacles)
+            start, goal = Coord(rng.randrange(size), rng.randrange(size)), Coord(rng.randrange(size), rng.randrange(size))
+            if grid.is_obstacle(start) or grid.is_obstacle(goal):
+                continue
+            jps = JumpPointSearch(grid, diagonal_tie_breaker, bidirectional=True)
+            result = jps.execute((start, goal))
+            path = jps.connect_path(result)
+            expected = breadth_first_distance(grid, start, goal)
+            self.assertEqual(expected, len(path) - 1 if len(path) > 0 else None)
+            if len(path) > 0:
+                self.assertEqual((start, goal), (path[0], path[-1]))
+                self.assertEqual(expected, result[-1].g)
+                self.assert_walkable(grid, path)
+
+    def test_unreachable_goal_found_from_smaller_side(self):
+        walls = [Coord(x, 36) for x in range(35, 40)] + [Coord(x, 40) for x in range(35, 40)] + \
+                [Coord(35, y) for y in range(36, 41)] + [Coord(39, y) for y in range(36, 41)]
+        grid = DiagonalGrid(40, 40, walls)
+        jps = JumpPointSearch(grid, diagonal, bidirectional=True)
+        self.assertEqual([], jps.execute((Coord(0, 0), Coord(37, 38))))
+        self.assertTrue(jps.nodes_expanded < 10)
+        unidirectional = JumpPointSearch(grid, diagonal)
+        unidirectional.execute((Coord(0, 0), Coord(37, 38)))
+        self.assertTrue(jps.nodes_expanded < unidirectional.nodes_expanded)
+
+    def test_trivial_queries(self):
+        jps = JumpPointSearch(DiagonalGrid(5, 5, []), diagonal, bidirectional=True)
+        self.assertEqual([JPSNode(Coord(2, 2), None, 0, 0)], jps.execute((Coord(2, 2), Coord(2, 2))))
+        path = jps.connect_path(jps.execute((Coord(0, 0), Coord(3, 2))))
+        self.assertEqual(4, len(path))
+        self.assertEqual((Coord(0, 0), Coord(3, 2)), (path[0], path[-1]))
+
+    def test_process_pool(self):
+        rng = random.Random(8)
+        obstacles = [Coord(x, y) for x in range(12) for y in range(12) if rng.random() < 0.2]
+        jps = JumpPointSearch(DiagonalGrid(12, 12, obstacles), diagonal_tie_breaker, bidirectional=True)
+        pairs = [(Coord(rng.randrange(12), rng.randrange(12)), Coord(rng.randrange(12), rng.randrange(12)))
+                 for _ in range(10)]
+        expected = [jps.execute(pair) for pair in pairs]
+        self.assertEqual(expected, list(jps.execute_many(pairs, workers=2, chunksize=4)))
+
+
 class SuccessorsTest(unittest.TestCase):
     def setUp(self):
         self.grid = DiagonalGrid(4, 4, [])
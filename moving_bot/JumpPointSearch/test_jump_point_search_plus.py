@@ -0,0 +1,66 @@
+import unittest
+import random
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from JumpPointSearch.jump_point_search_plus import JumpPointSearchPlus, DIRECTIONS
+from heuristics import diagonal
+
+
+"""
+File: test_jump_point_search_plus.py
+Author: Nathan Robertson
+Purpose: Test that the precomputed JPS+ tables give the same jump points and paths as the online search.
+"""
+
+
+def random_grid(rng, size, obstacle_prob):
+    obstacles = [Coord(x, y) for x in range(size) for y in range(size) if rng.random() < obstacle_prob]
+    return DiagonalGrid(size, size, obstacles)
+
+
+class JumpTableTest(unittest.TestCase):
+    def test_open_grid_tables(self):
+        jps = JumpPointSearchPlus(DiagonalGrid(4, 4, []), diagonal)
+        self.assertEqual(-3, jps.tables[(1, 0)][0])
+        self.assertEqual(-3, jps.tables[(1, 1)][0])
+        self.assertEqual(0, jps.tables[(-1, 0)][0])
+        self.assertEqual(8 * 16 * 4, jps.table_bytes())
+
+    def test_forced_neighbor_table(self):
+        jps = JumpPointSearchPlus(DiagonalGrid(4, 4, [Coord(1, 2)]), diagonal)
+        self.assertEqual(2, jps.tables[(0, 1)][0])
+
+
+class JumpPointSearchPlusTest(unittest.TestCase):
+    def test_jumps_match_online_search(self):
+        rng = random.Random(3)
+        directions = [Coord(x, y) for x, y in DIRECTIONS]
+        for _ in range(5):
+            grid = random_grid(rng, 15, 0.2)
+            online = JumpPointSearch(grid, diagonal)
+            plus = JumpPointSearchPlus(grid, diagonal)
+            for _ in range(300):
+                parent = Coord(rng.randrange(15), rng.randrange(15))
+                goal = Coord(rng.randrange(15), rng.randrange(15))
+                direction = rng.choice(directions)
+                self.assertEqual(online.jump(parent, direction, goal), plus.jump(parent, direction, goal))
+
+    def test_execute_matches_online_search(self):
+        rng = random.Random(11)
+        grid = random_grid(rng, 20, 0.15)
+        online = JumpPointSearch(grid, diagonal)
+        plus = JumpPointSearchPlus(grid, diagonal)
+        for _ in range(50):
+            endpoints = (Coord(rng.randrange(20), rng.randrange(20)), Coord(rng.randrange(20), rng.randrange(20)))
+            self.assertEqual(online.connect_path(online.execute(endpoints)), plus.connect_path(plus.execute(endpoints)))
+
+    def test_bidirectional_matches_online_search(self):
+        rng = random.Random(17)
+        grid = random_grid(rng, 20, 0.25)
+        online = JumpPointSearch(grid, diagonal)
+        plus = JumpPointSearchPlus(grid, diagonal, bidirectional=True)
+        for _ in range(50):
+            endpoints = (Coord(rng.randrange(20), rng.randrange(20)), Coord(rng.randrange(20), rng.randrange(20)))
+            expected = online.connect_path(online.execute(endpoints))
+            self.assertEqual(len(expected), len(plus.connect_path(plus.execute(endpoints))))
@@ -0,0 +1,201 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+from Coordinate.coord import Coord
+from FlowField.nearest_target import NearestTargets
+from Reachability.component_index import ComponentIndex
+
+"""
+File: landmark_heuristic.py
+Author: Nathan Robertson
+Purpose:
+    ALT heuristic (A*, Landmarks, Triangle inequality; Goldberg and Harrelson 2005). The functions in heuristics.py
+    ignore obstacles, so in mazes and rooms the search expands most of the map before the walls let it through.
+    A few landmark cells are picked once per grid and the exact number of moves from every cell to each of them is
+    stored (a breadth first search over flat arrays per landmark, linear in the cells even in a maze where the
+    vectorised wavefront of FlowField needs thousands of waves). For any landmark L the triangle inequality gives
+        moves(n, goal) >= |moves(L, goal) - moves(L, n)|
+    and the heuristic is the largest of these bounds and the diagonal distance divided by the longest move of the
+    grid, rounded up (1 on most grids, more on a RadiusGrid). It is admissible and consistent, so JumpPointSearch
+    and AStar still return shortest paths.
+    tie_breaker=True scales the bound by 1.001 like diagonal_tie_breaker, which breaks ties towards the goal but
+    overestimates once the route is longer than 1000 moves (maze routes on large maps are): paths may then be a
+    little longer than the shortest, so it is off by default.
+
+Landmarks
+    farthest: The cell furthest from a cell of the largest component, then repeatedly the cell furthest from every
+              landmark so far. Landmarks end up in dead ends and corners, behind the walls a search runs into.
+    corners: The free cells of the largest component closest to the corners of the map, then the middles of its
+             edges (at most 8). The tables do not depend on each other and can be computed by worker processes.
+    Or pass the landmark cells yourself.
+
+Keeping up with the grid
+    New obstacles only make routes longer, so bounds from the tables stay admissible when cells are blocked (robots
+    standing around). Freeing a cell which was blocked when the tables were built can make routes shorter: the
+    heuristic falls back to the diagonal distance bound until build is called again.
+
+    Use it as the heuristic_fn of JumpPointSearch or AStar: LandmarkHeuristic(grid) is called like the functions in
+    heuristics.py, and xy_heuristic lets the integer search cores evaluate it without building Coords.
+"""
+
+
+__all__ = ["LandmarkHeuristic", "select_landmarks", "landmark_table", "METHODS"]
+
+METHODS = ('farthest', 'corners')
+TIE_BREAKER = 1.0 + 1 / 1000
+
+
+def landmark_table(grid, landmark: Coord) -> array:
+    """
+    :return: Moves from landmark to every cell indexed by cell id, -1 where it cannot reach.
+    """
+    nearest = NearestTargets(grid, [landmark])
+    nearest.build()
+    nearest.detach()
+    return nearest.distance
+
+
+def select_landmarks(grid, count: int, method: str = 'farthest') -> (list, list):
+    """
+    :param count: Number of landmarks, at most 8 for corners.
+    :param method: One of METHODS.
+    :return: Landmark Coords and, for farthest, their tables (computed while choosing them), else None.
+    """
+    if method not in METHODS:
+        raise ValueError("Unknown landmark method {!r}, expected one of {}".format(method, METHODS))
+    index = ComponentIndex(grid)
+    index.detach()
+    if not index.sizes:
+        return [], []
+    largest = max(index.sizes, key=index.sizes.get)
+    member = (np.asarray(index.labels) == largest).reshape(grid.ysize, grid.xsize)
+    if method == 'corners':
+        if count > 8:
+            raise ValueError("corners places at most 8 landmarks, got {}".format(count))
+        return _corner_landmarks(member, count), None
+    ys, xs = np.nonzero(member)
+    shape = member.shape
+    spread = np.asarray(landmark_table(grid, Coord(int(xs[0]), int(ys[0])))).reshape(shape)
+    landmarks, tables = [], []
+    for _ in range(count):
+        y, x = np.unravel_index(np.argmax(np.where(member, spread, -1)), shape)
+        if landmarks and spread[y, x] <= 0:
+            break
+        landmark = Coord(int(x), int(y))
+        table = landmark_table(grid, landmark)
+        landmarks.append(landmark)
+        tables.append(table)
+        field = np.asarray(table).reshape(shape)
+        spread = field if len(tables) == 1 else np.minimum(spread, field)
+    return landmarks, tables
+
+
+def _corner_landmarks(member: np.ndarray, count: int) -> list:
+    ysize, xsize = member.shape
+    ys, xs = np.nonzero(member)
+    anchors = [(0, 0), (xsize - 1, ysize - 1), (xsize - 1, 0), (0, ysize - 1),
+               (xsize // 2, 0), (xsize // 2, ysize - 1), (0, ysize // 2), (xsize - 1, ysize // 2)]
+    landmarks = []
+    for anchor_x, anchor_y in anchors[:count]:
+        closest = np.argmin((xs - anchor_x) ** 2 + (ys - anchor_y) ** 2)
+        landmark = Coord(int(xs[closest]), int(ys[closest]))
+        if landmark not in landmarks:
+            landmarks.append(landmark)
+    return landmarks
+
+
+class LandmarkHeuristic:
+    def __init__(self, grid, count: int = 8, method: str = 'farthest', landmarks: list = None, workers: int = 1,
+                 tie_breaker: bool = False):
+        """
+        :param grid: Any UniformGrid, distances are counted in its moves (NEIGHBOR_OFFSETS).
+        :param count: Number of landmarks to pick, ignored when landmarks is given.
+        :param method: How to pick them, one of METHODS.
+        :param landmarks: Landmark cells to use instead of picking them.
+        :param workers: Processes computing the tables of given or corner landmarks.
+        :param tie_breaker: Scale the bound by 1.001 like diagonal_tie_breaker, so ties go towards the goal. Not
+                            admissible for routes over 1000 moves, see above.
+        """
+        self.grid = grid
+        self.count = count
+        self.method = method
+        self.chosen = None if landmarks is None else list(landmarks)
+        self.workers = workers
+        self.factor = TIE_BREAKER if tie_breaker else 1
+        self.step = max(max(abs(dx), abs(dy)) for dx, dy in grid.NEIGHBOR_OFFSETS)
+        self.landmarks = []
+        self.tables = []
+        self.stale = False
+        self.build_rows = None
+        grid.subscribe(self._changed)
+        self.build()
+
+    def detach(self) -> None:
+        """
+        Stop listening to obstacle changes on the grid.
+        """
+        self.grid.unsubscribe(self._changed)
+
+    def build(self) -> None:
+        """
+        Picks the landmarks (unless they were given) and computes their distance tables.
+        """
+        grid = self.grid
+        tables = None
+        if self.chosen is None:
+            landmarks, tables = select_landmarks(grid, self.count, self.method)
+        else:
+            landmarks = [landmark for landmark in self.chosen
+                         if grid.is_valid_coord(landmark) and not grid.is_obstacle(landmark)]
+        if tables is None:
+            tables = self._tables(landmarks)
+        self.landmarks = landmarks
+        self.tables = tables
+        self.build_rows = list(grid.bitboard.rows)
+        self.stale = False
+
+    def _tables(self, landmarks: list) -> list:
+        if self.workers <= 1 or len(landmarks) <= 1:
+            return [landmark_table(self.grid, landmark) for landmark in landmarks]
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(landmarks))) as executor:
+            return list(executor.map(landmark_table, repeat(self.grid), landmarks))
+
+    def table_bytes(self) -> int:
+        """
+        :return: Memory used by the distance tables in bytes.
+        """
+        return sum(len(table) * table.itemsize for table in self.tables)
+
+    def _changed(self, coord: Coord, blocked: bool) -> None:
+        if not blocked and (self.build_rows[coord.y] >> coord.x) & 1:
+            self.stale = True
+
+    def __call__(self, coord1: Coord, coord2: Coord) -> float:
+        return self.xy_heuristic(coord2)(coord1.x, coord1.y)
+
+    def xy_heuristic(self, goal: Coord):
+        """
+        :return: A function of (x, y) equal to the heuristic from (x, y) to goal.
+        """
+        goal_x, goal_y = goal.x, goal.y
+        xsize = self.grid.xsize
+        factor, step = self.factor, self.step
+        if self.stale or not self.grid.is_valid_coord(goal):
+            return lambda x, y: -(-max(abs(x - goal_x), abs(y - goal_y)) // step) * factor
+        goal_id = goal_y * xsize + goal_x
+        # Landmarks which cannot reach the goal bound nothing. A cell a landmark cannot reach (-1) while it reaches
+        # the goal cannot reach the goal either, so its junk bound is never used on a path.
+        pairs = tuple((table, table[goal_id]) for table in self.tables if table[goal_id] >= 0)
+
+        def heuristic(x, y):
+            cell = y * xsize + x
+            best = -(-max(abs(x - goal_x), abs(y - goal_y)) // step)
+            for table, to_goal in pairs:
+                bound = table[cell] - to_goal
+                if bound < 0:
+                    bound = -bound
+                if bound > best:
+                    best = bound
+            return best * factor
+        return heuristic
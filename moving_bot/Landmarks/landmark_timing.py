@@ -0,0 +1,78 @@
+from AStar.astar import AStar
+from Benchmark.benchmark import make_queries, percentile
+from Benchmark.map_generators import noise_map, rooms_map, maze_map
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from Landmarks.landmark_heuristic import LandmarkHeuristic
+from time import perf_counter
+import sys
+
+"""
+File: landmark_timing.py
+Author: Nathan Robertson
+Purpose:
+    The landmark (ALT) heuristic against diagonal_tie_breaker for JumpPointSearch and AStar on open, noisy, room
+    and maze maps: mean nodes expanded and p50 / p95 latency over the same queries, and a check that both return
+    paths of the same length. The landmark heuristic runs with its default tie_breaker=False, so on open maps, where
+    many routes cost the same, it expands more nodes than diagonal_tie_breaker.
+    The build line times picking 8 landmarks and their tables: farthest point, corners, and corners with the
+    fields computed by 4 worker processes.
+
+    Run from the moving_bot directory with: python -m Landmarks.landmark_timing [sizes...]
+"""
+
+
+sizes = [64, 128, 256]
+landmarks = 8
+maps = {
+    'open': lambda size: noise_map(size, 0, density=0.0),
+    'noise': lambda size: noise_map(size, 0, density=0.2),
+    'rooms': lambda size: rooms_map(size, 0),
+    'maze': lambda size: maze_map(size, 0),
+}
+
+
+def measure(search, queries: list, connect: bool) -> (list, list, list):
+    times, expanded, lengths = [], [], []
+    for endpoints in queries:
+        began = perf_counter()
+        result = search.execute(endpoints)
+        times.append(perf_counter() - began)
+        expanded.append(search.nodes_expanded)
+        lengths.append(len(search.connect_path(result) if connect else result))
+    return times, expanded, lengths
+
+
+def print_row(name: str, times: list, expanded: list) -> None:
+    print("  {:<10} expanded {:9.1f}  p50 {:8.3f} ms  p95 {:8.3f} ms".format(
+        name, sum(expanded) / len(expanded), percentile(times, 0.5) * 1000, percentile(times, 0.95) * 1000))
+
+
+def time_build(grid) -> None:
+    times = []
+    for method, workers in (('farthest', 1), ('corners', 1), ('corners', 4)):
+        began = perf_counter()
+        LandmarkHeuristic(grid, landmarks, method, workers=workers).detach()
+        times.append(perf_counter() - began)
+    print("  build: farthest {:.1f} ms, corners {:.1f} ms, corners with 4 workers {:.1f} ms".format(
+        *(value * 1000 for value in times)))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sizes = [int(size) for size in sys.argv[1:]]
+    for size in sizes:
+        for name, generator in maps.items():
+            grid = generator(size)
+            alt = LandmarkHeuristic(grid, landmarks)
+            queries = make_queries(grid, 5, 10, 0)
+            print("{} {}x{}".format(name, size, size))
+            for search_name, search_class, connect in (('jps', JumpPointSearch, True), ('astar', AStar, False)):
+                plain = measure(search_class(grid, diagonal_tie_breaker), queries, connect)
+                landmark = measure(search_class(grid, alt), queries, connect)
+                print_row(search_name, plain[0], plain[1])
+                print_row(search_name + " alt", landmark[0], landmark[1])
+                if plain[2] != landmark[2]:
+                    print("  path lengths differ!")
+            alt.detach()
+        time_build(maps['maze'](size))
@@ -0,0 +1,120 @@
+import random
+import unittest
+from AStar.astar import AStar
+from Benchmark.map_generators import noise_map, maze_map
+from Coordinate.coord import Coord
+from FlowField.flow_field import obstacle_array, distance_field
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from Landmarks.landmark_heuristic import LandmarkHeuristic, select_landmarks
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+from UniformGrid.radius_grid import RadiusGrid
+from UniformGrid.uniform_grid import grid_from_rows
+
+
+"""
+File: test_landmark_heuristic.py
+Author: Nathan Robertson
+Purpose: Test that the landmark heuristic never overestimates (also with multi tile moves), changes by at most one per
+         move, and lets JumpPointSearch and AStar find paths as short as with diagonal_tie_breaker while expanding
+         fewer nodes.
+"""
+
+
+def free_cells(grid) -> list:
+    return [Coord(x, y) for y in range(grid.ysize) for x in range(grid.xsize) if not grid.is_obstacle(Coord(x, y))]
+
+
+class LandmarkHeuristicTest(unittest.TestCase):
+    def test_admissible_and_consistent(self):
+        radius_rows = list(noise_map(24, 6, density=0.3).bitboard.rows)
+        for grid in (noise_map(24, 1, density=0.3), noise_map(24, 2, density=0.3, grid_class=OrthogonalGrid),
+                     maze_map(21, 0), grid_from_rows(RadiusGrid, 24, 24, radius_rows, 8)):
+            heuristic = LandmarkHeuristic(grid, count=4)
+            blocked = obstacle_array(grid)
+            rng = random.Random(0)
+            free = free_cells(grid)
+            for goal in rng.sample(free, 5):
+                exact = distance_field(blocked, [goal], grid.NEIGHBOR_OFFSETS)
+                bound = heuristic.xy_heuristic(goal)
+                for cell in free:
+                    if exact[cell.y, cell.x] < 0:
+                        continue
+                    self.assertLessEqual(bound(cell.x, cell.y), exact[cell.y, cell.x])
+                    for neighbor in grid.neighbors(cell):
+                        self.assertLessEqual(abs(bound(cell.x, cell.y) - bound(neighbor.x, neighbor.y)), 1)
+
+    def test_radius_grid_counts_moves(self):
+        # Moves of up to 2 tiles each way: 15 moves from corner to corner where the diagonal distance is 29.
+        grid = RadiusGrid(30, 30, [], radius_squared=8)
+        heuristic = LandmarkHeuristic(grid, count=2)
+        self.assertEqual(15, heuristic(Coord(0, 0), Coord(29, 29)))
+        self.assertEqual(15, heuristic(Coord(0, 0), Coord(30, 30)))
+        heuristic.stale = True
+        self.assertEqual(15, heuristic(Coord(0, 0), Coord(29, 29)))
+
+    def test_exact_through_landmark(self):
+        # Wall at x = 3 with a gap at the bottom: 12 moves around it where the diagonal distance says 6.
+        grid = DiagonalGrid(7, 7, [Coord(3, y) for y in range(6)])
+        heuristic = LandmarkHeuristic(grid, landmarks=[Coord(0, 0)])
+        self.assertEqual([Coord(0, 0)], heuristic.landmarks)
+        self.assertEqual(12, heuristic(Coord(0, 0), Coord(6, 0)))
+        self.assertEqual(6, heuristic(Coord(0, 0), Coord(0, 6)))
+        tie_breaking = LandmarkHeuristic(grid, landmarks=[Coord(0, 0)], tie_breaker=True)
+        self.assertEqual(12 * 1.001, tie_breaking(Coord(0, 0), Coord(6, 0)))
+
+    def test_paths_as_short_with_fewer_expansions(self):
+        grid = maze_map(41, 3)
+        alt = LandmarkHeuristic(grid)
+        plain_jps, alt_jps = JumpPointSearch(grid, diagonal_tie_breaker), JumpPointSearch(grid, alt)
+        plain_astar, alt_astar = AStar(grid, diagonal_tie_breaker), AStar(grid, alt)
+        rng = random.Random(1)
+        free = free_cells(grid)
+        plain_expanded = alt_expanded = 0
+        for _ in range(10):
+            endpoints = (rng.choice(free), rng.choice(free))
+            self.assertEqual(len(plain_jps.connect_path(plain_jps.execute(endpoints))),
+                             len(alt_jps.connect_path(alt_jps.execute(endpoints))))
+            self.assertEqual(len(plain_astar.execute(endpoints)), len(alt_astar.execute(endpoints)))
+            plain_expanded += plain_jps.nodes_expanded + plain_astar.nodes_expanded
+            alt_expanded += alt_jps.nodes_expanded + alt_astar.nodes_expanded
+        self.assertLess(alt_expanded, plain_expanded)
+
+    def test_stale_only_when_original_obstacle_freed(self):
+        grid = noise_map(16, 4, density=0.3)
+        heuristic = LandmarkHeuristic(grid, count=2)
+        free = free_cells(grid)
+        grid.insert_obstacle(free[0])
+        grid.remove_obstacle(free[0])
+        self.assertFalse(heuristic.stale)
+        blocked = next(Coord(x, y) for y in range(16) for x in range(16) if grid.is_obstacle(Coord(x, y)))
+        grid.remove_obstacle(blocked)
+        self.assertTrue(heuristic.stale)
+        self.assertEqual(5, heuristic.xy_heuristic(Coord(5, 0))(0, 0))
+        heuristic.build()
+        self.assertFalse(heuristic.stale)
+        heuristic.detach()
+        grid.insert_obstacle(blocked)
+        grid.remove_obstacle(blocked)
+        self.assertFalse(heuristic.stale)
+
+    def test_landmark_methods(self):
+        grid = noise_map(20, 5, density=0.2)
+        farthest, fields = select_landmarks(grid, 4)
+        self.assertEqual(4, len(set(farthest)))
+        self.assertEqual(4, len(fields))
+        corners, _ = select_landmarks(grid, 4, 'corners')
+        for landmark in corners:
+            self.assertLessEqual(min(landmark.x, 19 - landmark.x), 3)
+            self.assertFalse(grid.is_obstacle(landmark))
+        self.assertRaises(ValueError, select_landmarks, grid, 4, 'random')
+        self.assertRaises(ValueError, select_landmarks, grid, 9, 'corners')
+        self.assertEqual(([], []), select_landmarks(DiagonalGrid(2, 1, [Coord(0, 0), Coord(1, 0)]), 3))
+
+    def test_parallel_tables_match(self):
+        grid = noise_map(20, 6, density=0.2)
+        serial = LandmarkHeuristic(grid, count=4, method='corners')
+        parallel = LandmarkHeuristic(grid, count=4, method='corners', workers=2)
+        self.assertEqual(serial.landmarks, parallel.landmarks)
+        self.assertEqual(serial.tables, parallel.tables)
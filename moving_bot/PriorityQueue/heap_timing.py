@@ -0,0 +1,80 @@
+from PriorityQueue.indexed_heap import IndexedHeap
+import heapq
+import timeit
+import random
+
+"""
+File: heap_timing.py
+Author: Nathan Robertson
+Purpose:
+    Micro-benchmark of the open list designs used by grid searches.
+    Both versions run Dijkstra on an 8-connected grid with random integer cell costs so there are plenty of
+    cheaper routes found for cells which are already open.
+    1. heapq plus set: the JPSHashHeap design. Duplicates are pushed and stale entries skipped when popped.
+    2. IndexedHeap: one entry per cell, decrease_key in place and an O(1) closed check.
+
+    Run from the moving_bot directory with: python -m PriorityQueue.heap_timing
+"""
+
+
+OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, 1), (-1, 1), (1, -1))
+
+
+def make_costs(size: int) -> list:
+    return [random.randint(1, 9) for _ in range(size * size)]
+
+
+def neighbor_ids(size: int) -> list:
+    neighbors = []
+    for y in range(size):
+        for x in range(size):
+            neighbors.append([(y + dy) * size + x + dx for dx, dy in OFFSETS
+                              if 0 <= x + dx < size and 0 <= y + dy < size])
+    return neighbors
+
+
+def heapq_dijkstra(neighbors: list, costs: list, source: int) -> list:
+    distance = [None] * len(costs)
+    closed = set()
+    open_list = [(0, source)]
+    while open_list:
+        g, cell = heapq.heappop(open_list)
+        if cell in closed:
+            continue
+        closed.add(cell)
+        distance[cell] = g
+        for neighbor in neighbors[cell]:
+            if neighbor not in closed:
+                heapq.heappush(open_list, (g + costs[neighbor], neighbor))
+    return distance
+
+
+def indexed_dijkstra(heap: IndexedHeap, neighbors: list, costs: list, source: int) -> list:
+    distance = [None] * len(costs)
+    heap.clear()
+    heap.push(source, 0, 0)
+    g_values = heap.g
+    while len(heap) > 0:
+        cell = heap.pop()
+        g = g_values[cell]
+        distance[cell] = int(g)
+        for neighbor in neighbors[cell]:
+            next_g = g + costs[neighbor]
+            heap.push_or_decrease(neighbor, next_g, next_g)
+    return distance
+
+
+sizes = [32, 64, 128, 256]
+
+if __name__ == "__main__":
+    random.seed(0)
+    for size in sizes:
+        costs = make_costs(size)
+        neighbors = neighbor_ids(size)
+        heap = IndexedHeap(size * size)
+        assert heapq_dijkstra(neighbors, costs, 0) == indexed_dijkstra(heap, neighbors, costs, 0)
+        print("Grid " + str(size) + "x" + str(size) + ":")
+        print("heapq plus set (s): ")
+        print(timeit.timeit(lambda: heapq_dijkstra(neighbors, costs, 0), number=3) / 3)
+        print("IndexedHeap (s): ")
+        print(timeit.timeit(lambda: indexed_dijkstra(heap, neighbors, costs, 0), number=3) / 3)
@@ -0,0 +1,153 @@
+from array import array
+
+"""
+File: indexed_heap.py
+Author: Nathan Robertson
+Purpose:
+    An indexed binary min heap for grid searches. Items are integer cell ids in the range [0, capacity).
+    The f and g value of every cell are kept in flat arrays next to a position array which records where each
+    cell sits in the heap, so membership checks, closed checks and decrease_key are all O(1) lookups followed by
+    at most one sift.
+    Clearing only resets the cells touched since the last clear, so one heap can be reused for every search on
+    the same grid without paying for the whole grid each time.
+"""
+
+
+__all__ = ["IndexedHeap", "UNSEEN", "CLOSED"]
+
+UNSEEN = -1
+CLOSED = -2
+
+
+class IndexedHeap:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.heap = []
+        self.position = array('i', [UNSEEN]) * capacity
+        self.f = array('d', [0.0]) * capacity
+        self.g = array('d', [0.0]) * capacity
+        self.touched = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, cell: int) -> bool:
+        """
+        :return: If cell is currently in the open list.
+        """
+        return self.position[cell] >= 0
+
+    def is_closed(self, cell: int) -> bool:
+        return self.position[cell] == CLOSED
+
+    def is_seen(self, cell: int) -> bool:
+        """
+        :return: If cell has been pushed since the last clear (whether it is still open or already closed).
+        """
+        return self.position[cell] != UNSEEN
+
+    def top(self):
+        if len(self.heap) > 0:
+            return self.heap[0]
+        return None
+
+    def push(self, cell: int, f: float, g: float) -> None:
+        """
+        Add a cell which is not in the heap yet.
+        """
+        if self.position[cell] == UNSEEN:
+            self.touched.append(cell)
+        self.f[cell] = f
+        self.g[cell] = g
+        self.heap.append(cell)
+        self._sift_up(len(self.heap) - 1)
+
+    def decrease_key(self, cell: int, f: float, g: float) -> None:
+        """
+        Lower the f and g value of a cell already in the open list.
+        """
+        self.f[cell] = f
+        self.g[cell] = g
+        self._sift_up(self.position[cell])
+
+    def push_or_decrease(self, cell: int, f: float, g: float) -> bool:
+        """
+        Push a cell seen for the first time or lower its cost if g is cheaper than the route found before.
+        Closed cells are never reopened.
+        :return: True if the cell was added or updated.
+        """
+        position = self.position[cell]
+        if position == UNSEEN:
+            self.push(cell, f, g)
+            return True
+        if position >= 0 and g < self.g[cell]:
+            self.decrease_key(cell, f, g)
+            return True
+        return False
+
+    def pop(self):
+        """
+        Remove the cell with the lowest f value and mark it closed.
+        :return: The removed cell or None if the heap is empty.
+        """
+        heap = self.heap
+        if len(heap) == 0:
+            return None
+        cell = heap[0]
+        last = heap.pop()
+        if len(heap) > 0:
+            heap[0] = last
+            self._sift_down(0)
+        self.position[cell] = CLOSED
+        return cell
+
+    def close(self, cell: int) -> None:
+        """
+        Mark a cell closed without it going through the heap (it must not be open).
+        """
+        if self.position[cell] == UNSEEN:
+            self.touched.append(cell)
+        self.position[cell] = CLOSED
+
+    def clear(self) -> None:
+        position = self.position
+        for cell in self.touched:
+            position[cell] = UNSEEN
+        self.touched = []
+        self.heap = []
+
+    def _sift_up(self, index: int) -> None:
+        heap, position, f = self.heap, self.position, self.f
+        cell = heap[index]
+        key = f[cell]
+        while index > 0:
+            parent = (index - 1) >> 1
+            parent_cell = heap[parent]
+            if key >= f[parent_cell]:
+                break
+            heap[index] = parent_cell
+            position[parent_cell] = index
+            index = parent
+        heap[index] = cell
+        position[cell] = index
+
+    def _sift_down(self, index: int) -> None:
+        heap, position, f = self.heap, self.position, self.f
+        size = len(heap)
+        cell = heap[index]
+        key = f[cell]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and f[heap[right]] < f[heap[child]]:
+                child = right
+            child_cell = heap[child]
+            if key <= f[child_cell]:
+                break
+            heap[index] = child_cell
+            position[child_cell] = index
+            index = child
+        heap[index] = cell
+        position[cell] = index
@@ -0,0 +1,58 @@
+import unittest
+import random
+from PriorityQueue.indexed_heap import IndexedHeap
+
+
+"""
+File: test_indexed_heap.py
+Author: Nathan Robertson
+Purpose: Test ordering, decrease_key and the open/closed bookkeeping of IndexedHeap.
+"""
+
+
+class IndexedHeapTest(unittest.TestCase):
+    def setUp(self):
+        self.heap = IndexedHeap(10)
+
+    def test_pop_order(self):
+        rng = random.Random(2)
+        priorities = {cell: rng.random() for cell in range(10)}
+        for cell, f in priorities.items():
+            self.heap.push(cell, f, 0)
+        popped = [self.heap.pop() for _ in range(10)]
+        self.assertEqual(sorted(priorities, key=priorities.get), popped)
+        self.assertIsNone(self.heap.pop())
+
+    def test_decrease_key(self):
+        self.heap.push(1, 5, 5)
+        self.heap.push(2, 3, 3)
+        self.heap.decrease_key(1, 1, 1)
+        self.assertEqual(1, self.heap.top())
+        self.assertEqual(1, self.heap.g[1])
+
+    def test_push_or_decrease(self):
+        self.assertTrue(self.heap.push_or_decrease(4, 6, 4))
+        self.assertFalse(self.heap.push_or_decrease(4, 7, 5))
+        self.assertTrue(self.heap.push_or_decrease(4, 5, 3))
+        self.assertEqual(1, len(self.heap))
+        self.heap.pop()
+        self.assertFalse(self.heap.push_or_decrease(4, 1, 0))
+
+    def test_open_and_closed(self):
+        self.heap.push(3, 1, 0)
+        self.assertTrue(3 in self.heap)
+        self.assertFalse(self.heap.is_closed(3))
+        self.heap.pop()
+        self.assertFalse(3 in self.heap)
+        self.assertTrue(self.heap.is_closed(3))
+        self.heap.close(7)
+        self.assertTrue(self.heap.is_closed(7))
+
+    def test_clear(self):
+        self.heap.push(3, 1, 0)
+        self.heap.push(5, 2, 0)
+        self.heap.pop()
+        self.heap.clear()
+        self.assertEqual(0, len(self.heap))
+        self.assertFalse(self.heap.is_seen(3))
+        self.assertFalse(self.heap.is_seen(5))
@@ -0,0 +1,328 @@
+from array import array
+from collections import deque
+from Coordinate.coord import Coord
+
+"""
+File: component_index.py
+Author: Nathan Robertson
+Purpose:
+    Connected component labels for every cell of a grid, so "can a unit at A ever reach B?" is one comparison of
+    two entries of a flat array instead of a search which drains the whole reachable area before it gives up.
+
+Building
+    Free cells are grouped into runs along each row with bit operations on the bitboard rows. Runs of neighboring
+    rows are joined with union-find when they touch (overlap, or overlap after widening by one cell on grids with
+    diagonal moves). Each run's label is then written into the label array as one slice.
+    Grids with longer moves (RadiusGrid) are labelled with a breadth first flood fill.
+
+Keeping up with the grid
+    The index subscribes to the grid and updates itself after every obstacle change without relabelling the map:
+    remove_obstacle: The freed cell joins its neighbors' components. When it connects several components the
+                     smaller ones are relabelled to the largest one's label.
+    insert_obstacle: The component can only split if the free neighbors of the blocked cell fall apart once the
+                     cell is gone. That is first checked among the neighbors themselves (a wall end or a cell in open
+                     space is answered right there). Otherwise a flood fill is started from one neighbor per group, the
+                     fills take turns expanding one cell at a time and join when they touch. A fill which runs out of
+                     cells has found a piece which broke off and gets a new label, so the work is bounded by the
+                     size of the pieces which broke off, not by the size of the map.
+    Call detach when the index is no longer needed.
+
+Labels
+    OBSTACLE (-1) for blocked cells, a component id >= 0 for free ones. Ids are not contiguous after updates.
+"""
+
+
+__all__ = ["ComponentIndex", "OBSTACLE"]
+
+OBSTACLE = -1
+
+
+class ComponentIndex:
+    def __init__(self, grid, labels=None, sizes=None):
+        """
+        :param grid: Any UniformGrid, its NEIGHBOR_OFFSETS decide which cells are connected.
+        :param labels: Labels built earlier for this grid as it is now (e.g. from a Snapshot), a writable sequence
+                       of ints indexed by cell id. Requires sizes.
+        :param sizes: Dict of label to number of cells that goes with labels.
+        """
+        self.grid = grid
+        self.offsets = tuple(grid.NEIGHBOR_OFFSETS)
+        self.splits_checked = 0
+        self.cells_visited = 0
+        if labels is None:
+            self.build()
+        else:
+            self.labels = labels
+            self.sizes = dict(sizes)
+            self.next_label = max(self.sizes, default=-1) + 1
+        self._listener = lambda coord, blocked: self._update(coord, blocked)
+        grid.subscribe(self._listener)
+
+    def detach(self) -> None:
+        """
+        Stop listening to obstacle changes on the grid.
+        """
+        self.grid.unsubscribe(self._listener)
+
+    def connected(self, start: Coord, goal: Coord) -> bool:
+        """
+        :return: If a path from start to goal exists, False when either is blocked or off the grid.
+        """
+        grid = self.grid
+        xsize, ysize = grid.xsize, grid.ysize
+        if not (0 <= start.x < xsize and 0 <= start.y < ysize and 0 <= goal.x < xsize and 0 <= goal.y < ysize):
+            return False
+        label = self.labels[start.y * xsize + start.x]
+        return label != OBSTACLE and label == self.labels[goal.y * xsize + goal.x]
+
+    def component(self, coord: Coord) -> int:
+        """
+        :return: Label of the component holding coord, OBSTACLE if it is blocked.
+        """
+        return self.labels[coord.y * self.grid.xsize + coord.x]
+
+    def component_size(self, coord: Coord) -> int:
+        """
+        :return: Number of cells reachable from coord (itself included), 0 if it is blocked.
+        """
+        return self.sizes.get(self.component(coord), 0)
+
+    def count(self) -> int:
+        """
+        :return: Number of components.
+        """
+        return len(self.sizes)
+
+    def build(self) -> None:
+        """
+        Labels every cell from scratch.
+        """
+        grid = self.grid
+        self.labels = array('l', [OBSTACLE]) * (grid.xsize * grid.ysize)
+        self.sizes = {}
+        self.next_label = 0
+        if all(max(abs(dx), abs(dy)) == 1 for dx, dy in self.offsets):
+            self._build_from_runs()
+        else:
+            self._build_by_flooding()
+
+    def _build_from_runs(self) -> None:
+        grid = self.grid
+        xsize = grid.xsize
+        full = (1 << xsize) - 1
+        reach = 1 if any(dx != 0 and dy != 0 for dx, dy in self.offsets) else 0
+        vertical = (0, 1) in self.offsets
+        runs = []
+        parent = []
+
+        def find(run):
+            while parent[run] != run:
+                parent[run] = parent[parent[run]]
+                run = parent[run]
+            return run
+
+        previous = []
+        for y, row in enumerate(grid.bitboard.rows):
+            current = []
+            free = ~row & full
+            while free:
+                start = (free & -free).bit_length() - 1
+                shifted = free >> start
+                length = (~shifted & (shifted + 1)).bit_length() - 1
+                free &= ~(((1 << length) - 1) << start)
+                run = len(runs)
+                runs.append((y, start, start + length))
+                parent.append(run)
+                current.append(run)
+            if vertical and previous:
+                above = 0
+                for run in current:
+                    _, start, end = runs[run]
+                    while above < len(previous) and runs[previous[above]][2] + reach <= start:
+                        above += 1
+                    index = above
+                    while index < len(previous) and runs[previous[index]][1] < end + reach:
+                        root, other = find(run), find(previous[index])
+                        if root != other:
+                            parent[other] = root
+                        index += 1
+            previous = current
+        labels, sizes = self.labels, self.sizes
+        roots = {}
+        for run, (y, start, end) in enumerate(runs):
+            root = find(run)
+            label = roots.get(root)
+            if label is None:
+                label = roots[root] = self._new_label()
+            labels[y * xsize + start:y * xsize + end] = array('l', [label]) * (end - start)
+            sizes[label] += end - start
+
+    def _build_by_flooding(self) -> None:
+        grid = self.grid
+        xsize = grid.xsize
+        rows = grid.bitboard.rows
+        labels = self.labels
+        for y in range(grid.ysize):
+            for x in range(xsize):
+                if labels[y * xsize + x] == OBSTACLE and not (rows[y] >> x) & 1:
+                    label = self._new_label()
+                    self.sizes[label] = self._relabel(y * xsize + x, label)
+
+    def _new_label(self) -> int:
+        label = self.next_label
+        self.next_label += 1
+        self.sizes[label] = 0
+        return label
+
+    def _free_neighbors(self, cell: int) -> list:
+        grid = self.grid
+        xsize, ysize = grid.xsize, grid.ysize
+        rows = grid.bitboard.rows
+        y, x = divmod(cell, xsize)
+        found = []
+        for dx, dy in self.offsets:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < xsize and 0 <= ny < ysize and not (rows[ny] >> nx) & 1:
+                found.append(ny * xsize + nx)
+        return found
+
+    def _relabel(self, cell: int, label: int) -> int:
+        """
+        Flood fills label over the free cells connected to cell which do not have it yet.
+        :return: Number of cells relabelled.
+        """
+        labels = self.labels
+        labels[cell] = label
+        frontier = [cell]
+        count = 1
+        while frontier:
+            current = frontier.pop()
+            for neighbor in self._free_neighbors(current):
+                if labels[neighbor] != label:
+                    labels[neighbor] = label
+                    frontier.append(neighbor)
+                    count += 1
+        self.cells_visited += count
+        return count
+
+    def _update(self, coord: Coord, blocked: bool) -> None:
+        cell = coord.y * self.grid.xsize + coord.x
+        if blocked:
+            self._block(cell)
+        else:
+            self._free(cell)
+
+    def _free(self, cell: int) -> None:
+        labels, sizes = self.labels, self.sizes
+        touching = {labels[neighbor] for neighbor in self._free_neighbors(cell)}
+        if len(touching) == 0:
+            label = self._new_label()
+            labels[cell] = label
+            sizes[label] = 1
+            return
+        largest = max(touching, key=lambda label: sizes[label])
+        labels[cell] = largest
+        sizes[largest] += 1
+        for neighbor in self._free_neighbors(cell):
+            label = labels[neighbor]
+            if label != largest:
+                sizes[largest] += sizes.pop(label)
+                self._relabel(neighbor, largest)
+
+    def _block(self, cell: int) -> None:
+        labels, sizes = self.labels, self.sizes
+        label = labels[cell]
+        labels[cell] = OBSTACLE
+        sizes[label] -= 1
+        if sizes[label] == 0:
+            del sizes[label]
+            return
+        groups = self._neighbor_groups(self._free_neighbors(cell))
+        if len(groups) > 1:
+            self.splits_checked += 1
+            self._separate([group[0] for group in groups], label)
+
+    def _neighbor_groups(self, neighbors: list) -> list:
+        """
+        :return: The neighbors split into groups which are connected to each other through neighbors only.
+        """
+        xsize, ysize = self.grid.xsize, self.grid.ysize
+        remaining = set(neighbors)
+        groups = []
+        while remaining:
+            group = [remaining.pop()]
+            index = 0
+            while index < len(group):
+                y, x = divmod(group[index], xsize)
+                for dx, dy in self.offsets:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < xsize and 0 <= ny < ysize:
+                        other = ny * xsize + nx
+                        if other in remaining:
+                            remaining.remove(other)
+                            group.append(other)
+                index += 1
+            groups.append(group)
+        return groups
+
+    def _separate(self, seeds: list, label: int) -> None:
+        """
+        Flood fills from every seed in turns, one cell each. Fills which touch join, a fill with nothing left to
+        expand is a piece which broke off and is relabelled. Stops once one fill is left.
+        """
+        owner = {}
+        fills = {}
+        for index, seed in enumerate(seeds):
+            if seed in owner:
+                continue
+            owner[seed] = index
+            fills[index] = (deque([seed]), {seed})
+        visited = 0
+        while len(fills) > 1:
+            for index in list(fills):
+                if index not in fills:
+                    continue
+                frontier, seen = fills[index]
+                if not frontier:
+                    del fills[index]
+                    if len(fills) > 0:
+                        self._split_off(seen, label)
+                    continue
+                current = frontier.popleft()
+                visited += 1
+                for neighbor in self._free_neighbors(current):
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = index
+                        seen.add(neighbor)
+                        frontier.append(neighbor)
+                    elif other != index and other in fills:
+                        index = self._join(fills, owner, index, other)
+                        frontier, seen = fills[index]
+                if len(fills) == 1:
+                    break
+        self.cells_visited += visited
+
+    @staticmethod
+    def _join(fills: dict, owner: dict, first: int, second: int) -> int:
+        """
+        Merges the smaller of two touching fills into the larger one.
+        :return: Index of the fill which is left.
+        """
+        if len(fills[first][1]) < len(fills[second][1]):
+            first, second = second, first
+        frontier, seen = fills[first]
+        other_frontier, other_seen = fills.pop(second)
+        for cell in other_seen:
+            owner[cell] = first
+        seen |= other_seen
+        frontier.extend(other_frontier)
+        return first
+
+    def _split_off(self, cells: set, label: int) -> None:
+        new_label = self._new_label()
+        labels = self.labels
+        for cell in cells:
+            labels[cell] = new_label
+        self.sizes[new_label] = len(cells)
+        self.sizes[label] -= len(cells)
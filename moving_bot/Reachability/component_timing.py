@@ -0,0 +1,87 @@
+from Benchmark.benchmark import percentile
+from Benchmark.map_generators import noise_map, rooms_map
+from Coordinate.coord import Coord
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from JumpPointSearch.jps_bidirectional_timing import boxed_goal_map
+from Reachability.component_index import ComponentIndex
+from time import perf_counter
+import random
+import sys
+
+"""
+File: component_timing.py
+Author: Nathan Robertson
+Purpose:
+    Cost and payoff of ComponentIndex on noise and room maps of growing size:
+    1. Build time for the whole map.
+    2. Mean time per incremental insert_obstacle / remove_obstacle (random free / blocked cells), next to the
+       build time each change would cost if the index were rebuilt instead.
+    3. Unreachable goals (a goal walled into a box, see jps_bidirectional_timing): p50 / p95 JumpPointSearch
+       latency without the index and with it.
+
+    Run from the moving_bot directory with: python -m Reachability.component_timing [sizes...]
+"""
+
+
+sizes = [64, 128, 256, 512]
+changes = 200
+maps = {
+    'noise': lambda size: noise_map(size, 0, density=0.2),
+    'rooms': lambda size: rooms_map(size, 0),
+}
+
+
+def time_build(grid) -> float:
+    began = perf_counter()
+    ComponentIndex(grid).detach()
+    return perf_counter() - began
+
+
+def time_changes(grid, seed: int = 0) -> (float, float, int):
+    """
+    :return: Mean seconds per insert, mean seconds per remove, number of split checks which needed flood fills.
+    """
+    rng = random.Random(seed)
+    index = ComponentIndex(grid)
+    free = [Coord(x, y) for y in range(grid.ysize) for x in range(grid.xsize) if not grid.is_obstacle(Coord(x, y))]
+    cells = rng.sample(free, changes)
+    began = perf_counter()
+    for coord in cells:
+        grid.insert_obstacle(coord)
+    inserted = perf_counter() - began
+    began = perf_counter()
+    for coord in cells:
+        grid.remove_obstacle(coord)
+    removed = perf_counter() - began
+    index.detach()
+    return inserted / changes, removed / changes, index.splits_checked
+
+
+def time_unreachable(size: int) -> None:
+    grid, goal = boxed_goal_map(size)
+    starts = [Coord(x, 0) for x in range(0, size, size // 8) if not grid.is_obstacle(Coord(x, 0))]
+    index = ComponentIndex(grid)
+    for name, jps in (("without index", JumpPointSearch(grid, diagonal_tie_breaker)),
+                      ("with index", JumpPointSearch(grid, diagonal_tie_breaker, reachability=index))):
+        times = []
+        for start in starts:
+            began = perf_counter()
+            jps.execute((start, goal))
+            times.append(perf_counter() - began)
+        print("  unreachable goal {:<14} p50 {:9.4f} ms  p95 {:9.4f} ms".format(
+            name, percentile(times, 0.5) * 1000, percentile(times, 0.95) * 1000))
+    index.detach()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sizes = [int(size) for size in sys.argv[1:]]
+    for size in sizes:
+        for name, generator in maps.items():
+            grid = generator(size)
+            build = time_build(grid)
+            insert, remove, splits = time_changes(grid)
+            print("{} {}x{}: build {:8.2f} ms, insert {:7.4f} ms, remove {:7.4f} ms ({} of {} inserts flood filled)"
+                  .format(name, size, size, build * 1000, insert * 1000, remove * 1000, splits, changes))
+        time_unreachable(size)
@@ -0,0 +1,145 @@
+import random
+import unittest
+from Benchmark.map_generators import noise_map
+from Coordinate.coord import Coord
+from FlowField.flow_field import obstacle_array, distance_field
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from Reachability.component_index import ComponentIndex, OBSTACLE
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+from UniformGrid.radius_grid import RadiusGrid
+from UniformGrid.uniform_grid import grid_from_rows
+
+
+"""
+File: test_component_index.py
+Author: Nathan Robertson
+Purpose: Test that component labels match a flood fill of the grid after building and after every obstacle change,
+         and that JumpPointSearch rejects goals in other components without searching.
+"""
+
+
+def same_partition(test: unittest.TestCase, grid, index: ComponentIndex) -> None:
+    """
+    Asserts that two free cells share a label exactly when a flood fill from one reaches the other.
+    """
+    blocked = obstacle_array(grid)
+    checked = set()
+    sizes = []
+    for y in range(grid.ysize):
+        for x in range(grid.xsize):
+            if blocked[y, x]:
+                test.assertEqual(OBSTACLE, index.component(Coord(x, y)))
+                continue
+            label = index.component(Coord(x, y))
+            if label in checked:
+                continue
+            checked.add(label)
+            reach = distance_field(blocked, [Coord(x, y)], grid.NEIGHBOR_OFFSETS) >= 0
+            cells = {(cx, cy) for cy in range(grid.ysize) for cx in range(grid.xsize)
+                     if index.component(Coord(cx, cy)) == label}
+            test.assertEqual({(cx, cy) for cy, cx in zip(*reach.nonzero())}, cells)
+            test.assertEqual(len(cells), index.component_size(Coord(x, y)))
+            sizes.append(len(cells))
+    test.assertEqual(len(sizes), index.count())
+
+
+class ComponentIndexTest(unittest.TestCase):
+    def test_build_matches_flood_fill(self):
+        rows = list(noise_map(24, 3, density=0.35).bitboard.rows)
+        for grid_class in (DiagonalGrid, OrthogonalGrid):
+            grid = grid_from_rows(grid_class, 24, 24, rows)
+            same_partition(self, grid, ComponentIndex(grid))
+
+    def test_diagonal_gap_connects(self):
+        grid = DiagonalGrid(3, 3, [Coord(1, 0), Coord(0, 1)])
+        index = ComponentIndex(grid)
+        self.assertTrue(index.connected(Coord(0, 0), Coord(2, 2)))
+        grid = OrthogonalGrid(3, 3, [Coord(1, 0), Coord(0, 1)])
+        index = ComponentIndex(grid)
+        self.assertFalse(index.connected(Coord(0, 0), Coord(2, 2)))
+        self.assertEqual(1, index.component_size(Coord(0, 0)))
+
+    def test_wall_splits_and_merges(self):
+        grid = DiagonalGrid(7, 5, [])
+        index = ComponentIndex(grid)
+        for y in range(4):
+            grid.insert_obstacle(Coord(3, y))
+        self.assertTrue(index.connected(Coord(0, 0), Coord(6, 0)))
+        grid.insert_obstacle(Coord(3, 4))
+        self.assertFalse(index.connected(Coord(0, 0), Coord(6, 0)))
+        self.assertEqual(2, index.count())
+        self.assertEqual(15, index.component_size(Coord(6, 4)))
+        grid.remove_obstacle(Coord(3, 2))
+        self.assertTrue(index.connected(Coord(0, 0), Coord(6, 0)))
+        self.assertEqual(1, index.count())
+
+    def test_blocked_and_outside_cells(self):
+        grid = DiagonalGrid(4, 4, [Coord(1, 1)])
+        index = ComponentIndex(grid)
+        self.assertFalse(index.connected(Coord(1, 1), Coord(1, 1)))
+        self.assertFalse(index.connected(Coord(0, 0), Coord(4, 0)))
+        self.assertEqual(0, index.component_size(Coord(1, 1)))
+
+    def test_random_changes(self):
+        rng = random.Random(7)
+        for grid in (DiagonalGrid(16, 12, []), OrthogonalGrid(16, 12, []), RadiusGrid(12, 10, [], 2)):
+            index = ComponentIndex(grid)
+            for step in range(300):
+                coord = Coord(rng.randrange(grid.xsize), rng.randrange(grid.ysize))
+                if grid.is_obstacle(coord):
+                    grid.remove_obstacle(coord)
+                else:
+                    grid.insert_obstacle(coord)
+                if step % 25 == 0:
+                    same_partition(self, grid, index)
+            same_partition(self, grid, index)
+
+    def test_narrow_grids(self):
+        grid = OrthogonalGrid(2, 2, [Coord(0, 0)])
+        index = ComponentIndex(grid)
+        grid.insert_obstacle(Coord(1, 1))
+        self.assertFalse(index.connected(Coord(1, 0), Coord(0, 1)))
+        same_partition(self, grid, index)
+        grid.remove_obstacle(Coord(0, 0))
+        same_partition(self, grid, index)
+        rng = random.Random(21)
+        for grid in (OrthogonalGrid(2, 6, []), DiagonalGrid(3, 5, []), RadiusGrid(4, 6, [], 4)):
+            index = ComponentIndex(grid)
+            for _ in range(200):
+                coord = Coord(rng.randrange(grid.xsize), rng.randrange(grid.ysize))
+                if grid.is_obstacle(coord):
+                    grid.remove_obstacle(coord)
+                else:
+                    grid.insert_obstacle(coord)
+                same_partition(self, grid, index)
+
+    def test_detach(self):
+        grid = DiagonalGrid(3, 1, [])
+        index = ComponentIndex(grid)
+        index.detach()
+        grid.insert_obstacle(Coord(1, 0))
+        self.assertTrue(index.connected(Coord(0, 0), Coord(2, 0)))
+
+
+class ReachabilityRejectionTest(unittest.TestCase):
+    def setUp(self):
+        # Goal walled into a box in the corner.
+        walls = [Coord(x, 6) for x in range(6, 10)] + [Coord(6, y) for y in range(7, 10)]
+        self.grid = DiagonalGrid(10, 10, walls)
+        self.index = ComponentIndex(self.grid)
+        self.start, self.goal = Coord(0, 0), Coord(8, 8)
+
+    def test_unreachable_goal_not_searched(self):
+        for bidirectional in (False, True):
+            jps = JumpPointSearch(self.grid, diagonal_tie_breaker, bidirectional, reachability=self.index)
+            self.assertEqual([], jps.execute((self.start, self.goal)))
+            self.assertEqual(0, jps.nodes_expanded)
+
+    def test_reachable_goal_after_opening(self):
+        jps = JumpPointSearch(self.grid, diagonal_tie_breaker, reachability=self.index)
+        self.grid.remove_obstacle(Coord(6, 6))
+        path = jps.connect_path(jps.execute((self.start, self.goal)))
+        self.assertEqual(self.start, path[0])
+        self.assertEqual(self.goal, path[-1])
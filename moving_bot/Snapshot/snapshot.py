@@ -0,0 +1,205 @@
+import mmap
+import pickle
+import struct
+import sys
+import numpy as np
+from JumpPointSearch.jump_point_search_plus import JumpPointSearchPlus, DIRECTIONS
+from Reachability.component_index import ComponentIndex
+
+"""
+File: snapshot.py
+Author: Nathan Robertson
+Purpose:
+    Binary snapshots of a grid and the tables derived from it, so a map replayed thousands of times (tuning runs,
+    benchmarks) is set up once and then opened instead of rebuilt.
+    Opening maps the file into memory (mmap) and the tables are handed out as memoryview / NumPy views of the
+    mapping: nothing is read or copied until it is used, and worker processes opening the same file share its pages.
+    The mapping is copy on write, so searchers may still change what they were given (e.g. ComponentIndex keeps
+    its labels up to date) without touching the file.
+
+Layout (little endian, every section starts on an 8 byte boundary)
+    Header: magic b'MBSN', format version (u16), number of sections (u16), xsize (u32), ysize (u32).
+    Section table: one entry per section, name (24 bytes, ascii), typecode (1 byte + 7 padding), offset (u64)
+                   and length in bytes (u64).
+    Sections:
+        grid: Pickled (grid class, extra constructor arguments) from the grid's __reduce__ (radius, costs).
+        obstacles: The obstacle bitmap, one row of (xsize + 7) // 8 bytes per y, bit x % 8 of byte x // 8 set on
+                   an obstacle (the packing obstacle_array unpacks).
+        jump dx,dy: JPS+ table of one direction, int32 per cell.
+        field <name>: A distance field, int32 per cell.
+        labels / sizes: ComponentIndex labels (int32 per cell) and (label, size) int32 pairs.
+    Cells are indexed y * xsize + x throughout.
+
+    The grid section is unpickled, only open snapshots written by this module. A file written with another
+    FORMAT_VERSION raises ValueError rather than being misread, rebuild it.
+"""
+
+
+__all__ = ["save_snapshot", "Snapshot", "FORMAT_VERSION"]
+
+MAGIC = b'MBSN'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+SECTION = struct.Struct('<24sc7xQQ')
+ALIGNMENT = 8
+
+
+def save_snapshot(path: str, grid, jump_tables: dict = None, distance_fields: dict = None,
+                  components: ComponentIndex = None) -> int:
+    """
+    :param grid: Any UniformGrid.
+    :param jump_tables: The tables of a JumpPointSearchPlus built for the grid as it is now.
+    :param distance_fields: Name (at most 18 ascii characters) to array-like of xsize * ysize ints, flat or shaped
+                            (ysize, xsize) like FlowField distances.
+    :param components: A ComponentIndex of the grid.
+    :return: Size of the file written in bytes.
+    """
+    if sys.byteorder != 'little':
+        raise ValueError("Snapshots are little endian and can only be written on little endian machines")
+    xsize, ysize = grid.xsize, grid.ysize
+    cells = xsize * ysize
+    _, arguments = grid.__reduce__()
+    row_bytes = (xsize + 7) // 8
+    sections = [
+        ('grid', 'B', pickle.dumps((arguments[0], arguments[4:]))),
+        ('obstacles', 'B', b''.join(row.to_bytes(row_bytes, 'little') for row in grid.bitboard.rows)),
+    ]
+    if jump_tables is not None:
+        for dx, dy in DIRECTIONS:
+            sections.append(('jump {},{}'.format(dx, dy), 'i', _int32_bytes(jump_tables[(dx, dy)], cells)))
+    for name, field in (distance_fields or {}).items():
+        if len(name) > 18 or not name.isascii():
+            raise ValueError("Distance field names are at most 18 ascii characters, got {!r}".format(name))
+        sections.append(('field ' + name, 'i', _int32_bytes(field, cells)))
+    if components is not None:
+        sections.append(('labels', 'i', _int32_bytes(components.labels, cells)))
+        sizes = [value for pair in components.sizes.items() for value in pair]
+        sections.append(('sizes', 'i', np.asarray(sizes, dtype='<i4').tobytes()))
+    table = []
+    offset = _aligned(HEADER.size + SECTION.size * len(sections))
+    for name, typecode, data in sections:
+        table.append(SECTION.pack(name.encode('ascii'), typecode.encode('ascii'), offset, len(data)))
+        offset = _aligned(offset + len(data))
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), xsize, ysize))
+        file.write(b''.join(table))
+        for _, _, data in sections:
+            file.write(b'\0' * (_aligned(file.tell()) - file.tell()))
+            file.write(data)
+        return file.tell()
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _int32_bytes(values, cells: int) -> bytes:
+    data = np.asarray(values, dtype='<i4').reshape(-1)
+    if data.size != cells:
+        raise ValueError("Expected {} values, one per cell, got {}".format(cells, data.size))
+    return data.tobytes()
+
+
+class Snapshot:
+    def __init__(self, path: str):
+        """
+        Maps the file at path, only the header and section table are read.
+        """
+        if sys.byteorder != 'little':
+            raise ValueError("Snapshots are little endian and can only be opened on little endian machines")
+        with open(path, 'rb') as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self.view = memoryview(self.mapping)
+        magic, version, count, self.xsize, self.ysize = HEADER.unpack_from(self.view)
+        if magic != MAGIC:
+            raise ValueError("{} is not a grid snapshot".format(path))
+        if version != FORMAT_VERSION:
+            raise ValueError("{} has snapshot format {}, this version reads {}".format(path, version, FORMAT_VERSION))
+        self.sections = {}
+        for index in range(count):
+            name, typecode, offset, length = SECTION.unpack_from(self.view, HEADER.size + index * SECTION.size)
+            self.sections[name.rstrip(b'\0').decode('ascii')] = (typecode.decode('ascii'), offset, length)
+        self._grid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmaps the file. Raises BufferError while views handed out by this snapshot are still alive.
+        """
+        self.view.release()
+        self.mapping.close()
+
+    def section(self, name: str):
+        """
+        :return: memoryview of the section's values, None if the snapshot has no such section.
+        """
+        if name not in self.sections:
+            return None
+        typecode, offset, length = self.sections[name]
+        return self.view[offset:offset + length].cast(typecode)
+
+    @property
+    def grid(self):
+        """
+        The grid, built on first use. Rows come straight from the bitmap, columns from one NumPy transpose.
+        """
+        if self._grid is None:
+            grid_class, arguments = pickle.loads(self.section('grid'))
+            xsize, ysize = self.xsize, self.ysize
+            grid = grid_class(xsize, ysize, [], *arguments)
+            _, offset, length = self.sections['obstacles']
+            row_bytes = (xsize + 7) // 8
+            view = self.view
+            grid.bitboard.rows = [int.from_bytes(view[start:start + row_bytes], 'little')
+                                  for start in range(offset, offset + length, row_bytes)]
+            bitmap = np.frombuffer(self.mapping, dtype=np.uint8, count=length, offset=offset).reshape(ysize, row_bytes)
+            bits = np.unpackbits(bitmap, axis=1, bitorder='little')[:, :xsize]
+            columns = np.packbits(bits.T, axis=1, bitorder='little').tobytes()
+            column_bytes = (ysize + 7) // 8
+            grid.bitboard.columns = [int.from_bytes(columns[start:start + column_bytes], 'little')
+                                     for start in range(0, len(columns), column_bytes)]
+            self._grid = grid
+        return self._grid
+
+    def jump_tables(self):
+        """
+        :return: Direction to JPS+ table (int32 memoryview), None if the snapshot has none.
+        """
+        if 'jump 0,-1' not in self.sections:
+            return None
+        return {(dx, dy): self.section('jump {},{}'.format(dx, dy)) for dx, dy in DIRECTIONS}
+
+    def field_names(self) -> list:
+        return [name[len('field '):] for name in self.sections if name.startswith('field ')]
+
+    def distance_field(self, name: str):
+        """
+        :return: int32 array of shape (ysize, xsize) viewing the mapped field, None if there is no such field.
+        """
+        if 'field ' + name not in self.sections:
+            return None
+        _, offset, length = self.sections['field ' + name]
+        return np.frombuffer(self.mapping, dtype='<i4', count=length // 4, offset=offset).reshape(self.ysize,
+                                                                                                  self.xsize)
+
+    def jump_point_search_plus(self, heuristic_fn, **kwargs) -> JumpPointSearchPlus:
+        """
+        :param kwargs: Other JumpPointSearchPlus arguments (symmetry, bidirectional, reachability).
+        :return: JPS+ over grid using the stored tables, or building its own if there are none.
+        """
+        return JumpPointSearchPlus(self.grid, heuristic_fn, tables=self.jump_tables(), **kwargs)
+
+    def component_index(self) -> ComponentIndex:
+        """
+        :return: ComponentIndex of grid using the stored labels, or labelling the grid if there are none.
+        """
+        labels = self.section('labels')
+        if labels is None:
+            return ComponentIndex(self.grid)
+        sizes = self.section('sizes')
+        return ComponentIndex(self.grid, labels, dict(zip(sizes[0::2], sizes[1::2])))
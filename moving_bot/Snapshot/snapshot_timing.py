@@ -0,0 +1,93 @@
+from Benchmark.benchmark import make_queries, percentile
+from Benchmark.map_generators import noise_map
+from Coordinate.coord import Coord
+from FlowField.flow_field import FlowField
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search_plus import JumpPointSearchPlus
+from Reachability.component_index import ComponentIndex
+from Snapshot.snapshot import save_snapshot, Snapshot
+from UniformGrid.diagonal_grid import DiagonalGrid
+from time import perf_counter
+import os
+import sys
+import tempfile
+
+"""
+File: snapshot_timing.py
+Author: Nathan Robertson
+Purpose:
+    Setting up a noisy map for searching, rebuilt from scratch the way a replay does it today (DiagonalGrid from an
+    obstacle list, JPS+ preprocessing, a ComponentIndex and a castle distance field) against opening a snapshot
+    holding all of them. Each step is timed on its own and the snapshot's file size is listed.
+    The query line checks that JPS+ on tables viewed from the mapped file answers as fast as on its own arrays.
+
+    Run from the moving_bot directory with: python -m Snapshot.snapshot_timing [sizes...]
+"""
+
+
+sizes = [128, 256, 512]
+
+
+def timed(step):
+    began = perf_counter()
+    result = step()
+    return result, perf_counter() - began
+
+
+def rebuild(obstacles: list, size: int, castles: list) -> dict:
+    grid, grid_time = timed(lambda: DiagonalGrid(size, size, obstacles))
+    jps, jps_time = timed(lambda: JumpPointSearchPlus(grid, diagonal_tie_breaker))
+    index, index_time = timed(lambda: ComponentIndex(grid))
+    field, field_time = timed(lambda: FlowField(grid, castles))
+    index.detach()
+    return {'grid': grid_time, 'jps+': jps_time, 'components': index_time, 'field': field_time,
+            'objects': (grid, jps, index, field)}
+
+
+def load(path: str) -> dict:
+    snapshot, open_time = timed(lambda: Snapshot(path))
+    grid, grid_time = timed(lambda: snapshot.grid)
+    jps, jps_time = timed(lambda: snapshot.jump_point_search_plus(diagonal_tie_breaker))
+    index, index_time = timed(snapshot.component_index)
+    field, field_time = timed(lambda: snapshot.distance_field('castles'))
+    index.detach()
+    return {'open': open_time, 'grid': grid_time, 'jps+': jps_time, 'components': index_time, 'field': field_time,
+            'objects': (grid, jps, index, field)}
+
+
+def query_times(jps, queries: list) -> list:
+    times = []
+    for endpoints in queries:
+        began = perf_counter()
+        jps.execute(endpoints)
+        times.append(perf_counter() - began)
+    return times
+
+
+def print_row(name: str, steps: dict) -> None:
+    total = sum(value for key, value in steps.items() if key != 'objects')
+    print("  {:<8} total {:9.3f} ms  ".format(name, total * 1000) + "  ".join(
+        "{} {:.3f}".format(key, value * 1000) for key, value in steps.items() if key != 'objects'))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sizes = [int(size) for size in sys.argv[1:]]
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            source = noise_map(size, 0, density=0.2)
+            obstacles = list(source.obstacles())
+            castles = [Coord(1, 1), Coord(size - 2, size - 2)]
+            built = rebuild(obstacles, size, castles)
+            grid, jps, index, field = built['objects']
+            path = os.path.join(directory, '{}.snapshot'.format(size))
+            written = save_snapshot(path, grid, jps.tables, {'castles': field.distance}, index)
+            loaded = load(path)
+            print("noise {}x{}, snapshot {:.1f} KiB".format(size, size, written / 1024))
+            print_row("rebuild", built)
+            print_row("snapshot", loaded)
+            queries = make_queries(grid, 5, 10, 0)
+            fresh_times = query_times(jps, queries)
+            mapped_times = query_times(loaded['objects'][1], queries)
+            print("  JPS+ query p50 own tables {:.3f} ms, mapped tables {:.3f} ms".format(
+                percentile(fresh_times, 0.5) * 1000, percentile(mapped_times, 0.5) * 1000))
@@ -0,0 +1,111 @@
+import os
+import random
+import struct
+import tempfile
+import unittest
+import numpy as np
+from Benchmark.map_generators import noise_map
+from Coordinate.coord import Coord
+from FlowField.flow_field import FlowField
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search_plus import JumpPointSearchPlus
+from Reachability.component_index import ComponentIndex
+from Snapshot.snapshot import save_snapshot, Snapshot, FORMAT_VERSION
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+from UniformGrid.radius_grid import RadiusGrid
+from UniformGrid.weighted_grid import WeightedDiagonalGrid
+
+
+"""
+File: test_snapshot.py
+Author: Nathan Robertson
+Purpose: Test that grids and their tables come back from a snapshot unchanged, that searches built from a snapshot
+         behave like freshly built ones, and that foreign or outdated files are refused.
+"""
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'map.snapshot')
+        # Odd sizes so rows and columns do not fill whole bytes.
+        self.grid = noise_map(37, 4, density=0.3)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_same_grid(self, expected, actual):
+        self.assertIs(expected.__class__, actual.__class__)
+        self.assertEqual((expected.xsize, expected.ysize), (actual.xsize, actual.ysize))
+        self.assertEqual(expected.bitboard.rows, actual.bitboard.rows)
+        self.assertEqual(expected.bitboard.columns, actual.bitboard.columns)
+
+    def test_grid_round_trip(self):
+        for grid in (self.grid, OrthogonalGrid(13, 5, [Coord(12, 4), Coord(0, 0), Coord(7, 2)]),
+                     RadiusGrid(9, 11, [Coord(3, 10)], 2)):
+            save_snapshot(self.path, grid)
+            snapshot = Snapshot(self.path)
+            self.assert_same_grid(grid, snapshot.grid)
+            self.assertEqual(None, snapshot.jump_tables())
+            self.assertEqual([], snapshot.field_names())
+        self.assertEqual(2, snapshot.grid.radius_squared)
+
+    def test_weighted_grid_round_trip(self):
+        grid = WeightedDiagonalGrid(6, 4, [Coord(1, 1)])
+        grid.set_costs(np.arange(1, 25).reshape(4, 6))
+        save_snapshot(self.path, grid)
+        loaded = Snapshot(self.path).grid
+        self.assert_same_grid(grid, loaded)
+        self.assertTrue((grid.cost_array() == loaded.cost_array()).all())
+
+    def test_tables_round_trip(self):
+        jps = JumpPointSearchPlus(self.grid, diagonal_tie_breaker)
+        field = FlowField(self.grid, [Coord(3, 3), Coord(30, 30)])
+        index = ComponentIndex(self.grid)
+        save_snapshot(self.path, self.grid, jps.tables, {'castles': field.distance}, index)
+        snapshot = Snapshot(self.path)
+        for direction, table in jps.tables.items():
+            self.assertEqual(list(table), list(snapshot.jump_tables()[direction]))
+        self.assertEqual(['castles'], snapshot.field_names())
+        self.assertTrue((field.distance == snapshot.distance_field('castles')).all())
+        self.assertEqual(None, snapshot.distance_field('resources'))
+        self.assertEqual(list(index.labels), list(snapshot.section('labels')))
+        self.assertEqual(index.sizes, snapshot.component_index().sizes)
+
+    def test_searches_from_snapshot(self):
+        save_snapshot(self.path, self.grid, JumpPointSearchPlus(self.grid, diagonal_tie_breaker).tables,
+                      components=ComponentIndex(self.grid))
+        snapshot = Snapshot(self.path)
+        index = snapshot.component_index()
+        loaded = snapshot.jump_point_search_plus(diagonal_tie_breaker, reachability=index)
+        fresh = JumpPointSearchPlus(self.grid, diagonal_tie_breaker)
+        rng = random.Random(0)
+        free = [Coord(x, y) for y in range(37) for x in range(37) if not self.grid.is_obstacle(Coord(x, y))]
+        for _ in range(30):
+            endpoints = (rng.choice(free), rng.choice(free))
+            self.assertEqual(len(fresh.connect_path(fresh.execute(endpoints))),
+                             len(loaded.connect_path(loaded.execute(endpoints))))
+
+    def test_loaded_index_updates_without_changing_file(self):
+        grid = OrthogonalGrid(5, 3, [Coord(2, 0), Coord(2, 1)])
+        save_snapshot(self.path, grid, components=ComponentIndex(grid))
+        snapshot = Snapshot(self.path)
+        index = snapshot.component_index()
+        snapshot.grid.insert_obstacle(Coord(2, 2))
+        self.assertFalse(index.connected(Coord(0, 0), Coord(4, 0)))
+        self.assertEqual(2, index.count())
+        self.assertEqual(1, Snapshot(self.path).component_index().count())
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'P1\n' + bytes(64))
+        self.assertRaises(ValueError, Snapshot, self.path)
+        save_snapshot(self.path, self.grid)
+        with open(self.path, 'r+b') as file:
+            file.seek(4)
+            file.write(struct.pack('<H', FORMAT_VERSION + 1))
+        self.assertRaises(ValueError, Snapshot, self.path)
+
+    def test_rejects_bad_tables(self):
+        self.assertRaises(ValueError, save_snapshot, self.path, self.grid, None, {'short': [0, 1, 2]})
+        self.assertRaises(ValueError, save_snapshot, self.path, self.grid, None, {'x' * 19: np.zeros((37, 37))})
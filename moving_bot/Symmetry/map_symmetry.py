@@ -0,0 +1,165 @@
+from array import array
+from Coordinate.coord import Coord
+from JumpPointSearch.jps_node import JPSNode
+
+"""
+File: map_symmetry.py
+Author: Nathan Robertson
+Purpose:
+    Battlecode 2019 maps are always mirrored, either top to bottom or left to right
+    (the python counterpart of pathfinding/horizontal_sym.js).
+    The axis is found by comparing the bitboard's row ints with themselves reversed (horizontal axis) and its
+    column ints with themselves reversed (vertical axis), a single pass of whole row compares, no cell loop.
+    Knowing the axis:
+    1. Enemy castles and resources are our own reflected (predict).
+    2. Anything precomputed per map only needs the primary half, or one of a pair of mirrored results:
+       jump tables (JumpPointSearchPlus), distance fields (FlowField.reflected) and cached paths (PathCache).
+
+Axes
+    HORIZONTAL: Mirrored across a horizontal line, (x, y) <-> (x, ysize - 1 - y).
+    VERTICAL: Mirrored across a vertical line, (x, y) <-> (xsize - 1 - x, y).
+"""
+
+
+__all__ = ["MapSymmetry", "find_symmetry", "symmetry_axes", "HORIZONTAL", "VERTICAL"]
+
+HORIZONTAL = 'horizontal'
+VERTICAL = 'vertical'
+
+
+def symmetry_axes(grid) -> tuple:
+    """
+    :return: Every axis the obstacles of grid are mirrored across, empty tuple if there are none.
+    """
+    board = grid.bitboard
+    axes = ()
+    if board.rows == board.rows[::-1]:
+        axes += (HORIZONTAL,)
+    if board.columns == board.columns[::-1]:
+        axes += (VERTICAL,)
+    return axes
+
+
+def find_symmetry(grid):
+    """
+    :return: MapSymmetry for the axis grid is mirrored across, None if it is not mirrored. A map mirrored both ways
+             gives HORIZONTAL, the same choice as horizontal_sym.js.
+    """
+    axes = symmetry_axes(grid)
+    if len(axes) == 0:
+        return None
+    return MapSymmetry(grid, axes[0])
+
+
+class MapSymmetry:
+    def __init__(self, grid, axis: str):
+        if axis not in (HORIZONTAL, VERTICAL):
+            raise ValueError("Unknown symmetry axis: " + str(axis))
+        self.grid = grid
+        self.axis = axis
+        self.version = grid.version
+        self.symmetric = True
+
+    def holds(self) -> bool:
+        """
+        :return: If the grid is still mirrored across the axis. Robots are obstacles too, so after the map changes
+                 the check is repeated (once per grid version).
+        """
+        if self.version != self.grid.version:
+            self.version = self.grid.version
+            self.symmetric = self.axis in symmetry_axes(self.grid)
+        return self.symmetric
+
+    def reflect_xy(self, x: int, y: int) -> (int, int):
+        if self.axis == HORIZONTAL:
+            return x, self.grid.ysize - 1 - y
+        return self.grid.xsize - 1 - x, y
+
+    def reflect(self, coord: Coord) -> Coord:
+        return Coord(*self.reflect_xy(coord.x, coord.y))
+
+    def reflect_id(self, cell: int) -> int:
+        xsize = self.grid.xsize
+        y, x = divmod(cell, xsize)
+        x, y = self.reflect_xy(x, y)
+        return y * xsize + x
+
+    def reflect_direction(self, dx: int, dy: int) -> (int, int):
+        if self.axis == HORIZONTAL:
+            return dx, -dy
+        return -dx, dy
+
+    def is_primary(self, coord: Coord) -> bool:
+        """
+        :return: If coord is in the half computed directly. The middle row or column of an odd sized map belongs to
+                 the primary half.
+        """
+        if self.axis == HORIZONTAL:
+            return coord.y <= (self.grid.ysize - 1) // 2
+        return coord.x <= (self.grid.xsize - 1) // 2
+
+    def predict(self, coords: list) -> list:
+        """
+        :param coords: Our castles, karbonite tiles etc.
+        :return: The matching enemy positions.
+        """
+        return [self.reflect(coord) for coord in coords]
+
+    def reflect_path(self, path: list) -> list:
+        """
+        :param path: Coords, or JPSNodes as returned by JumpPointSearch.execute.
+        :return: The mirror image of path, from the reflection of its first cell to the reflection of its last.
+        """
+        reflected = []
+        previous = None
+        for item in path:
+            if isinstance(item, JPSNode):
+                direction = None if item.direction is None else \
+                    Coord(*self.reflect_direction(item.direction.x, item.direction.y))
+                node = JPSNode(self.reflect(item.coord), direction, item.g, item.f)
+                node.parent = previous
+                previous = node
+                reflected.append(node)
+            else:
+                reflected.append(self.reflect(item))
+        return reflected
+
+    def reflect_array(self, values):
+        """
+        :param values: NumPy array indexed [y, x] like FlowField.distance.
+        :return: A reflected view of values (no copy).
+        """
+        if self.axis == HORIZONTAL:
+            return values[::-1, :]
+        return values[:, ::-1]
+
+    def reflect_table(self, table: array) -> array:
+        """
+        :param table: Flat array indexed by y * xsize + x, like a JPS+ jump table.
+        :return: New array where result[cell] == table[reflect_id(cell)].
+        """
+        xsize, ysize = self.grid.xsize, self.grid.ysize
+        if self.axis == HORIZONTAL:
+            result = array(table.typecode)
+            for y in range(ysize - 1, -1, -1):
+                result.extend(table[y * xsize:(y + 1) * xsize])
+            return result
+        result = array(table.typecode, table)
+        for y in range(ysize):
+            result[y * xsize:(y + 1) * xsize] = table[y * xsize:(y + 1) * xsize][::-1]
+        return result
+
+    def complete_table(self, table: array) -> None:
+        """
+        Fills the secondary half of a flat table which is its own mirror image from its primary half, in place.
+        """
+        xsize, ysize = self.grid.xsize, self.grid.ysize
+        if self.axis == HORIZONTAL:
+            for y in range(ysize // 2):
+                mirror = ysize - 1 - y
+                table[mirror * xsize:(mirror + 1) * xsize] = table[y * xsize:(y + 1) * xsize]
+            return
+        half = xsize // 2
+        for y in range(ysize):
+            row = y * xsize
+            table[row + xsize - half:row + xsize] = table[row:row + half][::-1]
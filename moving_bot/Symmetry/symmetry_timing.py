@@ -0,0 +1,79 @@
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from JumpPointSearch.jump_point_search_plus import JumpPointSearchPlus
+from FlowField.flow_field import FlowField
+from Cache.path_cache import PathCache
+from AStar.astar_timing import random_endpoints
+from Symmetry.map_symmetry import find_symmetry, HORIZONTAL, VERTICAL
+from Benchmark.map_generators import mirrored_map
+from time import perf_counter
+import timeit
+import random
+
+"""
+File: symmetry_timing.py
+Author: Nathan Robertson
+Purpose:
+    What knowing the symmetry axis saves on mirrored maps of increasing size:
+    1. Detecting the axis.
+    2. Building the JPS+ tables with and without the symmetry.
+    3. A flow field towards the enemy castle: a second wavefront against reflecting our own field.
+       Memory counts the int32 distance array, which the reflection shares with our field.
+    4. A path cache asked the same 200 queries in mirrored pairs: searches run (counted by a second, instrumented
+       run so the counting does not slow the timed one) and entries stored.
+
+    Run from the moving_bot directory with: python -m Symmetry.symmetry_timing
+"""
+
+
+sizes = [32, 64, 128]
+density = 0.1
+
+
+def best_of(function, number: int = 3) -> float:
+    return min(timeit.repeat(function, number=1, repeat=number))
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    for size in sizes:
+        for axis in (HORIZONTAL, VERTICAL):
+            grid = mirrored_map(size, size, axis, density, size)
+            print("{}x{} grid mirrored {}ly, {:.0f}% obstacles:".format(size, size, axis, density * 100))
+            symmetry = find_symmetry(grid)
+            print("    detect axis: {:.1f} us".format(best_of(lambda: find_symmetry(grid), 10) * 1e6))
+
+            plain = JumpPointSearchPlus(grid, diagonal_tie_breaker)
+            mirrored = JumpPointSearchPlus(grid, diagonal_tie_breaker, symmetry)
+            full_time, half_time = best_of(plain.preprocess), best_of(mirrored.preprocess)
+            print("    JPS+ tables: {:.1f} ms -> {:.1f} ms ({:.0f}% saved), {} KiB either way".format(
+                full_time * 1000, half_time * 1000, 100 * (1 - half_time / full_time),
+                plain.table_bytes() // 1024))
+
+            castle = random_endpoints(grid, 1)[0][0]
+            ours = FlowField(grid, [castle])
+            enemy = symmetry.predict([castle])
+            direct_time = best_of(lambda: FlowField(grid, enemy))
+            reflect_time = best_of(lambda: ours.reflected(symmetry))
+            print("    enemy flow field: {:.2f} ms -> {:.3f} ms, distance array {} KiB -> 0 KiB".format(
+                direct_time * 1000, reflect_time * 1000, ours.distance.nbytes // 1024))
+
+            pairs = random_endpoints(grid, 100)
+            queries = []
+            for start, goal in pairs:
+                queries += [(start, goal), (symmetry.reflect(start), symmetry.reflect(goal))]
+            for name, cache_symmetry in (("plain", None), ("mirrored", symmetry)):
+                cache = PathCache(JumpPointSearch(grid, diagonal_tie_breaker), symmetry=cache_symmetry)
+                began = perf_counter()
+                for query in queries:
+                    cache.path(query)
+                elapsed = perf_counter() - began
+                stats = cache.stats()
+                counted = JumpPointSearch(grid, diagonal_tie_breaker)
+                searches = counted.instrument()
+                counted_cache = PathCache(counted, symmetry=cache_symmetry)
+                for query in queries:
+                    counted_cache.path(query)
+                print("    path cache ({}): {} searches, {} entries, {} KiB, {:.1f} ms".format(
+                    name, searches.queries, stats['entries'], stats['bytes'] // 1024,
+                    elapsed * 1000))
@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from JumpPointSearch.jump_point_search_plus import JumpPointSearchPlus
+from FlowField.flow_field import FlowField
+from Cache.path_cache import PathCache
+from Symmetry.map_symmetry import MapSymmetry, find_symmetry, symmetry_axes, HORIZONTAL, VERTICAL
+from heuristics import diagonal
+from Benchmark.map_generators import mirrored_map
+
+
+"""
+File: test_map_symmetry.py
+Author: Nathan Robertson
+Purpose: Test symmetry detection and that reflected precomputation matches computing it directly.
+"""
+
+
+class DetectionTest(unittest.TestCase):
+    def test_axes(self):
+        self.assertEqual((HORIZONTAL,), symmetry_axes(mirrored_map(9, 8, HORIZONTAL, 0.3, 1)))
+        self.assertEqual((VERTICAL,), symmetry_axes(mirrored_map(9, 8, VERTICAL, 0.3, 1)))
+        self.assertEqual((HORIZONTAL, VERTICAL), symmetry_axes(DiagonalGrid(5, 5, [])))
+        self.assertIsNone(find_symmetry(DiagonalGrid(5, 5, [Coord(0, 0)])))
+
+    def test_predict_and_holds(self):
+        grid = mirrored_map(10, 10, VERTICAL, 0.2, 2)
+        symmetry = find_symmetry(grid)
+        self.assertEqual(VERTICAL, symmetry.axis)
+        self.assertEqual([Coord(7, 4)], symmetry.predict([Coord(2, 4)]))
+        self.assertTrue(symmetry.is_primary(Coord(4, 9)))
+        self.assertFalse(symmetry.is_primary(Coord(5, 0)))
+        if grid.is_obstacle(Coord(0, 0)):
+            grid.remove_obstacle(Coord(0, 0))
+        else:
+            grid.insert_obstacle(Coord(0, 0))
+        self.assertFalse(symmetry.holds())
+
+    def test_unknown_axis(self):
+        self.assertRaises(ValueError, MapSymmetry, DiagonalGrid(2, 2, []), 'diagonal')
+
+
+class ReflectionTest(unittest.TestCase):
+    def test_jump_tables(self):
+        for axis in (HORIZONTAL, VERTICAL):
+            for xsize, ysize in ((12, 12), (13, 11)):
+                grid = mirrored_map(xsize, ysize, axis, 0.25, xsize)
+                plain = JumpPointSearchPlus(grid, diagonal)
+                mirrored = JumpPointSearchPlus(grid, diagonal, MapSymmetry(grid, axis))
+                self.assertEqual(plain.tables, mirrored.tables)
+
+    def test_flow_field(self):
+        grid = mirrored_map(15, 12, HORIZONTAL, 0.25, 4)
+        symmetry = find_symmetry(grid)
+        goal = next(Coord(x, 2) for x in range(15) if not grid.is_obstacle(Coord(x, 2)))
+        ours = FlowField(grid, [goal])
+        theirs = ours.reflected(symmetry)
+        direct = FlowField(grid, symmetry.predict([goal]))
+        self.assertTrue(np.array_equal(direct.distance, theirs.distance))
+        for x in range(15):
+            for y in range(12):
+                path = theirs.path(Coord(x, y))
+                self.assertEqual(len(direct.path(Coord(x, y))), len(path))
+                for first, second in zip(path, path[1:]):
+                    self.assertTrue(grid.is_adjacent(first, second))
+
+    def test_path_cache(self):
+        grid = DiagonalGrid(12, 12, [])
+        symmetry = MapSymmetry(grid, VERTICAL)
+        jps = JumpPointSearch(grid, diagonal)
+        cache = PathCache(jps, symmetry=symmetry)
+        path = cache.path((Coord(0, 0), Coord(5, 11)))
+        mirrored = cache.path((Coord(11, 0), Coord(6, 11)))
+        self.assertEqual(symmetry.reflect_path(path), mirrored)
+        self.assertEqual(mirrored, jps.connect_path(cache.execute((Coord(11, 0), Coord(6, 11)))))
+        self.assertEqual(2, cache.stats()['mirrored_hits'])
+        self.assertEqual(1, cache.stats()['entries'])
+        grid.insert_obstacle(Coord(3, 3))
+        cache.path((Coord(11, 11), Coord(6, 0)))
+        self.assertEqual(2, cache.stats()['mirrored_hits'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+File: bitboard.py
+Author: Nathan Robertson
+Purpose:
+    Compact obstacle storage for uniform grids.
+    Each row of the grid is a single python int where bit x is set if (x, y) is an obstacle. A transposed copy
+    (one int per column, bit y set) is kept alongside so vertical scans are as cheap as horizontal ones.
+    Scanning for the next obstacle along a row or column is done with word-level bit operations instead of
+    hashing one Coord per cell.
+"""
+
+
+__all__ = ["Bitboard", "next_set_bit"]
+
+
+def next_set_bit(bits: int, start: int, step: int):
+    """
+    :param bits: Bit field to scan.
+    :param start: Index to scan from (exclusive).
+    :param step: 1 to scan towards higher indices, -1 to scan towards lower indices.
+    :return: Index of the closest set bit strictly after start in the direction of step, or None if there is none.
+    """
+    if step > 0:
+        remaining = bits >> (start + 1)
+        if remaining == 0:
+            return None
+        return start + (remaining & -remaining).bit_length()
+    if start <= 0:
+        return None
+    remaining = bits & ((1 << start) - 1)
+    if remaining == 0:
+        return None
+    return remaining.bit_length() - 1
+
+
+class Bitboard:
+    __slots__ = ('xsize', 'ysize', 'rows', 'columns')
+
+    def __init__(self, xsize: int, ysize: int):
+        self.xsize = xsize
+        self.ysize = ysize
+        self.rows = [0] * ysize
+        self.columns = [0] * xsize
+
+    def contains(self, x: int, y: int) -> bool:
+        """
+        :return: If (x, y) lies inside the board.
+        """
+        return 0 <= x < self.xsize and 0 <= y < self.ysize
+
+    def test(self, x: int, y: int) -> bool:
+        """
+        :return: If (x, y) is set. Positions outside the board are never set.
+        """
+        if 0 <= x < self.xsize and 0 <= y < self.ysize:
+            return (self.rows[y] >> x) & 1 == 1
+        return False
+
+    def set(self, x: int, y: int) -> None:
+        self.rows[y] |= 1 << x
+        self.columns[x] |= 1 << y
+
+    def clear(self, x: int, y: int) -> None:
+        self.rows[y] &= ~(1 << x)
+        self.columns[x] &= ~(1 << y)
+
+    def row(self, y: int) -> int:
+        """
+        :return: Bits of row y, or 0 if y is outside the board.
+        """
+        if 0 <= y < self.ysize:
+            return self.rows[y]
+        return 0
+
+    def column(self, x: int) -> int:
+        """
+        :return: Bits of column x, or 0 if x is outside the board.
+        """
+        if 0 <= x < self.xsize:
+            return self.columns[x]
+        return 0
+
+    def next_in_row(self, x: int, y: int, step: int) -> int:
+        """
+        :return: x position of the next set cell after x going in direction step along row y.
+                 If there is none the first position off the board (-1 or xsize) is returned.
+        """
+        found = next_set_bit(self.row(y), x, step)
+        if found is None:
+            return self.xsize if step > 0 else -1
+        return found
+
+    def next_in_column(self, x: int, y: int, step: int) -> int:
+        """
+        :return: y position of the next set cell after y going in direction step along column x.
+                 If there is none the first position off the board (-1 or ysize) is returned.
+        """
+        found = next_set_bit(self.column(x), y, step)
+        if found is None:
+            return self.ysize if step > 0 else -1
+        return found
+
+    def cells(self):
+        """
+        :return: Generator of every (x, y) that is set, row by row.
+        """
+        for y, bits in enumerate(self.rows):
+            while bits:
+                low = bits & -bits
+                yield low.bit_length() - 1, y
+                bits ^= low
+
+    def __len__(self):
+        return sum(bin(bits).count('1') for bits in self.rows)
@@ -1,20 +1,26 @@
 from Coordinate.coord import Coord
 from UniformGrid.uniform_grid import UniformGrid
-from functools import lru_cache
+from Cache.grid_cache import GridCache
+
+NEIGHBOR_CACHE_SIZE = 4096
 
 
 class DiagonalGrid(UniformGrid):
+    NEIGHBOR_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, 1), (-1, 1), (1, -1))
 
     def __init__(self, xsize: int, ysize: int, obstacles: list):
         super().__init__(xsize, ysize, obstacles)
+        self.neighbor_cache = GridCache(self, NEIGHBOR_CACHE_SIZE)
 
-    @lru_cache(maxsize=None)
     def neighbors(self, coord: Coord) -> list:
         """
+        Cached per grid, the cache empties itself when obstacles change.
         :param coord:
         :return: All neighbors of coord in a list. (A coord with no neighbors would return empty list)
         """
-        make_neighbor = lambda x, y: Coord(coord.x + x, coord.y + y)
-        dist = map(lambda i: make_neighbor(i[0], i[1]),
-                   [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, 1), (-1, 1), (1, -1)])
-        return list(filter(lambda i: self.is_adjacent(coord, i), list(dist)))
\ No newline at end of file
+        key = (coord.x, coord.y)
+        neighbors = self.neighbor_cache.get(key)
+        if neighbors is None:
+            neighbors = self._neighbors_from_offsets(coord, self.NEIGHBOR_OFFSETS)
+            self.neighbor_cache.put(key, neighbors)
+        return neighbors
\ No newline at end of file
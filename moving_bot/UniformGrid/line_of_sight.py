@@ -0,0 +1,101 @@
+import math
+from Coordinate.coord import Coord
+
+"""
+File: line_of_sight.py
+Author: Nathan Robertson
+Purpose:
+    Line of sight between cell centers over a grid's bitboard, and smoothing of tile by tile paths down to the
+    waypoints where the unit has to turn.
+
+Line of sight
+    The cells a straight line from start to goal passes through are free. Which cells count depends on the moves:
+    Bresenham: On grids with diagonal moves, the one cell per column (row for steep lines) closest to the line,
+               so walking the line is a sequence of legal king moves.
+    Supercover: On grids without diagonal moves, every cell the line touches, including both cells beside a corner
+                it passes exactly through (units may not slip between two diagonal obstacles).
+    Either way the cells a line crosses in one row (column for steep lines) are one contiguous run, so a row costs
+    a single mask test against the bitboard row (or column) instead of one test per cell.
+    Endpoints are put in a fixed order before tracing so start to goal and goal to start test the same cells.
+
+Smoothing
+    smooth_path walks a connected path (connect_path output) and keeps a cell only when the last kept cell cannot
+    see the cell after it (greedy string pulling). Every two consecutive waypoints are in line of sight.
+"""
+
+
+__all__ = ["line_of_sight", "smooth_path", "path_length"]
+
+
+def line_of_sight(grid, start: Coord, goal: Coord, supercover: bool = None) -> bool:
+    """
+    :param supercover: Which cells have to be free, None to choose from the grid's moves (see above).
+    :return: If start and goal are on the grid and every cell of the line between them is free.
+    """
+    if not (grid.is_valid_coord(start) and grid.is_valid_coord(goal)):
+        return False
+    if supercover is None:
+        supercover = not any(dx != 0 and dy != 0 for dx, dy in grid.NEIGHBOR_OFFSETS)
+    board = grid.bitboard
+    if abs(goal.x - start.x) >= abs(goal.y - start.y):
+        return _runs_free(board.rows, start.x, start.y, goal.x, goal.y, supercover)
+    return _runs_free(board.columns, start.y, start.x, goal.y, goal.x, supercover)
+
+
+def _runs_free(lines: list, a0: int, b0: int, a1: int, b1: int, supercover: bool) -> bool:
+    """
+    Traces a line which is at least as long along a as along b, one line (row or column of the bitboard) per b.
+    :param lines: Bitboard rows when a is x, columns when a is y.
+    """
+    if (a1, b1) < (a0, b0):
+        a0, b0, a1, b1 = a1, b1, a0, b0
+    da = a1 - a0
+    db = abs(b1 - b0)
+    step = 1 if b1 >= b0 else -1
+    # The run in line b0 + step * t ends where the line crosses b = t + 1/2, at a = a0 + (2t + 1) * da / (2 * db).
+    # Bresenham takes the cells whose center is before the crossing, supercover also the cell the crossing lies in
+    # (and the next one when it lies exactly on a corner). crossing holds (2t + 1) * da.
+    twice = 2 * db
+    crossing = da
+    first = a0
+    line = b0
+    for _ in range(db):
+        if supercover:
+            last = a0 + (crossing + db) // twice
+            following = a0 - (db - crossing) // twice
+        else:
+            following = a0 - (-crossing // twice)
+            last = following - 1
+        if (lines[line] >> first) & ((1 << (last - first + 1)) - 1):
+            return False
+        first = following
+        line += step
+        crossing += 2 * da
+    return not (lines[line] >> first) & ((1 << (a1 - first + 1)) - 1)
+
+
+def smooth_path(grid, path: list, supercover: bool = None) -> list:
+    """
+    :param path: Connected path, every cell free (e.g. JumpPointSearch.connect_path output).
+    :return: Waypoints from the first cell of path to its last, consecutive ones in line of sight.
+    """
+    if len(path) <= 2:
+        return list(path)
+    if supercover is None:
+        supercover = not any(dx != 0 and dy != 0 for dx, dy in grid.NEIGHBOR_OFFSETS)
+    waypoints = [path[0]]
+    anchor = path[0]
+    for index in range(2, len(path)):
+        if not line_of_sight(grid, anchor, path[index], supercover):
+            anchor = path[index - 1]
+            waypoints.append(anchor)
+    waypoints.append(path[-1])
+    return waypoints
+
+
+def path_length(path: list) -> float:
+    """
+    :return: Euclidean length of the polyline through the cell centers of path.
+    """
+    return sum(math.hypot(following.x - current.x, following.y - current.y)
+               for current, following in zip(path, path[1:]))
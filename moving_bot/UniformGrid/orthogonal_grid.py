@@ -7,11 +7,13 @@ Authors: Kelsey Lewis, Ryan Pounders, Pedro Reyes, Nathan Robertson
 Purpose:
     Describes a OrthogonalGrid class used in path finding algorithms.
     Entities using this class will be able to move orthogonally (north, south, east, and west).
-    Uses a Sparse Grid implementation which only stores obstacles and size of grid.
+    Obstacles are stored as a bitboard, see uniform_grid.py.
 """
 
 
 class OrthogonalGrid(UniformGrid):
+    NEIGHBOR_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
     def __init__(self, xsize: int, ysize: int, obstacles: list):
         super().__init__(xsize, ysize, obstacles)
 
@@ -20,9 +22,7 @@ class OrthogonalGrid(UniformGrid):
         :param coord:
         :return: All neighbors of coord in a list. (A coord with no neighbors would return empty list)
         """
-        make_neighbor = lambda x, y: Coord(coord.x + x, coord.y + y)
-        dist = map(lambda i: make_neighbor(i[0], i[1]), [(0, -1), (0, 1), (-1, 0), (1, 0)])
-        return list(filter(lambda i: self.is_adjacent(coord, i), dist))
+        return self._neighbors_from_offsets(coord, self.NEIGHBOR_OFFSETS)
 
 
 def print_grid(grid: OrthogonalGrid, path: []):
@@ -36,7 +36,7 @@ def print_grid(grid: OrthogonalGrid, path: []):
             coord = Coord(i, j)
             if coord in path:
                 val = 'P'
-            elif coord in grid.obstacles():
+            elif grid.is_obstacle(coord):
                 val = 'X'
             else:
                 val = '.'
@@ -0,0 +1,119 @@
+import math
+from array import array
+from Coordinate.coord import Coord
+from UniformGrid.uniform_grid import UniformGrid, grid_from_rows
+from Cache.grid_cache import GridCache
+
+"""
+File: radius_grid.py
+Author: Nathan Robertson
+Purpose:
+    A grid where one move takes an entity to any passable cell within a squared radius, like Battlecode 2019 units
+    (pilgrims move up to r^2 = 4, crusaders up to r^2 = 9 per turn). Every move costs the same, so any search
+    using NEIGHBOR_OFFSETS (AStar, FlowField, DStarLite) returns paths measured in turns instead of tiles.
+    Offsets are computed once per radius and shared by every grid with that radius. Neighbor lists of cell ids
+    are cached per grid as flat arrays and dropped when obstacles change.
+"""
+
+
+__all__ = ["RadiusGrid", "radius_offsets", "turns_heuristic", "merge_steps",
+           "PILGRIM_RADIUS_SQUARED", "CRUSADER_RADIUS_SQUARED"]
+
+PILGRIM_RADIUS_SQUARED = 4
+CRUSADER_RADIUS_SQUARED = 9
+NEIGHBOR_CACHE_SIZE = 4096
+
+_offset_tables = {}
+
+
+def radius_offsets(radius_squared: int) -> tuple:
+    """
+    :return: Every (x, y) move other than (0, 0) with x * x + y * y <= radius_squared, closest first.
+    """
+    offsets = _offset_tables.get(radius_squared)
+    if offsets is None:
+        reach = math.isqrt(radius_squared)
+        moves = [(dx, dy) for dx in range(-reach, reach + 1) for dy in range(-reach, reach + 1)
+                 if 0 < dx * dx + dy * dy <= radius_squared]
+        offsets = tuple(sorted(moves, key=lambda move: (move[0] * move[0] + move[1] * move[1], move)))
+        _offset_tables[radius_squared] = offsets
+    return offsets
+
+
+def turns_heuristic(radius_squared: int):
+    """
+    Admissible heuristic in turns: one move covers at most isqrt(radius_squared) tiles in x and in y.
+    :return: A function of two Coords.
+    """
+    reach = max(1, math.isqrt(radius_squared))
+
+    def heuristic(coord1, coord2):
+        return -(-max(abs(coord1.x - coord2.x), abs(coord1.y - coord2.y)) // reach)
+    return heuristic
+
+
+def merge_steps(path: list, radius_squared: int) -> list:
+    """
+    Turns a tile by tile path into moves of a unit with the given squared radius, by jumping to the furthest
+    cell further along the path that is within range. Every cell of the path is passable, so the merged path is too.
+    :return: Cells the unit stands on at the end of each turn (starting with the first cell of path).
+    """
+    if len(path) == 0:
+        return []
+    merged = [path[0]]
+    index = 0
+    while index < len(path) - 1:
+        current = path[index]
+        furthest = index + 1
+        for candidate in range(index + 1, len(path)):
+            dx, dy = path[candidate].x - current.x, path[candidate].y - current.y
+            if dx * dx + dy * dy <= radius_squared:
+                furthest = candidate
+        index = furthest
+        merged.append(path[index])
+    return merged
+
+
+class RadiusGrid(UniformGrid):
+    def __init__(self, xsize: int, ysize: int, obstacles: list, radius_squared: int = PILGRIM_RADIUS_SQUARED):
+        self.radius_squared = radius_squared
+        self.NEIGHBOR_OFFSETS = radius_offsets(radius_squared)
+        super().__init__(xsize, ysize, obstacles)
+        self.neighbor_cache = GridCache(self, NEIGHBOR_CACHE_SIZE)
+
+    def __reduce__(self):
+        return grid_from_rows, (self.__class__, self.xsize, self.ysize, list(self.bitboard.rows), self.radius_squared)
+
+    def is_adjacent_position(self, coord1: Coord, coord2: Coord) -> bool:
+        """
+        :return: True if coord2 can be reached from coord1 in one move.
+        """
+        dx, dy = coord1.x - coord2.x, coord1.y - coord2.y
+        return 0 < dx * dx + dy * dy <= self.radius_squared
+
+    def neighbors(self, coord: Coord) -> list:
+        """
+        :param coord:
+        :return: Every passable cell within the squared radius of coord. (A coord with no neighbors would return empty list)
+        """
+        xsize = self.xsize
+        return [Coord(cell % xsize, cell // xsize) for cell in self.neighbor_ids(coord.y * xsize + coord.x)]
+
+    def neighbor_ids(self, cell: int) -> array:
+        """
+        :param cell: Cell id (y * xsize + x) on the grid.
+        :return: Ids of every passable cell within the squared radius of cell, cached until obstacles change.
+        """
+        ids = self.neighbor_cache.get(cell)
+        if ids is None:
+            xsize, ysize = self.xsize, self.ysize
+            rows = self.bitboard.rows
+            y, x = divmod(cell, xsize)
+            ids = array('l')
+            if not (rows[y] >> x) & 1:
+                for dx, dy in self.NEIGHBOR_OFFSETS:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < xsize and 0 <= ny < ysize and not (rows[ny] >> nx) & 1:
+                        ids.append(ny * xsize + nx)
+            self.neighbor_cache.put(cell, ids)
+        return ids
@@ -0,0 +1,49 @@
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jps_timing import make_diagonal_grid
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from AStar.astar import AStar
+from AStar.astar_timing import random_endpoints
+from UniformGrid.uniform_grid import grid_from_rows
+from UniformGrid.radius_grid import RadiusGrid, turns_heuristic, merge_steps, \
+    PILGRIM_RADIUS_SQUARED, CRUSADER_RADIUS_SQUARED
+import timeit
+import random
+
+"""
+File: radius_grid_timing.py
+Author: Nathan Robertson
+Purpose:
+    Compare searching a RadiusGrid directly (paths in turns) against the old approach of finding a tile path with
+    jump point search on a DiagonalGrid and merging its steps afterwards with merge_steps.
+    Reports total turns for both (the merged path is not always the fewest turns) and the time for 100 queries.
+
+    Run from the moving_bot directory with: python -m UniformGrid.radius_grid_timing
+"""
+
+
+size = 64
+obstacle_prob = [1, 10, 20]
+queries = 100
+
+if __name__ == "__main__":
+    random.seed(0)
+    for prob in obstacle_prob:
+        diagonal_grid = make_diagonal_grid((size, size), obstacle_prob=prob)
+        rows = list(diagonal_grid.bitboard.rows)
+        endpoints = random_endpoints(diagonal_grid, queries)
+        jps = JumpPointSearch(diagonal_grid, diagonal_tie_breaker)
+        for radius_squared in (PILGRIM_RADIUS_SQUARED, CRUSADER_RADIUS_SQUARED):
+            radius_grid = grid_from_rows(RadiusGrid, size, size, rows, radius_squared)
+            astar = AStar(radius_grid, turns_heuristic(radius_squared))
+
+            def merged():
+                return [merge_steps(jps.connect_path(jps.execute(pair)), radius_squared) for pair in endpoints]
+
+            def direct():
+                return [astar.execute(pair) for pair in endpoints]
+
+            merged_turns = sum(max(0, len(path) - 1) for path in merged())
+            direct_turns = sum(max(0, len(path) - 1) for path in direct())
+            print("{}x{} grid, {}% obstacles, r^2 = {}:".format(size, size, prob, radius_squared))
+            print("    JPS + merge_steps: {} turns, {:.3f} s".format(merged_turns, timeit.timeit(merged, number=1)))
+            print("    AStar on RadiusGrid: {} turns, {:.3f} s".format(direct_turns, timeit.timeit(direct, number=1)))
@@ -0,0 +1,80 @@
+import unittest
+import pickle
+from UniformGrid.bitboard import Bitboard, next_set_bit
+from UniformGrid.diagonal_grid import DiagonalGrid
+from Coordinate.coord import Coord
+
+
+"""
+File: test_bitboard.py
+Author: Nathan Robertson
+Purpose: Test the Bitboard obstacle storage and the grid methods which read from it.
+"""
+
+
+class NextSetBitTest(unittest.TestCase):
+    def test_scan_up(self):
+        self.assertEqual(4, next_set_bit(0b10010, 1, 1))
+        self.assertEqual(1, next_set_bit(0b10010, -1, 1))
+        self.assertIsNone(next_set_bit(0b10010, 4, 1))
+
+    def test_scan_down(self):
+        self.assertEqual(1, next_set_bit(0b10010, 4, -1))
+        self.assertIsNone(next_set_bit(0b10010, 1, -1))
+        self.assertIsNone(next_set_bit(0b10010, 0, -1))
+
+
+class BitboardTest(unittest.TestCase):
+    def setUp(self):
+        self.board = Bitboard(5, 4)
+        self.board.set(1, 2)
+        self.board.set(3, 2)
+
+    def test_set_and_clear(self):
+        self.assertTrue(self.board.test(1, 2))
+        self.assertEqual(0b10, self.board.column(1) >> 1)
+        self.board.clear(1, 2)
+        self.assertFalse(self.board.test(1, 2))
+        self.assertEqual(0, self.board.column(1))
+        self.assertFalse(self.board.test(-1, 2))
+
+    def test_row_scans(self):
+        self.assertEqual(3, self.board.next_in_row(1, 2, 1))
+        self.assertEqual(5, self.board.next_in_row(3, 2, 1))
+        self.assertEqual(-1, self.board.next_in_row(1, 2, -1))
+        self.assertEqual(1, self.board.next_in_row(3, 2, -1))
+
+    def test_column_scans(self):
+        self.assertEqual(2, self.board.next_in_column(1, 0, 1))
+        self.assertEqual(4, self.board.next_in_column(1, 2, 1))
+        self.assertEqual(-1, self.board.next_in_column(0, 3, -1))
+
+    def test_cells(self):
+        self.assertEqual([(1, 2), (3, 2)], list(self.board.cells()))
+        self.assertEqual(2, len(self.board))
+
+
+class GridBitboardTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = DiagonalGrid(4, 4, [Coord(2, 0), Coord(0, 3)])
+
+    def test_is_obstacle(self):
+        self.assertTrue(self.grid.is_obstacle(Coord(2, 0)))
+        self.assertFalse(self.grid.is_obstacle(Coord(1, 0)))
+        self.assertFalse(self.grid.is_obstacle(Coord(4, 0)))
+
+    def test_next_blocked(self):
+        self.assertEqual(Coord(2, 0), self.grid.next_blocked(Coord(0, 0), Coord(1, 0)))
+        self.assertEqual(Coord(0, 3), self.grid.next_blocked(Coord(0, 0), Coord(0, 1)))
+        self.assertEqual(Coord(1, 4), self.grid.next_blocked(Coord(1, 0), Coord(0, 1)))
+        self.assertEqual(Coord(-1, 1), self.grid.next_blocked(Coord(3, 1), Coord(-1, 0)))
+
+    def test_obstacles_view(self):
+        self.assertEqual({Coord(2, 0), Coord(0, 3)}, self.grid.obstacles())
+
+    def test_pickle_round_trip(self):
+        copy = pickle.loads(pickle.dumps(self.grid))
+        self.assertIsInstance(copy, DiagonalGrid)
+        self.assertEqual((4, 4), (copy.xsize, copy.ysize))
+        self.assertEqual(self.grid.obstacles(), copy.obstacles())
+        self.assertEqual(self.grid.bitboard.columns, copy.bitboard.columns)
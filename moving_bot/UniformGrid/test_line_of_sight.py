@@ -0,0 +1,130 @@
+import random
+import unittest
+from fractions import Fraction
+from Coordinate.coord import Coord
+from heuristics import diagonal_tie_breaker
+from JumpPointSearch.jump_point_search import JumpPointSearch
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+from UniformGrid.line_of_sight import line_of_sight, smooth_path, path_length
+
+
+"""
+File: test_line_of_sight.py
+Author: Nathan Robertson
+Purpose: Test line of sight against tracing lines cell by cell, and that smoothed paths keep their endpoints and
+         only join waypoints which see each other.
+"""
+
+
+def bresenham_cells(start: Coord, goal: Coord) -> set:
+    """
+    One cell per step along the longer axis, rounding half up from the endpoint which sorts first.
+    """
+    swap = abs(goal.x - start.x) < abs(goal.y - start.y)
+    a0, b0, a1, b1 = (start.y, start.x, goal.y, goal.x) if swap else (start.x, start.y, goal.x, goal.y)
+    if (a1, b1) < (a0, b0):
+        a0, b0, a1, b1 = a1, b1, a0, b0
+    cells = set()
+    for i in range(a1 - a0 + 1):
+        t = 0 if a1 == a0 else (2 * i * abs(b1 - b0) + (a1 - a0)) // (2 * (a1 - a0))
+        b = b0 + t if b1 >= b0 else b0 - t
+        cells.add(Coord(b, a0 + i) if swap else Coord(a0 + i, b))
+    return cells
+
+
+def supercover_touches(start: Coord, goal: Coord, cell: Coord) -> bool:
+    """
+    If the segment between the centers touches the closed square of cell (Liang-Barsky clipping).
+    """
+    low, high = Fraction(0), Fraction(1)
+    half = Fraction(1, 2)
+    dx, dy = goal.x - start.x, goal.y - start.y
+    for p, q in ((-dx, start.x - cell.x + half), (dx, cell.x - start.x + half),
+                 (-dy, start.y - cell.y + half), (dy, cell.y - start.y + half)):
+        if p == 0:
+            if q < 0:
+                return False
+        elif p < 0:
+            low = max(low, q / p)
+        else:
+            high = min(high, q / p)
+    return low <= high
+
+
+class LineOfSightTest(unittest.TestCase):
+    def test_matches_traced_lines(self):
+        rng = random.Random(5)
+        for _ in range(2000):
+            start, goal = Coord(rng.randrange(9), rng.randrange(9)), Coord(rng.randrange(9), rng.randrange(9))
+            cell = Coord(rng.randrange(9), rng.randrange(9))
+            if cell in (start, goal):
+                continue
+            grid = DiagonalGrid(9, 9, [cell])
+            self.assertEqual(cell not in bresenham_cells(start, goal), line_of_sight(grid, start, goal))
+            self.assertEqual(line_of_sight(grid, start, goal), line_of_sight(grid, goal, start))
+            self.assertEqual(not supercover_touches(start, goal, cell), line_of_sight(grid, start, goal, True))
+
+    def test_corners(self):
+        diagonal = DiagonalGrid(2, 2, [Coord(1, 0), Coord(0, 1)])
+        self.assertTrue(line_of_sight(diagonal, Coord(0, 0), Coord(1, 1)))
+        orthogonal = OrthogonalGrid(2, 2, [Coord(1, 0)])
+        self.assertFalse(line_of_sight(orthogonal, Coord(0, 0), Coord(1, 1)))
+        self.assertTrue(line_of_sight(orthogonal, Coord(0, 0), Coord(0, 1)))
+
+    def test_outside_and_blocked_endpoints(self):
+        grid = DiagonalGrid(4, 4, [Coord(3, 3)])
+        self.assertFalse(line_of_sight(grid, Coord(0, 0), Coord(4, 0)))
+        self.assertFalse(line_of_sight(grid, Coord(0, 0), Coord(3, 3)))
+        self.assertTrue(line_of_sight(grid, Coord(2, 2), Coord(2, 2)))
+
+
+class SmoothPathTest(unittest.TestCase):
+    def test_open_grid_is_one_segment(self):
+        grid = DiagonalGrid(20, 20, [])
+        jps = JumpPointSearch(grid, diagonal_tie_breaker)
+        result = jps.execute((Coord(0, 0), Coord(19, 7)))
+        self.assertEqual([Coord(0, 0), Coord(19, 7)], jps.any_angle_path(result))
+
+    def test_waypoints_see_each_other(self):
+        rng = random.Random(2)
+        for grid_class in (DiagonalGrid, OrthogonalGrid):
+            obstacles = [Coord(x, y) for y in range(24) for x in range(24) if rng.random() < 0.2]
+            grid = grid_class(24, 24, obstacles)
+            free = [Coord(x, y) for y in range(24) for x in range(24) if not grid.is_obstacle(Coord(x, y))]
+            for _ in range(30):
+                start, goal = rng.choice(free), rng.choice(free)
+                path = self.walk(grid, start, goal)
+                if not path:
+                    continue
+                waypoints = smooth_path(grid, path)
+                self.assertEqual(path[0], waypoints[0])
+                self.assertEqual(path[-1], waypoints[-1])
+                self.assertLessEqual(len(waypoints), len(path))
+                self.assertLessEqual(path_length(waypoints), path_length(path) + 1e-9)
+                for current, following in zip(waypoints, waypoints[1:]):
+                    self.assertTrue(line_of_sight(grid, current, following))
+
+    @staticmethod
+    def walk(grid, start: Coord, goal: Coord) -> list:
+        parent = {start: None}
+        frontier = [start]
+        while frontier and goal not in parent:
+            reached = []
+            for current in frontier:
+                for neighbor in grid.neighbors(current):
+                    if neighbor not in parent:
+                        parent[neighbor] = current
+                        reached.append(neighbor)
+            frontier = reached
+        if goal not in parent:
+            return []
+        path = [goal]
+        while parent[path[-1]] is not None:
+            path.append(parent[path[-1]])
+        return path[::-1]
+
+    def test_short_paths_unchanged(self):
+        grid = DiagonalGrid(3, 3, [])
+        self.assertEqual([], smooth_path(grid, []))
+        self.assertEqual([Coord(0, 0), Coord(1, 1)], smooth_path(grid, [Coord(0, 0), Coord(1, 1)]))
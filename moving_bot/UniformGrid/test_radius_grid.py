@@ -0,0 +1,73 @@
+import unittest
+import pickle
+import random
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.radius_grid import RadiusGrid, radius_offsets, turns_heuristic, merge_steps, \
+    PILGRIM_RADIUS_SQUARED, CRUSADER_RADIUS_SQUARED
+from AStar.astar import AStar
+from search_testing import breadth_first_distance
+from heuristics import diagonal
+
+
+"""
+File: test_radius_grid.py
+Author: Nathan Robertson
+Purpose: Test neighbors of grids where a move covers a squared radius and searches over them counting turns.
+"""
+
+
+class RadiusGridTest(unittest.TestCase):
+    def test_offsets(self):
+        self.assertEqual(12, len(radius_offsets(PILGRIM_RADIUS_SQUARED)))
+        self.assertEqual(28, len(radius_offsets(CRUSADER_RADIUS_SQUARED)))
+        self.assertIs(radius_offsets(4), radius_offsets(4))
+        self.assertTrue((2, 0) in radius_offsets(4))
+        self.assertFalse((2, 1) in radius_offsets(4))
+
+    def test_neighbors(self):
+        grid = RadiusGrid(5, 5, [Coord(2, 3)])
+        neighbors = grid.neighbors(Coord(2, 2))
+        self.assertEqual(11, len(neighbors))
+        self.assertFalse(Coord(2, 3) in neighbors)
+        self.assertTrue(Coord(2, 4) in neighbors)
+        self.assertEqual(5, len(grid.neighbors(Coord(0, 0))))
+        self.assertEqual([], grid.neighbors(Coord(2, 3)))
+        self.assertTrue(grid.is_adjacent(Coord(0, 0), Coord(2, 0)))
+        self.assertFalse(grid.is_adjacent(Coord(0, 0), Coord(2, 1)))
+
+    def test_neighbor_cache_invalidation(self):
+        grid = RadiusGrid(5, 5, [])
+        self.assertTrue(Coord(2, 4) in grid.neighbors(Coord(2, 2)))
+        grid.insert_obstacle(Coord(2, 4))
+        self.assertFalse(Coord(2, 4) in grid.neighbors(Coord(2, 2)))
+
+    def test_pickle(self):
+        grid = RadiusGrid(4, 4, [Coord(1, 1)], CRUSADER_RADIUS_SQUARED)
+        copy = pickle.loads(pickle.dumps(grid))
+        self.assertEqual(CRUSADER_RADIUS_SQUARED, copy.radius_squared)
+        self.assertEqual(grid.obstacles(), copy.obstacles())
+
+    def test_astar_turns(self):
+        random.seed(3)
+        obstacles = [Coord(x, y) for x in range(20) for y in range(20) if random.random() < 0.25]
+        for radius_squared in (PILGRIM_RADIUS_SQUARED, CRUSADER_RADIUS_SQUARED):
+            grid = RadiusGrid(20, 20, obstacles, radius_squared)
+            start, goal = Coord(0, 0), Coord(19, 19)
+            grid.remove_obstacle(start)
+            grid.remove_obstacle(goal)
+            path = AStar(grid, turns_heuristic(radius_squared)).execute((start, goal))
+            self.assertEqual(breadth_first_distance(grid, start, goal), len(path) - 1)
+            for first, second in zip(path, path[1:]):
+                self.assertTrue(grid.is_adjacent(first, second))
+
+    def test_merge_steps(self):
+        grid = DiagonalGrid(10, 1, [])
+        path = AStar(grid, diagonal).execute((Coord(0, 0), Coord(9, 0)))
+        merged = merge_steps(path, PILGRIM_RADIUS_SQUARED)
+        self.assertEqual([Coord(0, 0), Coord(2, 0), Coord(4, 0), Coord(6, 0), Coord(8, 0), Coord(9, 0)], merged)
+        self.assertEqual([], merge_steps([], PILGRIM_RADIUS_SQUARED))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import pickle
+import numpy as np
+from Coordinate.coord import Coord
+from UniformGrid.weighted_grid import WeightedDiagonalGrid, WeightedOrthogonalGrid, MAX_COST
+
+
+"""
+File: test_weighted_grid.py
+Author: Nathan Robertson
+Purpose: Test per cell costs of weighted grids, bulk updates through the NumPy view and pickling.
+"""
+
+
+class WeightedGridTest(unittest.TestCase):
+    def test_default_costs(self):
+        grid = WeightedDiagonalGrid(3, 2, [])
+        self.assertEqual(1, grid.cost(Coord(2, 1)))
+        self.assertEqual(grid.CELL_VALUE, grid.cost())
+        self.assertEqual(6, len(grid.costs))
+
+    def test_neighbors_come_from_base_grid(self):
+        diagonal = WeightedDiagonalGrid(3, 3, [Coord(0, 1)])
+        orthogonal = WeightedOrthogonalGrid(3, 3, [Coord(0, 1)])
+        self.assertEqual(7, len(diagonal.neighbors(Coord(1, 1))))
+        self.assertEqual(3, len(orthogonal.neighbors(Coord(1, 1))))
+
+    def test_bulk_update(self):
+        grid = WeightedOrthogonalGrid(4, 3, [])
+        version = grid.version
+        grid.set_costs(np.arange(1, 13).reshape(3, 4))
+        self.assertEqual(7, grid.cost(Coord(2, 1)))
+        grid.set_costs([[9, 9]], 1, 2)
+        self.assertEqual([9, 9], [grid.cost(Coord(1, 2)), grid.cost(Coord(2, 2))])
+        self.assertEqual(12, grid.cost(Coord(3, 2)))
+        self.assertEqual(12, grid.cost_limit)
+        self.assertTrue(grid.version > version)
+
+    def test_add_costs_caps(self):
+        grid = WeightedDiagonalGrid(2, 2, [], [[1, 200], [3, 4]])
+        grid.add_costs([[10, 100]])
+        self.assertEqual([[11, MAX_COST], [3, 4]], grid.cost_array().tolist())
+
+    def test_add_costs_clips_to_grid(self):
+        grid = WeightedOrthogonalGrid(3, 3, [])
+        grid.add_costs(np.full((3, 3), 4), -1, -1)
+        self.assertEqual([[5, 5, 1], [5, 5, 1], [1, 1, 1]], grid.cost_array().tolist())
+        grid.add_costs([[2, 2, 2]], 2, 2)
+        self.assertEqual(3, grid.cost(Coord(2, 2)))
+        version = grid.version
+        grid.add_costs([[9]], 5, 0)
+        self.assertEqual(version, grid.version)
+        self.assertRaises(ValueError, grid.add_costs, [1, 2])
+
+    def test_cost_limit_follows_costs(self):
+        grid = WeightedDiagonalGrid(2, 2, [], [[1, 9], [3, 4]])
+        self.assertEqual(9, grid.cost_limit)
+        grid.set_costs([[2]], 1, 0)
+        self.assertEqual(4, grid.cost_limit)
+        grid.set_cost(Coord(1, 1), 1)
+        self.assertEqual(3, grid.cost_limit)
+        grid.set_cost(Coord(0, 0), 7)
+        self.assertEqual(7, grid.cost_limit)
+
+    def test_invalid_costs(self):
+        grid = WeightedDiagonalGrid(2, 2, [])
+        self.assertRaises(ValueError, grid.set_cost, Coord(0, 0), 0)
+        self.assertRaises(ValueError, grid.set_cost, Coord(-1, 0), 5)
+        self.assertRaises(ValueError, grid.set_cost, Coord(2, 0), 5)
+        self.assertEqual([[1, 1], [1, 1]], grid.cost_array().tolist())
+        self.assertRaises(ValueError, grid.set_costs, [[300]])
+        self.assertRaises(ValueError, grid.set_costs, [[1, 1]], 1, 0)
+
+    def test_cost_view_is_read_only(self):
+        grid = WeightedOrthogonalGrid(3, 2, [])
+        with self.assertRaises(ValueError):
+            grid.cost_view[0, 0] = 9
+        grid.set_costs([[4]], 2, 1)
+        self.assertEqual(4, grid.cost_view[1, 2])
+        self.assertEqual(4, grid.cost_limit)
+
+    def test_pickle(self):
+        grid = WeightedOrthogonalGrid(3, 3, [Coord(1, 1)], [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        copy = pickle.loads(pickle.dumps(grid))
+        self.assertIsInstance(copy, WeightedOrthogonalGrid)
+        self.assertEqual(grid.costs, copy.costs)
+        self.assertEqual(grid.obstacles(), copy.obstacles())
+        copy.set_cost(Coord(0, 0), 5)
+        self.assertEqual(1, grid.cost(Coord(0, 0)))
@@ -1,4 +1,5 @@
 from Coordinate.coord import Coord
+from UniformGrid.bitboard import Bitboard
 from abc import abstractmethod, ABC
 
 """
@@ -9,14 +10,22 @@ Purpose:
     The neighbors method is a template method because there are many different ways of determining the 
     neighbors of a cell, whereas the other methods in this class will probably not need to change.
     This is an example of the template method pattern.
+    Obstacles are stored in a Bitboard (one int per row and per column) rather than a set of Coords.
 """
 
 
 class UniformGrid(ABC):
+    # (x, y) steps an entity may take from a cell, subclasses fill this in and use it to implement neighbors.
+    NEIGHBOR_OFFSETS = ()
+
     def __init__(self, xsize: int, ysize: int, obstacles: list):
         self.xsize = xsize
         self.ysize = ysize
-        self.obstacle_set = self._initialize_obstacles(obstacles)
+        self.bitboard = Bitboard(xsize, ysize)
+        self.listeners = []
+        self.version = 0
+        self.instrumentation = None
+        self._initialize_obstacles(obstacles)
         self.CELL_VALUE = 1
         self.OBSTACLE_VALUE = 2
         self.INVALID_POSITION = -1
@@ -33,7 +42,8 @@ class UniformGrid(ABC):
         Is coordinate one adjacent to coordinate 2?
         """
         if self.is_valid_coord(coord1) and self.is_valid_coord(coord2):
-            if coord1 in self.obstacle_set or coord2 in self.obstacle_set:
+            rows = self.bitboard.rows
+            if (rows[coord1.y] >> coord1.x) & 1 or (rows[coord2.y] >> coord2.x) & 1:
                 return False
             if self.is_adjacent_position(coord1, coord2):
                 return True
@@ -44,11 +54,25 @@ class UniformGrid(ABC):
         :param coord:
         :return: If coordinate is in grid
         """
-        if coord.x < 0 or coord.y < 0:
-            return False
-        if coord.x >= self.xsize or coord.y >= self.ysize:
-            return False
-        return True
+        return self.bitboard.contains(coord.x, coord.y)
+
+    def is_obstacle(self, coord: Coord) -> bool:
+        """
+        :param coord:
+        :return: If coordinate is an obstacle on the grid. Coordinates outside the grid are not obstacles.
+        """
+        return self.bitboard.test(coord.x, coord.y)
+
+    def next_blocked(self, coord: Coord, direction: Coord) -> Coord:
+        """
+        Scans a row or column for the closest blocked cell using bit operations.
+        :param coord: Cell to start scanning from (exclusive).
+        :param direction: A straight direction (one of x or y must be 0).
+        :return: First cell after coord in direction which is an obstacle or off the grid.
+        """
+        if direction.y == 0:
+            return Coord(self.bitboard.next_in_row(coord.x, coord.y, direction.x), coord.y)
+        return Coord(coord.x, self.bitboard.next_in_column(coord.x, coord.y, direction.y))
 
     def is_adjacent_position(self, coord1: Coord, coord2: Coord) -> bool:
         """
@@ -69,22 +93,124 @@ class UniformGrid(ABC):
         """
         pass
 
+    def nearest_target(self, coord: Coord, targets) -> (Coord, list):
+        """
+        One search for the closest of several targets (see FlowField/nearest_target.py, NearestTargets keeps the
+        answer for every cell when many units ask about the same targets).
+        :param coord: Where the unit stands.
+        :param targets: Candidate cells (resource tiles, castles).
+        :return: (closest target, cells from coord to it inclusive) or (None, []) if no target can be reached.
+        """
+        # Imported here so the base grid does not depend on the packages built on top of it.
+        from FlowField.nearest_target import nearest_target
+        return nearest_target(self, coord, targets)
+
     def insert_obstacle(self, coord: Coord) -> None:
         """
         Add obstacle to grid
         :param coord:
         """
-        if self.is_valid_coord(coord):
-            self.obstacle_set.add(coord)
+        if self.is_valid_coord(coord) and not self.is_obstacle(coord):
+            self.bitboard.set(coord.x, coord.y)
+            self._notify(coord, True)
+
+    def remove_obstacle(self, coord: Coord) -> None:
+        """
+        Make a cell passable again (a robot moved away).
+        :param coord:
+        """
+        if self.is_obstacle(coord):
+            self.bitboard.clear(coord.x, coord.y)
+            self._notify(coord, False)
+
+    def instrument(self):
+        """
+        Starts counting neighbors / is_obstacle calls and obstacle changes (see Instrumentation/search_stats.py).
+        An instrumented searcher on this grid adds the counts to its per query stats.
+        :return: GridStats with the running counts.
+        """
+        # Imported here so the base grid does not depend on the packages built on top of it.
+        from Instrumentation.search_stats import GridInstrumentation
+        if self.instrumentation is None:
+            self.instrumentation = GridInstrumentation(self)
+            self.instrumentation.install()
+        return self.instrumentation.stats
+
+    def uninstrument(self) -> None:
+        if self.instrumentation is not None:
+            self.instrumentation.uninstall()
+            self.instrumentation = None
+
+    def subscribe(self, listener) -> None:
+        """
+        Register a function called as listener(coord, blocked) whenever a cell changes between free and blocked.
+        """
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener) -> None:
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _notify(self, coord: Coord, blocked: bool) -> None:
+        """
+        Every obstacle change bumps the grid version (used by caches to notice changes) and tells the listeners.
+        """
+        self.version += 1
+        for listener in self.listeners:
+            listener(coord, blocked)
 
     def obstacles(self) -> set:
         """
-        :return: All tiles that are impassable in the current OrthogonalGrid
+        Builds a new set from the bitboard, use is_obstacle for single lookups.
+        :return: All tiles that are impassable in the current grid
+        """
+        return set(Coord(x, y) for x, y in self.bitboard.cells())
+
+    def _neighbors_from_offsets(self, coord: Coord, offsets) -> list:
+        """
+        Shared body of the neighbors template method, reads straight from the bitboard.
+        :param coord:
+        :param offsets: Sequence of (x, y) steps an entity on this grid may take.
+        :return: Every coord + offset which is on the grid and not an obstacle (empty if coord itself is blocked).
+        """
+        x, y = coord.x, coord.y
+        xsize, ysize = self.xsize, self.ysize
+        rows = self.bitboard.rows
+        if not (0 <= x < xsize and 0 <= y < ysize) or (rows[y] >> x) & 1:
+            return []
+        result = []
+        for dx, dy in offsets:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < xsize and 0 <= ny < ysize and not (rows[ny] >> nx) & 1:
+                result.append(Coord(nx, ny))
+        return result
+
+    def __reduce__(self):
+        """
+        Pickle a grid as its class, size and bitboard rows only. Keeps the payload sent to worker processes small.
+        Subclasses with extra constructor arguments append them to the tuple (see grid_from_rows).
         """
-        return self.obstacle_set
+        return grid_from_rows, (self.__class__, self.xsize, self.ysize, list(self.bitboard.rows))
 
     def _initialize_obstacles(self, potential_obstacles):
-        return set(filter(lambda obstacle: self.is_valid_coord(obstacle), potential_obstacles))
+        for obstacle in potential_obstacles:
+            self.insert_obstacle(obstacle)
+
+
+def grid_from_rows(grid_class, xsize: int, ysize: int, rows: list, *args) -> UniformGrid:
+    """
+    Rebuild a grid from the rows of its bitboard.
+    :param grid_class: UniformGrid subclass to build.
+    :param rows: One int per row, bit x set for an obstacle at x.
+    :param args: Constructor arguments after the obstacle list, if the subclass has any.
+    """
+    grid = grid_class(xsize, ysize, [], *args)
+    for y, bits in enumerate(rows):
+        while bits:
+            low = bits & -bits
+            grid.bitboard.set(low.bit_length() - 1, y)
+            bits ^= low
+    return grid
 
 
 def print_diagonal(grid: UniformGrid, path: []):
@@ -98,7 +224,7 @@ def print_diagonal(grid: UniformGrid, path: []):
             coord = Coord(i, j)
             if coord in path:
                 val = 'P'
-            elif coord in grid.obstacles():
+            elif grid.is_obstacle(coord):
                 val = 'X'
             else:
                 val = '.'
@@ -0,0 +1,126 @@
+from array import array
+import numpy as np
+from Coordinate.coord import Coord
+from UniformGrid.diagonal_grid import DiagonalGrid
+from UniformGrid.orthogonal_grid import OrthogonalGrid
+from UniformGrid.uniform_grid import grid_from_rows
+
+"""
+File: weighted_grid.py
+Author: Nathan Robertson
+Purpose:
+    Grids where entering a cell costs a small integer (1 to MAX_COST) instead of the flat CELL_VALUE, to steer units
+    around dangerous areas (enemy attack range) and towards resource tiles.
+    WeightedGrid is a mixin, the neighbor logic stays in DiagonalGrid / OrthogonalGrid:
+        WeightedDiagonalGrid(WeightedGrid, DiagonalGrid)
+        WeightedOrthogonalGrid(WeightedGrid, OrthogonalGrid)
+
+    Costs live in one flat array('B') indexed by y * xsize + x, so searches read them with a plain index.
+    cost_view is a read-only NumPy (ysize, xsize) view of the same memory. Bulk updates from a 2D array (a whole map
+    or a rectangle of it) go through set_costs / add_costs as one slice assignment, no per cell Python loop, and keep
+    cost_limit and the version up to date.
+    Changing costs bumps the grid version like an obstacle change does, so caches of paths drop what they hold.
+    Listeners are only told about obstacle changes.
+"""
+
+
+__all__ = ["WeightedGrid", "WeightedDiagonalGrid", "WeightedOrthogonalGrid", "MAX_COST"]
+
+MAX_COST = 255
+
+
+class WeightedGrid:
+    def __init__(self, xsize: int, ysize: int, obstacles: list, costs=None):
+        """
+        :param costs: None for every cell costing 1, a 2D array-like of shape (ysize, xsize) or flat bytes of
+                      length xsize * ysize (what pickling passes).
+        """
+        self.costs = array('B', [1]) * (xsize * ysize)
+        self._cost_view = np.frombuffer(self.costs, dtype=np.uint8).reshape(ysize, xsize)
+        self.cost_view = self._cost_view.view()
+        self.cost_view.flags.writeable = False
+        self.cost_limit = 1
+        super().__init__(xsize, ysize, obstacles)
+        if costs is not None:
+            if isinstance(costs, (bytes, bytearray, array)):
+                costs = np.frombuffer(bytes(costs), dtype=np.uint8).reshape(ysize, xsize)
+            self.set_costs(costs)
+
+    def cost(self, coord: Coord = None):
+        """
+        :param coord: Cell being entered, None for the base cost of the grid.
+        :return: Cost to move into coord.
+        """
+        if coord is None:
+            return self.CELL_VALUE
+        return self.costs[coord.y * self.xsize + coord.x]
+
+    def set_cost(self, coord: Coord, cost: int) -> None:
+        self._check_costs(cost, cost)
+        if not self.is_valid_coord(coord):
+            raise ValueError("{} is outside the {}x{} grid".format(coord, self.xsize, self.ysize))
+        cell = coord.y * self.xsize + coord.x
+        previous = self.costs[cell]
+        self.costs[cell] = cost
+        if cost > self.cost_limit:
+            self.cost_limit = cost
+        elif previous == self.cost_limit and cost < previous:
+            self.cost_limit = int(self.cost_view.max())
+        self.version += 1
+
+    def set_costs(self, values, x: int = 0, y: int = 0) -> None:
+        """
+        Copies a 2D block of costs into the grid with its top left corner on (x, y).
+        :param values: Array-like of shape (height, width) indexed [y, x], every value in 1..MAX_COST.
+        """
+        values = np.asarray(values)
+        if values.size == 0:
+            return
+        low, high = int(values.min()), int(values.max())
+        self._check_costs(low, high)
+        height, width = values.shape
+        if x < 0 or y < 0 or x + width > self.xsize or y + height > self.ysize:
+            raise ValueError("Cost block of shape {} at ({}, {}) does not fit in the grid".format(values.shape, x, y))
+        self._cost_view[y:y + height, x:x + width] = values
+        self.cost_limit = int(self.cost_view.max())
+        self.version += 1
+
+    def add_costs(self, values, x: int = 0, y: int = 0) -> None:
+        """
+        Adds a 2D block of extra costs (e.g. danger around an enemy) onto the costs already there, capped at MAX_COST.
+        The part of the block outside the grid is dropped, so x and y may be negative for an enemy near the edge.
+        :param values: Array-like of shape (height, width) indexed [y, x].
+        """
+        values = np.asarray(values)
+        if values.ndim != 2:
+            raise ValueError("Cost block must be 2D, got shape {}".format(values.shape))
+        height, width = values.shape
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + width, self.xsize), min(y + height, self.ysize)
+        if left >= right or top >= bottom:
+            return
+        values = values[top - y:bottom - y, left - x:right - x]
+        block = self.cost_view[top:bottom, left:right].astype(np.int32) + values
+        self.set_costs(np.clip(block, 1, MAX_COST), left, top)
+
+    def cost_array(self) -> np.ndarray:
+        """
+        :return: Copy of the costs as a (ysize, xsize) array.
+        """
+        return self.cost_view.copy()
+
+    @staticmethod
+    def _check_costs(low: int, high: int) -> None:
+        if low < 1 or high > MAX_COST:
+            raise ValueError("Cell costs must be between 1 and {}, got {}..{}".format(MAX_COST, low, high))
+
+    def __reduce__(self):
+        return grid_from_rows, (self.__class__, self.xsize, self.ysize, list(self.bitboard.rows), bytes(self.costs))
+
+
+class WeightedDiagonalGrid(WeightedGrid, DiagonalGrid):
+    pass
+
+
+class WeightedOrthogonalGrid(WeightedGrid, OrthogonalGrid):
+    pass
@@ -1,11 +1,12 @@
-from functools import lru_cache
-
+from Coordinate.coord import Coord
 
 """
     File: heuristics.py
     Author: Nathan Robertson
     Purpose:
         Heuristic functions to control direction of node expansion for A* algorithm.
+        None of them are cached: the arithmetic is cheaper than a cache lookup and a cache keyed on Coord pairs
+        grows with every map played.
 """
 
 
@@ -17,7 +18,6 @@ def diagonal(coord1, coord2):
     return max(abs(coord1.x - coord2.x), abs(coord1.y - coord2.y))
 
 
-@lru_cache(maxsize=None)
 def tie_breaker_h(coord1, coord2):
     """
     Decorator heuristic which adds a tie breaker to the formula.
@@ -29,6 +29,38 @@ def tie_breaker_h(coord1, coord2):
     return manhattan(coord1, coord2) * (1.0 + 1/1000)
 
 
-@lru_cache(maxsize=None)
 def diagonal_tie_breaker(coord1, coord2):
     return diagonal(coord1, coord2) * (1.0 + 1 / 1000)
+
+
+# Tie breaking heuristics are exactly their base heuristic scaled by TIE_BREAKER.
+TIE_BREAKER = 1.0 + 1 / 1000
+TIE_BREAKING = {tie_breaker_h: manhattan, diagonal_tie_breaker: diagonal}
+EXACT_HEURISTICS = (manhattan, diagonal)
+
+
+def xy_heuristic(heuristic_fn, goal, scale=1):
+    """
+    Lets integer search cores evaluate a heuristic without building a Coord for every cell.
+    This is the one place the formulas of the functions above are spelled out for (x, y), AStar's integer_heuristic
+    scales what it returns.
+    :param heuristic_fn: One of the functions above or any function of two Coords. Heuristic objects with their own
+                         xy_heuristic(goal) method (Landmarks/landmark_heuristic.py) build the function themselves.
+    :param goal:
+    :param scale: Factor applied to every heuristic.
+    :return: A function of (x, y) equal to heuristic_fn(Coord(x, y), goal) * scale.
+    """
+    if hasattr(heuristic_fn, 'xy_heuristic'):
+        heuristic = heuristic_fn.xy_heuristic(goal)
+        return heuristic if scale == 1 else lambda x, y: heuristic(x, y) * scale
+    base = TIE_BREAKING.get(heuristic_fn)
+    if base is not None:
+        return xy_heuristic(base, goal, scale * TIE_BREAKER)
+    goal_x, goal_y = goal.x, goal.y
+    if heuristic_fn is manhattan:
+        return lambda x, y: (abs(x - goal_x) + abs(y - goal_y)) * scale
+    if heuristic_fn is diagonal:
+        return lambda x, y: max(abs(x - goal_x), abs(y - goal_y)) * scale
+    if scale == 1:
+        return lambda x, y: heuristic_fn(Coord(x, y), goal)
+    return lambda x, y: heuristic_fn(Coord(x, y), goal) * scale
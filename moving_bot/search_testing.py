@@ -0,0 +1,24 @@
+from collections import deque
+
+"""
+File: search_testing.py
+Author: Nathan Robertson
+Purpose:
+    Reference answers the search tests compare against. Not a test module itself, so the tests of different packages
+    share these without importing each other.
+"""
+
+
+def breadth_first_distance(grid, start, goal):
+    """
+    :return: Fewest grid.neighbors moves from start to goal, None if goal cannot be reached.
+    """
+    distance = {start: 0}
+    frontier = deque([start])
+    while frontier:
+        current = frontier.popleft()
+        for neighbor in grid.neighbors(current):
+            if neighbor not in distance:
+                distance[neighbor] = distance[current] + 1
+                frontier.append(neighbor)
+    return distance.get(goal)